@@ -1,4 +1,5 @@
 import reflex as rx
+from starlette.applications import Starlette
 from app.components.navbar import navbar
 from app.components.footer import footer
 from app.components.product_card import product_card
@@ -11,8 +12,19 @@ from app.pages.category import category_page
 from app.pages.cart import cart_page
 from app.pages.checkout import checkout_page
 from app.pages.account import account_page, orders_page, wishlist_page, addresses_page
-from app.pages.admin import admin_page, admin_products_page
+from app.pages.admin import admin_page, admin_products_page, admin_orders_page
+from app.states.account_state import AccountState
+from app.states.admin_state import AdminState
 from app.states.auth_state import AuthState
+from app.states.cart_state import CartState
+from app.states.payment_state import PaymentState
+from app.services.cart_store import cart_store_lifespan
+from app.services.images import image_cache_lifespan, image_routes
+from app.services.inventory import inventory_lifespan
+from app.services.metrics import instrument_states, metrics_routes
+from app.services.order_outbox import order_outbox_lifespan
+from app.services.strapi_client import strapi_lifespan
+from app.services.tracing import tracing_lifespan
 
 
 def hero_section() -> rx.Component:
@@ -110,6 +122,7 @@ def index() -> rx.Component:
 
 app = rx.App(
     theme=rx.theme(appearance="light"),
+    api_transformer=Starlette(routes=[*image_routes, *metrics_routes]),
     head_components=[
         rx.el.link(rel="preconnect", href="https://fonts.googleapis.com"),
         rx.el.link(rel="preconnect", href="https://fonts.gstatic.com", cross_origin=""),
@@ -119,29 +132,85 @@ app = rx.App(
         ),
     ],
 )
+app.register_lifespan_task(strapi_lifespan)
+app.register_lifespan_task(order_outbox_lifespan)
+app.register_lifespan_task(inventory_lifespan)
+app.register_lifespan_task(cart_store_lifespan)
+app.register_lifespan_task(image_cache_lifespan)
+app.register_lifespan_task(tracing_lifespan)
+instrument_states(rx.State)
 app.add_page(index, route="/", on_load=ProductState.on_load)
 app.add_page(login_page, route="/login")
 app.add_page(signup_page, route="/signup")
-app.add_page(products_page, route="/products", on_load=ProductState.on_load)
+app.add_page(
+    products_page,
+    route="/products",
+    on_load=[ProductState.on_load, ProductState.load_listing],
+)
 app.add_page(
     product_detail_page,
     route="/product/[product_id]",
-    on_load=[ProductState.get_product_details, ProductState.on_load],
+    on_load=[
+        ProductState.get_product_details,
+        ProductState.on_load,
+        AccountState.load_wishlist,
+    ],
+)
+app.add_page(
+    category_page,
+    route="/category/[category_name]",
+    on_load=[ProductState.on_load, ProductState.load_listing],
+)
+app.add_page(
+    cart_page, route="/cart", on_load=[ProductState.on_load, CartState.hydrate]
+)
+app.add_page(
+    checkout_page,
+    route="/checkout",
+    on_load=[
+        AuthState.check_login,
+        AccountState.load_profile,
+        CartState.hydrate,
+        PaymentState.prefill_shipping_address,
+    ],
 )
 app.add_page(
-    category_page, route="/category/[category_name]", on_load=ProductState.on_load
+    account_page,
+    route="/account",
+    on_load=[AuthState.check_login, AccountState.load_profile],
 )
-app.add_page(cart_page, route="/cart", on_load=ProductState.on_load)
-app.add_page(checkout_page, route="/checkout", on_load=AuthState.check_login)
-app.add_page(account_page, route="/account", on_load=AuthState.check_login)
-app.add_page(orders_page, route="/account/orders", on_load=AuthState.check_login)
-app.add_page(wishlist_page, route="/account/wishlist", on_load=AuthState.check_login)
-app.add_page(addresses_page, route="/account/addresses", on_load=AuthState.check_login)
 app.add_page(
-    admin_page, route="/admin", on_load=[AuthState.check_admin, ProductState.on_load]
+    orders_page,
+    route="/account/orders",
+    on_load=[AuthState.check_login, PaymentState.load_orders],
+)
+app.add_page(
+    wishlist_page,
+    route="/account/wishlist",
+    on_load=[AuthState.check_login, AccountState.load_wishlist],
+)
+app.add_page(
+    addresses_page,
+    route="/account/addresses",
+    on_load=[AuthState.check_login, AccountState.load_addresses],
+)
+app.add_page(
+    admin_page,
+    route="/admin",
+    on_load=[
+        AuthState.check_admin,
+        AccountState.load_profile,
+        ProductState.on_load,
+        AdminState.load_dashboard,
+    ],
 )
 app.add_page(
     admin_products_page,
     route="/admin/products",
     on_load=[AuthState.check_admin, ProductState.on_load],
-)
\ No newline at end of file
+)
+app.add_page(
+    admin_orders_page,
+    route="/admin/orders",
+    on_load=[AuthState.check_admin, AdminState.load_orders],
+)
@@ -1,7 +1,28 @@
 import reflex as rx
+from app.components.responsive_image import responsive_image
 from app.states.auth_state import AuthState
 from app.states.cart_state import CartState
-from app.states.product_state import ProductState
+from app.states.product_state import Product, ProductState
+from app.states.search_state import SearchState
+
+
+def search_result(product: Product) -> rx.Component:
+    return rx.el.a(
+        responsive_image(
+            product["images"][0],
+            sizes="40px",
+            width=40,
+            alt=product["name"],
+            class_name="h-10 w-10 object-cover rounded-md",
+        ),
+        rx.el.div(
+            rx.el.p(product["name"], class_name="font-medium text-[#19325C]"),
+            rx.el.p(f"₹{product['price']:.2f}", class_name="text-sm text-gray-500"),
+        ),
+        href=f"/product/{product['id']}",
+        on_click=SearchState.clear_search,
+        class_name="flex items-center gap-3 px-4 py-2 hover:bg-gray-50",
+    )
 
 
 def navbar() -> rx.Component:
@@ -22,12 +43,21 @@ def navbar() -> rx.Component:
                 rx.el.div(
                     rx.el.input(
                         placeholder="Search for gifts...",
+                        on_change=SearchState.search.debounce(250),
                         class_name="w-full pl-10 pr-4 py-2 rounded-full border border-gray-300 focus:ring-2 focus:ring-[#D4C08A] focus:border-transparent transition font-['Playfair_Display']",
                     ),
                     rx.icon(
                         tag="search",
                         class_name="absolute left-3 top-1/2 -translate-y-1/2 text-gray-400",
                     ),
+                    rx.cond(
+                        SearchState.search_results.length() > 0,
+                        rx.el.div(
+                            rx.foreach(SearchState.search_results, search_result),
+                            class_name="absolute top-full left-0 right-0 mt-2 bg-white rounded-lg shadow-lg border border-gray-200 py-2 z-50",
+                        ),
+                        rx.fragment(),
+                    ),
                     class_name="relative w-full max-w-sm",
                 )
             ),
@@ -102,4 +132,5 @@ def navbar() -> rx.Component:
             class_name="container mx-auto flex items-center justify-between p-4",
         ),
         class_name="bg-white/90 backdrop-blur-md sticky top-0 z-50 border-b border-gray-200",
+        on_mount=[AuthState.restore_session, CartState.hydrate],
     )
\ No newline at end of file
@@ -1,4 +1,5 @@
 import reflex as rx
+from app.components.responsive_image import responsive_image
 from app.states.product_state import Product
 from app.states.cart_state import CartState
 
@@ -7,8 +8,10 @@ def product_card(product: Product) -> rx.Component:
     return rx.el.div(
         rx.el.div(
             rx.el.a(
-                rx.el.img(
-                    src=product["images"][0],
+                responsive_image(
+                    product["images"][0],
+                    sizes="(min-width: 1024px) 25vw, (min-width: 640px) 50vw, 100vw",
+                    width=480,
                     alt=product["name"],
                     class_name="w-full h-full object-cover group-hover:scale-105 transition-transform duration-300",
                 ),
@@ -0,0 +1,145 @@
+import reflex as rx
+from app.components.product_card import product_card
+from app.states.product_state import ProductState
+
+SORT_OPTIONS = [
+    ("featured", "Featured"),
+    ("newest", "Newest"),
+    ("price_asc", "Price: Low to High"),
+    ("price_desc", "Price: High to Low"),
+    ("rating", "Top Rated"),
+    ("num_reviews", "Most Reviewed"),
+]
+
+
+def facet_filter(facet: str, title: str) -> rx.Component:
+    return rx.el.div(
+        rx.el.h4(title, class_name="font-semibold mb-3"),
+        rx.foreach(
+            ProductState.facets[facet],
+            lambda option: rx.el.label(
+                rx.el.input(
+                    type="checkbox",
+                    checked=option["selected"],
+                    on_change=lambda _: ProductState.toggle_facet(
+                        facet, option["value"]
+                    ),
+                    class_name="mr-2 accent-[#19325C]",
+                ),
+                rx.el.span(option["label"], class_name="capitalize"),
+                rx.el.span(
+                    f"({option['count']})", class_name="ml-1 text-sm text-gray-500"
+                ),
+                class_name="flex items-center py-1 cursor-pointer hover:text-[#C1A86F]",
+            ),
+        ),
+        class_name="mb-8",
+    )
+
+
+def price_filter() -> rx.Component:
+    return rx.el.div(
+        rx.el.h4("Price", class_name="font-semibold mb-3"),
+        rx.el.form(
+            rx.el.div(
+                rx.el.input(
+                    name="min_price",
+                    type="number",
+                    placeholder="Min",
+                    class_name="w-full p-2 border rounded-md",
+                ),
+                rx.el.input(
+                    name="max_price",
+                    type="number",
+                    placeholder="Max",
+                    class_name="w-full p-2 border rounded-md",
+                ),
+                class_name="grid grid-cols-2 gap-2",
+            ),
+            rx.el.button(
+                "Apply",
+                type="submit",
+                class_name="mt-2 w-full py-1 border-2 border-[#19325C] text-[#19325C] font-bold rounded-full hover:bg-[#19325C] hover:text-white transition-colors",
+            ),
+            on_submit=ProductState.apply_price_range,
+        ),
+        rx.el.label(
+            rx.el.input(
+                type="checkbox",
+                checked=ProductState.in_stock_only,
+                on_change=lambda _: ProductState.toggle_in_stock(),
+                class_name="mr-2 accent-[#19325C]",
+            ),
+            "In stock only",
+            class_name="flex items-center mt-4 cursor-pointer",
+        ),
+        class_name="mb-8",
+    )
+
+
+def listing_filters() -> rx.Component:
+    return rx.el.aside(
+        rx.el.h3(
+            "Filters",
+            class_name="text-xl font-bold text-[#19325C] mb-6 border-b pb-3",
+        ),
+        facet_filter("category", "Category"),
+        facet_filter("occasion", "Occasion"),
+        facet_filter("recipient", "Recipient"),
+        price_filter(),
+    )
+
+
+def listing_toolbar() -> rx.Component:
+    return rx.el.div(
+        rx.el.p(
+            f"Showing {ProductState.listing.length()} of {ProductState.listing_total} products",
+            class_name="text-sm text-gray-600",
+        ),
+        rx.el.select(
+            rx.foreach(
+                SORT_OPTIONS,
+                lambda option: rx.el.option(option[1], value=option[0]),
+            ),
+            value=ProductState.sort_by,
+            on_change=ProductState.sort_listing,
+            class_name="p-2 border rounded-md text-sm",
+        ),
+        class_name="flex justify-between items-center mb-6",
+    )
+
+
+def pagination_controls() -> rx.Component:
+    return rx.el.div(
+        rx.el.button(
+            "← Previous",
+            on_click=ProductState.previous_page,
+            disabled=ProductState.listing_page <= 1,
+            class_name="px-4 py-2 font-bold text-[#19325C] disabled:opacity-40",
+        ),
+        rx.el.span(
+            f"Page {ProductState.listing_page} of {ProductState.listing_page_count}",
+            class_name="text-sm text-gray-600",
+        ),
+        rx.el.button(
+            "Next →",
+            on_click=ProductState.next_page,
+            disabled=ProductState.listing_next_cursor == "",
+            class_name="px-4 py-2 font-bold text-[#19325C] disabled:opacity-40",
+        ),
+        class_name="flex justify-center items-center gap-6 mt-12",
+    )
+
+
+def product_listing(grid_class_name: str, empty_message: str) -> rx.Component:
+    return rx.cond(
+        ProductState.listing.length() > 0,
+        rx.el.div(
+            rx.el.div(
+                rx.foreach(ProductState.listing, product_card),
+                class_name=grid_class_name,
+            ),
+            pagination_controls(),
+        ),
+        rx.el.p(empty_message, class_name="text-center text-gray-500 italic"),
+    )
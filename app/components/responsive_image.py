@@ -0,0 +1,41 @@
+import reflex as rx
+from reflex.vars.function import FunctionStringVar
+from app.services.images import IMAGE_ROUTE, IMAGE_WIDTHS
+
+encode_uri_component = FunctionStringVar.create("encodeURIComponent")
+
+
+def responsive_image(
+    src: rx.Var,
+    sizes: str,
+    width: int,
+    widths: tuple[int, ...] = IMAGE_WIDTHS,
+    loading: str = "lazy",
+    **props,
+) -> rx.Component:
+    """A product image served as square, resized derivatives.
+
+    ``width`` is the largest size the image is laid out at in CSS pixels;
+    ``sizes`` tells the browser which candidate in ``srcset`` to fetch.
+    Pass ``loading="eager"`` for above-the-fold images.
+    Local assets such as the placeholder are served as-is.
+    """
+    api_url = rx.config.get_config().api_url.rstrip("/")
+    # Encoded so the source's own query and fragment stay in the path.
+    encoded = encode_uri_component.call(src).to(str)
+    candidates = [w for w in widths if w <= width * 2] or [widths[0]]
+    srcset = ", ".join(
+        f"{api_url}{IMAGE_ROUTE}/{w}/{encoded} {w}w" for w in candidates
+    )
+    return rx.el.img(
+        src=rx.cond(
+            src.startswith("http"), f"{api_url}{IMAGE_ROUTE}/{width}/{encoded}", src
+        ),
+        src_set=rx.cond(src.startswith("http"), srcset, ""),
+        sizes=sizes,
+        # Real attributes (not CSS) so the browser reserves the box early.
+        custom_attrs={"width": width, "height": width},
+        loading=loading,
+        decoding="async",
+        **props,
+    )
@@ -1,7 +1,11 @@
 import reflex as rx
 from app.components.navbar import navbar
 from app.components.footer import footer
+from app.components.product_card import product_card
+from app.services.account_store import SavedAddress
+from app.states.account_state import AccountState
 from app.states.auth_state import AuthState
+from app.states.product_state import Product
 from app.states.payment_state import PaymentState, Order
 
 
@@ -157,12 +161,12 @@ def account_profile_content() -> rx.Component:
             class_name="text-3xl font-bold font-['Playfair_Display'] text-[#19325C] mb-6",
         ),
         rx.cond(
-            AuthState.is_authenticated,
+            AccountState.profile,
             rx.el.div(
                 rx.el.div(
                     rx.el.label("Full Name", class_name="font-semibold text-gray-700"),
                     rx.el.input(
-                        default_value=AuthState.logged_in_user["full_name"],
+                        default_value=AccountState.profile["full_name"],
                         class_name="mt-1 w-full p-2 border rounded-md bg-gray-100",
                         disabled=True,
                     ),
@@ -173,7 +177,7 @@ def account_profile_content() -> rx.Component:
                         "Email Address", class_name="font-semibold text-gray-700"
                     ),
                     rx.el.input(
-                        default_value=AuthState.logged_in_user["email"],
+                        default_value=AccountState.profile["email"],
                         type="email",
                         class_name="mt-1 w-full p-2 border rounded-md bg-gray-100",
                         disabled=True,
@@ -185,7 +189,7 @@ def account_profile_content() -> rx.Component:
                         "Phone Number", class_name="font-semibold text-gray-700"
                     ),
                     rx.el.input(
-                        default_value=AuthState.logged_in_user["phone_number"],
+                        default_value=AccountState.profile["phone_number"],
                         class_name="mt-1 w-full p-2 border rounded-md bg-gray-100",
                         disabled=True,
                         placeholder="Not provided",
@@ -211,7 +215,17 @@ def orders_content() -> rx.Component:
         rx.cond(
             PaymentState.orders.length() > 0,
             rx.el.div(
-                rx.foreach(PaymentState.orders, order_card), class_name="space-y-6"
+                rx.foreach(PaymentState.orders, order_card),
+                rx.cond(
+                    PaymentState.orders_next_cursor != "",
+                    rx.el.button(
+                        "Load more orders",
+                        on_click=PaymentState.load_more_orders,
+                        class_name="w-full py-2 border-2 border-[#19325C] text-[#19325C] font-bold rounded-full hover:bg-[#19325C] hover:text-white transition-colors",
+                    ),
+                    rx.fragment(),
+                ),
+                class_name="space-y-6",
             ),
             rx.el.div(
                 "You have not placed any orders yet.",
@@ -221,16 +235,127 @@ def orders_content() -> rx.Component:
     )
 
 
+def wishlist_item(product: Product) -> rx.Component:
+    return rx.el.div(
+        product_card(product),
+        rx.el.button(
+            rx.icon(tag="trash-2", class_name="h-4 w-4 mr-2"),
+            "Remove",
+            on_click=lambda: AccountState.toggle_wishlist(product["id"]),
+            class_name="mt-2 w-full flex items-center justify-center text-sm text-red-600 hover:underline",
+        ),
+    )
+
+
 def wishlist_content() -> rx.Component:
     return rx.el.main(
         rx.el.h2(
             "My Wishlist",
             class_name="text-3xl font-bold font-['Playfair_Display'] text-[#19325C] mb-6",
         ),
+        rx.cond(
+            AccountState.wishlist_products.length() > 0,
+            rx.el.div(
+                rx.foreach(AccountState.wishlist_products, wishlist_item),
+                class_name="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 gap-6",
+            ),
+            rx.el.div(
+                "Your wishlist is empty.",
+                class_name="bg-white p-8 rounded-2xl shadow-sm border text-center text-gray-500",
+            ),
+        ),
+    )
+
+
+def address_card(address: SavedAddress) -> rx.Component:
+    return rx.el.div(
         rx.el.div(
-            "Your wishlist is empty.",
-            class_name="bg-white p-8 rounded-2xl shadow-sm border text-center text-gray-500",
+            rx.el.p(address["full_name"], class_name="font-bold text-[#19325C]"),
+            rx.cond(
+                address["is_default"],
+                rx.el.span(
+                    "Default",
+                    class_name="text-xs font-bold px-2 py-1 rounded-full bg-[#F6E6B6] text-[#19325C]",
+                ),
+                rx.fragment(),
+            ),
+            class_name="flex items-center justify-between",
+        ),
+        rx.el.p(address["address_line_1"], class_name="text-gray-600 mt-2"),
+        rx.el.p(
+            f"{address['city']}, {address['state']} {address['postal_code']}",
+            class_name="text-gray-600",
         ),
+        rx.el.p(address["phone"], class_name="text-gray-600"),
+        rx.el.div(
+            rx.cond(
+                address["is_default"],
+                rx.fragment(),
+                rx.el.button(
+                    "Make default",
+                    on_click=lambda: AccountState.set_default_address(address["id"]),
+                    class_name="text-sm text-[#19325C] hover:underline",
+                ),
+            ),
+            rx.el.button(
+                "Delete",
+                on_click=lambda: AccountState.delete_address(address["id"]),
+                class_name="text-sm text-red-600 hover:underline",
+            ),
+            class_name="flex gap-4 mt-4",
+        ),
+        class_name="bg-white p-6 rounded-2xl shadow-sm border",
+    )
+
+
+def address_form() -> rx.Component:
+    field_class = "w-full p-2 border rounded-md"
+    return rx.el.form(
+        rx.el.h3(
+            "Add a new address",
+            class_name="text-lg font-bold font-['Playfair_Display'] text-[#19325C] mb-4",
+        ),
+        rx.el.div(
+            rx.el.input(
+                name="full_name",
+                placeholder="Full name",
+                class_name=field_class,
+            ),
+            rx.el.input(
+                name="phone",
+                placeholder="Phone number",
+                class_name=field_class,
+            ),
+            class_name="grid grid-cols-1 md:grid-cols-2 gap-4",
+        ),
+        rx.el.input(
+            name="address_line_1",
+            placeholder="Street address",
+            class_name=f"{field_class} mt-4",
+        ),
+        rx.el.div(
+            rx.el.input(name="city", placeholder="City", class_name=field_class),
+            rx.el.input(name="state", placeholder="State", class_name=field_class),
+            rx.el.input(
+                name="postal_code",
+                placeholder="ZIP Code",
+                class_name=field_class,
+            ),
+            class_name="grid grid-cols-1 md:grid-cols-3 gap-4 mt-4",
+        ),
+        rx.el.label(
+            rx.el.input(type="checkbox", name="is_default", class_name="mr-2"),
+            "Use as my default address",
+            class_name="flex items-center mt-4 text-gray-700",
+        ),
+        rx.el.button(
+            "Save Address",
+            type="submit",
+            class_name="mt-6 px-6 py-2 bg-[#19325C] text-white font-bold rounded-full hover:opacity-90",
+        ),
+        on_submit=AccountState.save_address,
+        reset_on_submit=True,
+        class_name="bg-white p-6 rounded-2xl shadow-sm border",
     )
 
 
@@ -240,10 +365,18 @@ def addresses_content() -> rx.Component:
             "My Addresses",
             class_name="text-3xl font-bold font-['Playfair_Display'] text-[#19325C] mb-6",
         ),
-        rx.el.div(
-            "You have not saved any addresses yet.",
-            class_name="bg-white p-8 rounded-2xl shadow-sm border text-center text-gray-500",
+        rx.cond(
+            AccountState.addresses.length() > 0,
+            rx.el.div(
+                rx.foreach(AccountState.addresses, address_card),
+                class_name="grid grid-cols-1 md:grid-cols-2 gap-6 mb-8",
+            ),
+            rx.el.div(
+                "You have not saved any addresses yet.",
+                class_name="bg-white p-8 rounded-2xl shadow-sm border text-center text-gray-500 mb-8",
+            ),
         ),
+        address_form(),
     )
 
 
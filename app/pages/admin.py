@@ -1,7 +1,10 @@
 import reflex as rx
 from app.components.navbar import navbar
 from app.components.footer import footer
+from app.states.account_state import AccountState
+from app.states.admin_state import ORDER_STATUSES, AdminState
 from app.states.auth_state import AuthState
+from app.states.payment_state import Order
 from app.states.product_state import ProductState, Product
 from app.components.product_card import product_card
 
@@ -10,7 +13,7 @@ def admin_sidebar() -> rx.Component:
     menu_items = [
         ("Dashboard", "/admin", "layout-dashboard"),
         ("Products", "/admin/products", "package"),
-        ("Orders", "/account/orders", "shopping-cart"),
+        ("Orders", "/admin/orders", "shopping-cart"),
         ("Go to Site", "/", "arrow-left-right"),
     ]
     return rx.el.aside(
@@ -167,6 +170,69 @@ def best_selling_products_section() -> rx.Component:
     )
 
 
+def stat_card(label: str, value: rx.Var) -> rx.Component:
+    return rx.el.div(
+        rx.el.p(label, class_name="text-sm text-gray-500 uppercase"),
+        rx.el.p(value, class_name="mt-1 text-2xl font-bold text-[#19325C]"),
+        class_name="p-6 bg-white rounded-2xl shadow-sm border",
+    )
+
+
+def sales_metrics_section() -> rx.Component:
+    return rx.el.div(
+        rx.el.h2("Sales", class_name="text-2xl font-bold text-[#19325C] mb-4"),
+        rx.el.div(
+            stat_card("Orders", AdminState.total_orders),
+            stat_card("Revenue", f"₹{AdminState.total_revenue:.2f}"),
+            stat_card("Average Order Value", f"₹{AdminState.average_order_value:.2f}"),
+            class_name="grid grid-cols-1 md:grid-cols-3 gap-4 mb-6",
+        ),
+        rx.el.div(
+            rx.el.h3("Revenue per Day", class_name="font-semibold mb-2"),
+            rx.recharts.bar_chart(
+                rx.recharts.bar(data_key="revenue", fill="#C1A86F"),
+                rx.recharts.x_axis(data_key="day"),
+                rx.recharts.y_axis(),
+                rx.recharts.graphing_tooltip(),
+                data=AdminState.daily_sales,
+                width="100%",
+                height=260,
+            ),
+            class_name="p-6 bg-white rounded-2xl shadow-sm border mb-6",
+        ),
+        rx.el.div(
+            rx.el.div(
+                rx.el.h3("Payment Mix", class_name="font-semibold mb-2"),
+                rx.foreach(
+                    AdminState.payment_mix,
+                    lambda mix: rx.el.div(
+                        rx.el.span(mix["method"], class_name="uppercase"),
+                        rx.el.span(
+                            f"{mix['orders']} orders ({mix['share']}%) · ₹{mix['revenue']:.2f}"
+                        ),
+                        class_name="flex justify-between py-1",
+                    ),
+                ),
+                class_name="p-6 bg-white rounded-2xl shadow-sm border",
+            ),
+            rx.el.div(
+                rx.el.h3("Units per SKU", class_name="font-semibold mb-2"),
+                rx.foreach(
+                    AdminState.top_skus,
+                    lambda row: rx.el.div(
+                        rx.el.span(f"{row['sku']} · {row['name']}", class_name="truncate"),
+                        rx.el.span(row["units"], class_name="font-bold"),
+                        class_name="flex justify-between gap-4 py-1",
+                    ),
+                ),
+                class_name="p-6 bg-white rounded-2xl shadow-sm border",
+            ),
+            class_name="grid grid-cols-1 md:grid-cols-2 gap-4",
+        ),
+        class_name="mb-12",
+    )
+
+
 def admin_dashboard_content() -> rx.Component:
     return rx.el.main(
         rx.el.h1(
@@ -175,11 +241,12 @@ def admin_dashboard_content() -> rx.Component:
         ),
         rx.el.div(
             rx.el.p(
-                f"Welcome back, {AuthState.logged_in_user['full_name']}!",
+                f"Welcome back, {AccountState.profile['full_name']}!",
                 class_name="text-lg",
             ),
             class_name="p-8 bg-white rounded-2xl shadow-sm border mb-8",
         ),
+        sales_metrics_section(),
         best_selling_products_section(),
     )
 
@@ -194,9 +261,113 @@ def admin_products_content() -> rx.Component:
     )
 
 
+ORDER_COLUMNS = [
+    "Order",
+    "Placed",
+    "Customer",
+    "Status",
+    "Payment",
+    "Method",
+    "Total",
+]
+
+
+def order_row(order: Order) -> rx.Component:
+    return rx.el.tr(
+        rx.el.td(order["id"], class_name="py-2 font-medium"),
+        rx.el.td(order["created_at"][:16].replace("T", " ")),
+        rx.el.td(order["user_email"]),
+        rx.el.td(order["status"], class_name="capitalize"),
+        rx.el.td(order["payment_status"], class_name="capitalize"),
+        rx.el.td(order["payment_method"]["type"], class_name="uppercase"),
+        rx.el.td(f"₹{order['total_amount']:.2f}", class_name="text-right"),
+        class_name="border-b text-sm",
+    )
+
+
+def order_filters() -> rx.Component:
+    return rx.el.form(
+        rx.el.select(
+            rx.el.option("All statuses", value=""),
+            rx.foreach(
+                ORDER_STATUSES,
+                lambda status: rx.el.option(status.capitalize(), value=status),
+            ),
+            name="status",
+            default_value=AdminState.status_filter,
+            class_name="p-2 border rounded-md",
+        ),
+        rx.el.input(
+            name="date_from",
+            type="date",
+            default_value=AdminState.date_from,
+            class_name="p-2 border rounded-md",
+        ),
+        rx.el.input(
+            name="date_to",
+            type="date",
+            default_value=AdminState.date_to,
+            class_name="p-2 border rounded-md",
+        ),
+        rx.el.button(
+            "Filter",
+            type="submit",
+            class_name="px-6 py-2 bg-[#19325C] text-white font-bold rounded-full hover:opacity-90",
+        ),
+        on_submit=AdminState.filter_orders,
+        class_name="flex flex-wrap items-center gap-4 mb-6",
+    )
+
+
+def admin_orders_content() -> rx.Component:
+    return rx.el.main(
+        rx.el.h1(
+            "Orders",
+            class_name="text-3xl font-bold font-['Playfair_Display'] text-[#19325C] mb-6",
+        ),
+        order_filters(),
+        rx.el.div(
+            rx.cond(
+                AdminState.orders.length() > 0,
+                rx.el.table(
+                    rx.el.thead(
+                        rx.el.tr(
+                            rx.foreach(
+                                ORDER_COLUMNS,
+                                lambda heading: rx.el.th(
+                                    heading,
+                                    class_name="py-2 text-left text-sm text-gray-500 uppercase",
+                                ),
+                            ),
+                            class_name="border-b",
+                        )
+                    ),
+                    rx.el.tbody(rx.foreach(AdminState.orders, order_row)),
+                    class_name="w-full",
+                ),
+                rx.el.p("No orders match these filters.", class_name="text-gray-500"),
+            ),
+            rx.cond(
+                AdminState.orders_next_cursor != "",
+                rx.el.button(
+                    "Load more",
+                    on_click=AdminState.load_more_orders,
+                    class_name="mt-6 w-full py-2 border-2 border-[#19325C] text-[#19325C] font-bold rounded-full hover:bg-[#19325C] hover:text-white transition-colors",
+                ),
+                rx.fragment(),
+            ),
+            class_name="p-8 bg-white rounded-2xl shadow-sm border overflow-x-auto",
+        ),
+    )
+
+
 def admin_page() -> rx.Component:
     return admin_page_layout(admin_dashboard_content())
 
 
 def admin_products_page() -> rx.Component:
-    return admin_page_layout(admin_products_content())
\ No newline at end of file
+    return admin_page_layout(admin_products_content())
+
+
+def admin_orders_page() -> rx.Component:
+    return admin_page_layout(admin_orders_content())
@@ -1,28 +1,31 @@
 import reflex as rx
 from app.components.navbar import navbar
 from app.components.footer import footer
+from app.components.responsive_image import responsive_image
 from app.states.cart_state import CartState, CartItem
 
 
 def cart_item_row(item: CartItem) -> rx.Component:
     return rx.el.div(
         rx.el.div(
-            rx.el.img(
-                src=item["product"]["images"][0],
+            responsive_image(
+                item["image"],
+                sizes="96px",
+                width=96,
                 class_name="w-24 h-24 object-cover rounded-lg",
             ),
             rx.el.div(
                 rx.el.a(
-                    item["product"]["name"],
-                    href=f"/product/{item['product']['id']}",
+                    item["name"],
+                    href=f"/product/{item['product_id']}",
                     class_name="font-bold text-lg text-[#19325C]",
                 ),
                 rx.el.p(
-                    f"SKU: {item['product']['sku']}", class_name="text-sm text-gray-500"
+                    f"SKU: {item['sku']}", class_name="text-sm text-gray-500"
                 ),
                 rx.el.button(
                     "Remove",
-                    on_click=lambda: CartState.remove_from_cart(item["product"]["id"]),
+                    on_click=lambda: CartState.remove_from_cart(item["product_id"]),
                     class_name="text-red-500 text-sm hover:underline",
                 ),
                 class_name="ml-4",
@@ -30,12 +33,12 @@ def cart_item_row(item: CartItem) -> rx.Component:
             class_name="flex items-center",
         ),
         rx.el.p(
-            f"₹{item['product']['price']:.2f}", class_name="font-bold text-[#19325C]"
+            f"₹{item['price']:.2f}", class_name="font-bold text-[#19325C]"
         ),
         rx.el.div(
             rx.el.input(
                 on_change=lambda val: CartState.update_quantity(
-                    item["product"]["id"], val
+                    item["product_id"], val
                 ),
                 type="number",
                 class_name="w-20 text-center border rounded-md py-1",
@@ -43,7 +46,7 @@ def cart_item_row(item: CartItem) -> rx.Component:
             )
         ),
         rx.el.p(
-            f"₹{item['product']['price'] * item['quantity']:.2f}",
+            f"₹{item['line_total']:.2f}",
             class_name="font-bold text-[#19325C] text-right",
         ),
         class_name="grid grid-cols-[2fr,1fr,1fr,1fr] gap-4 items-center py-6 border-b",
@@ -1,7 +1,7 @@
 import reflex as rx
 from app.components.navbar import navbar
 from app.components.footer import footer
-from app.components.product_card import product_card
+from app.components.product_listing import listing_toolbar, product_listing
 from app.states.product_state import ProductState
 
 
@@ -18,19 +18,10 @@ def category_page() -> rx.Component:
                     ),
                     class_name="text-4xl font-['Playfair_Display'] font-black text-[#19325C] mb-12 text-center",
                 ),
-                rx.cond(
-                    ProductState.products_in_category.length() > 0,
-                    rx.el.div(
-                        rx.foreach(ProductState.products_in_category, product_card),
-                        class_name="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 xl:grid-cols-4 gap-x-8 gap-y-12",
-                    ),
-                    rx.el.div(
-                        rx.el.p(
-                            "No products found in this category.",
-                            class_name="text-center text-gray-500 italic",
-                        ),
-                        class_name="col-span-full",
-                    ),
+                listing_toolbar(),
+                product_listing(
+                    "grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 xl:grid-cols-4 gap-x-8 gap-y-12",
+                    "No products found in this category.",
                 ),
                 class_name="container mx-auto px-4 py-12",
             )
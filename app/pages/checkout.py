@@ -1,27 +1,39 @@
 import reflex as rx
 from app.components.navbar import navbar
 from app.components.footer import footer
+from app.components.responsive_image import responsive_image
 from app.states.cart_state import CartState, CartItem
-from app.states.auth_state import AuthState
+from app.states.account_state import AccountState
 from app.states.payment_state import PaymentState
 
 
+def shipping_default(field: str) -> rx.Var:
+    """The entered address's value, or the account's until one is entered."""
+    return rx.cond(
+        PaymentState.shipping_address.length() > 0,
+        PaymentState.shipping_address[field],
+        AccountState.profile[field],
+    )
+
+
 def order_summary_item(item: CartItem) -> rx.Component:
     return rx.el.div(
         rx.el.div(
-            rx.el.img(
-                src=item["product"]["images"][0],
+            responsive_image(
+                item["image"],
+                sizes="64px",
+                width=64,
                 class_name="w-16 h-16 object-cover rounded-md",
             ),
             rx.el.div(
-                rx.el.p(item["product"]["name"], class_name="font-semibold"),
+                rx.el.p(item["name"], class_name="font-semibold"),
                 rx.el.p(f"Qty: {item['quantity']}", class_name="text-sm text-gray-500"),
                 class_name="ml-4",
             ),
             class_name="flex items-center",
         ),
         rx.el.p(
-            f"₹{item['product']['price'] * item['quantity']:.2f}",
+            f"₹{item['line_total']:.2f}",
             class_name="font-semibold",
         ),
         class_name="flex justify-between items-center",
@@ -84,14 +96,14 @@ def payment_method_selection() -> rx.Component:
                         class_name="flex items-center gap-2",
                     ),
                     rx.el.p(
-                        f"Pay 50% advance (₹{PaymentState.cod_advance_amount:.2f}) now, remaining ₹{PaymentState.cod_remaining_amount:.2f} on delivery",
+                        f"Pay 50% advance (₹{PaymentState.quote['cod_advance']:.2f}) now, remaining ₹{PaymentState.quote['cod_remaining']:.2f} on delivery",
                         class_name="text-sm text-gray-600 mt-1",
                     ),
                     rx.el.div(
                         rx.el.div(
                             rx.el.span("Advance Payment:", class_name="font-medium"),
                             rx.el.span(
-                                f"₹{PaymentState.cod_advance_amount:.2f}",
+                                f"₹{PaymentState.quote['cod_advance']:.2f}",
                                 class_name="text-[#19325C] font-bold",
                             ),
                             class_name="flex justify-between",
@@ -99,7 +111,7 @@ def payment_method_selection() -> rx.Component:
                         rx.el.div(
                             rx.el.span("On Delivery:", class_name="font-medium"),
                             rx.el.span(
-                                f"₹{PaymentState.cod_remaining_amount:.2f}",
+                                f"₹{PaymentState.quote['cod_remaining']:.2f}",
                                 class_name="text-[#C1A86F] font-bold",
                             ),
                             class_name="flex justify-between",
@@ -129,12 +141,12 @@ def order_summary_sidebar() -> rx.Component:
         rx.el.div(
             rx.el.div(
                 rx.el.p("Subtotal"),
-                rx.el.p(f"₹{CartState.subtotal:.2f}"),
+                rx.el.p(f"₹{PaymentState.quote['subtotal']:.2f}"),
                 class_name="flex justify-between mt-4",
             ),
             rx.el.div(
                 rx.el.p("Shipping"),
-                rx.el.p(f"₹{PaymentState.shipping_cost:.2f}"),
+                rx.el.p(f"₹{PaymentState.quote['shipping']:.2f}"),
                 class_name="flex justify-between text-gray-600",
             ),
             rx.cond(
@@ -143,7 +155,7 @@ def order_summary_sidebar() -> rx.Component:
                     rx.el.div(
                         rx.el.p("Total Amount", class_name="font-semibold"),
                         rx.el.p(
-                            f"₹{CartState.subtotal + PaymentState.shipping_cost:.2f}",
+                            f"₹{PaymentState.quote['total']:.2f}",
                             class_name="font-semibold",
                         ),
                         class_name="flex justify-between text-gray-600 border-t pt-2 mt-2",
@@ -154,7 +166,7 @@ def order_summary_sidebar() -> rx.Component:
                             class_name="font-bold text-[#19325C]",
                         ),
                         rx.el.p(
-                            f"₹{PaymentState.cod_advance_amount:.2f}",
+                            f"₹{PaymentState.quote['cod_advance']:.2f}",
                             class_name="font-bold text-[#19325C]",
                         ),
                         class_name="flex justify-between bg-[#F6E6B6]/50 p-2 rounded mt-2",
@@ -162,7 +174,7 @@ def order_summary_sidebar() -> rx.Component:
                     rx.el.div(
                         rx.el.p("On Delivery", class_name="text-[#C1A86F] font-medium"),
                         rx.el.p(
-                            f"₹{PaymentState.cod_remaining_amount:.2f}",
+                            f"₹{PaymentState.quote['cod_remaining']:.2f}",
                             class_name="text-[#C1A86F] font-bold",
                         ),
                         class_name="flex justify-between mt-2",
@@ -177,7 +189,7 @@ def order_summary_sidebar() -> rx.Component:
             rx.el.div(
                 rx.el.p("Total to Pay", class_name="font-bold text-lg"),
                 rx.el.p(
-                    f"₹{CartState.subtotal + PaymentState.shipping_cost:.2f}",
+                    f"₹{PaymentState.quote['total']:.2f}",
                     class_name="font-bold text-lg",
                 ),
                 class_name="flex justify-between items-center mt-4",
@@ -187,7 +199,7 @@ def order_summary_sidebar() -> rx.Component:
                     "Advance to Pay Now", class_name="font-bold text-lg text-[#19325C]"
                 ),
                 rx.el.p(
-                    f"₹{PaymentState.cod_advance_amount:.2f}",
+                    f"₹{PaymentState.quote['cod_advance']:.2f}",
                     class_name="font-bold text-lg text-[#19325C]",
                 ),
                 class_name="flex justify-between items-center mt-4",
@@ -225,7 +237,7 @@ def checkout_page() -> rx.Component:
                                 rx.el.label("Full Name", class_name="font-semibold"),
                                 rx.el.input(
                                     name="full_name",
-                                    default_value=AuthState.logged_in_user["full_name"],
+                                    default_value=shipping_default("full_name"),
                                     class_name="mt-1 w-full p-2 border rounded-md",
                                     required=True,
                                 ),
@@ -234,7 +246,7 @@ def checkout_page() -> rx.Component:
                                 ),
                                 rx.el.input(
                                     name="email",
-                                    default_value=AuthState.logged_in_user["email"],
+                                    default_value=shipping_default("email"),
                                     type="email",
                                     class_name="mt-1 w-full p-2 border rounded-md",
                                     required=True,
@@ -246,6 +258,7 @@ def checkout_page() -> rx.Component:
                             ),
                             rx.el.input(
                                 name="phone",
+                                default_value=PaymentState.shipping_address["phone"],
                                 placeholder="Your phone number",
                                 type="tel",
                                 class_name="mt-1 w-full p-2 border rounded-md",
@@ -254,6 +267,9 @@ def checkout_page() -> rx.Component:
                             rx.el.label("Address", class_name="font-semibold mt-4"),
                             rx.el.input(
                                 name="address",
+                                default_value=PaymentState.shipping_address[
+                                    "address_line_1"
+                                ],
                                 placeholder="Street address",
                                 class_name="mt-1 w-full p-2 border rounded-md",
                                 required=True,
@@ -261,18 +277,25 @@ def checkout_page() -> rx.Component:
                             rx.el.div(
                                 rx.el.input(
                                     name="city",
+                                    default_value=PaymentState.shipping_address["city"],
                                     placeholder="City",
                                     class_name="mt-2 w-full p-2 border rounded-md",
                                     required=True,
                                 ),
                                 rx.el.input(
                                     name="state",
+                                    default_value=PaymentState.shipping_address[
+                                        "state"
+                                    ],
                                     placeholder="State",
                                     class_name="mt-2 w-full p-2 border rounded-md",
                                     required=True,
                                 ),
                                 rx.el.input(
                                     name="zip_code",
+                                    default_value=PaymentState.shipping_address[
+                                        "postal_code"
+                                    ],
                                     placeholder="ZIP Code",
                                     class_name="mt-2 w-full p-2 border rounded-md",
                                     required=True,
@@ -280,6 +303,10 @@ def checkout_page() -> rx.Component:
                                 class_name="grid grid-cols-1 md:grid-cols-3 gap-4 mt-2",
                             ),
                             on_submit=PaymentState.update_shipping_address,
+                            # Remount once the saved address or profile arrives so the
+                            # uncontrolled inputs pick up their defaults.
+                            key=PaymentState.shipping_address.to_string()
+                            + AccountState.profile.to_string(),
                             class_name="mb-8",
                         ),
                         payment_method_selection(),
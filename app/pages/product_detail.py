@@ -1,8 +1,10 @@
 import reflex as rx
 from app.components.navbar import navbar
 from app.components.footer import footer
+from app.components.responsive_image import responsive_image
 from app.states.product_state import ProductState
 from app.states.cart_state import CartState
+from app.states.account_state import AccountState
 
 
 def product_detail_page() -> rx.Component:
@@ -13,8 +15,12 @@ def product_detail_page() -> rx.Component:
                 ProductState.selected_product,
                 rx.el.div(
                     rx.el.div(
-                        rx.el.img(
-                            src=ProductState.selected_product["images"][0],
+                        responsive_image(
+                            ProductState.selected_product["images"][0],
+                            sizes="(min-width: 768px) 50vw, 100vw",
+                            width=960,
+                            loading="eager",
+                            alt=ProductState.selected_product["name"],
                             class_name="w-full aspect-square object-cover rounded-2xl shadow-lg",
                         )
                     ),
@@ -76,6 +82,23 @@ def product_detail_page() -> rx.Component:
                                 ),
                                 class_name="w-full bg-gradient-to-r from-[#F6E6B6] to-[#C1A86F] text-[#19325C] font-bold py-3 rounded-full hover:opacity-90 transition-opacity",
                             ),
+                            rx.el.button(
+                                rx.icon(
+                                    "heart",
+                                    class_name=rx.cond(
+                                        AccountState.wishlist_ids.contains(
+                                            ProductState.selected_product["id"]
+                                        ),
+                                        "fill-[#C1A86F] text-[#C1A86F]",
+                                        "text-[#19325C]",
+                                    ),
+                                ),
+                                on_click=lambda: AccountState.toggle_wishlist(
+                                    ProductState.selected_product["id"]
+                                ),
+                                title="Save to wishlist",
+                                class_name="p-3 border-2 border-[#19325C] rounded-full hover:bg-[#F6E6B6]/50 transition-colors",
+                            ),
                             class_name="flex items-end gap-4 mt-8",
                         ),
                     ),
@@ -0,0 +1,190 @@
+import sqlite3
+from typing import TypedDict
+from app.services.db import db
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS wishlist (
+    user_id INTEGER NOT NULL,
+    product_id INTEGER NOT NULL,
+    added_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, product_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS addresses (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    full_name TEXT NOT NULL,
+    phone TEXT NOT NULL,
+    address_line_1 TEXT NOT NULL,
+    city TEXT NOT NULL,
+    state TEXT NOT NULL,
+    postal_code TEXT NOT NULL,
+    is_default INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS addresses_by_user
+    ON addresses (user_id, is_default DESC, id DESC);
+"""
+
+ADDRESS_FIELDS = (
+    "full_name",
+    "phone",
+    "address_line_1",
+    "city",
+    "state",
+    "postal_code",
+)
+
+
+class SavedAddress(TypedDict):
+    id: int
+    full_name: str
+    phone: str
+    address_line_1: str
+    city: str
+    state: str
+    postal_code: str
+    is_default: bool
+
+
+def _row_to_address(row: sqlite3.Row) -> SavedAddress:
+    return {
+        "id": row["id"],
+        **{field: row[field] for field in ADDRESS_FIELDS},
+        "is_default": bool(row["is_default"]),
+    }
+
+
+def _insert_address(
+    conn: sqlite3.Connection, user_id: int, address: dict, make_default: bool
+) -> int:
+    has_default = conn.execute(
+        "SELECT 1 FROM addresses WHERE user_id = ? AND is_default = 1", (user_id,)
+    ).fetchone()
+    is_default = make_default or not has_default
+    if is_default:
+        conn.execute("UPDATE addresses SET is_default = 0 WHERE user_id = ?", (user_id,))
+    return conn.execute(
+        "INSERT INTO addresses (user_id, full_name, phone, address_line_1, "
+        "city, state, postal_code, is_default) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            user_id,
+            *(address.get(field, "") for field in ADDRESS_FIELDS),
+            int(is_default),
+        ),
+    ).lastrowid
+
+
+class AccountStore:
+    """Per-user wishlist and address book.
+
+    Wishlist rows are just ``(user_id, product_id)`` pairs in a clustered
+    table; product details are resolved against the catalog when shown.
+    Each user has at most one default address, listed first.
+    """
+
+    def ensure_schema(self):
+        db.ensure_schema("account", SCHEMA)
+
+    async def wishlist(self, user_id: int) -> list[int]:
+        self.ensure_schema()
+        rows = await db.run(
+            lambda conn: conn.execute(
+                "SELECT product_id FROM wishlist WHERE user_id = ? "
+                "ORDER BY added_at DESC",
+                (user_id,),
+            ).fetchall()
+        )
+        return [row["product_id"] for row in rows]
+
+    async def add_to_wishlist(self, user_id: int, product_id: int):
+        self.ensure_schema()
+        await db.run(
+            lambda conn: conn.execute(
+                "INSERT OR IGNORE INTO wishlist (user_id, product_id) VALUES (?, ?)",
+                (user_id, product_id),
+            )
+        )
+
+    async def remove_from_wishlist(self, user_id: int, product_id: int):
+        self.ensure_schema()
+        await db.run(
+            lambda conn: conn.execute(
+                "DELETE FROM wishlist WHERE user_id = ? AND product_id = ?",
+                (user_id, product_id),
+            )
+        )
+
+    async def addresses(self, user_id: int) -> list[SavedAddress]:
+        self.ensure_schema()
+        rows = await db.run(
+            lambda conn: conn.execute(
+                "SELECT * FROM addresses WHERE user_id = ? "
+                "ORDER BY is_default DESC, id DESC",
+                (user_id,),
+            ).fetchall()
+        )
+        return [_row_to_address(row) for row in rows]
+
+    async def default_address(self, user_id: int) -> SavedAddress | None:
+        self.ensure_schema()
+        row = await db.run(
+            lambda conn: conn.execute(
+                "SELECT * FROM addresses WHERE user_id = ? "
+                "ORDER BY is_default DESC, id DESC LIMIT 1",
+                (user_id,),
+            ).fetchone()
+        )
+        return _row_to_address(row) if row else None
+
+    async def save_address(
+        self, user_id: int, address: dict, make_default: bool = False
+    ) -> int:
+        """Add an address; the user's first address always becomes the default."""
+        self.ensure_schema()
+
+        return await db.run(
+            lambda conn: _insert_address(conn, user_id, address, make_default)
+        )
+
+    def remember_address(self, conn: sqlite3.Connection, user_id: int, address: dict):
+        """Save a checkout address unless the user already has one on file.
+
+        Call inside the order's insert transaction.
+        """
+        if not address.get("address_line_1"):
+            return
+        has_address = conn.execute(
+            "SELECT 1 FROM addresses WHERE user_id = ? LIMIT 1", (user_id,)
+        ).fetchone()
+        if not has_address:
+            _insert_address(conn, user_id, address, make_default=True)
+
+    async def set_default_address(self, user_id: int, address_id: int):
+        self.ensure_schema()
+        await db.run(
+            lambda conn: conn.execute(
+                "UPDATE addresses SET is_default = (id = ?) WHERE user_id = ?",
+                (address_id, user_id),
+            )
+        )
+
+    async def delete_address(self, user_id: int, address_id: int):
+        self.ensure_schema()
+
+        def delete(conn: sqlite3.Connection):
+            conn.execute(
+                "DELETE FROM addresses WHERE id = ? AND user_id = ?",
+                (address_id, user_id),
+            )
+            # Promote the newest remaining address if the default went away.
+            conn.execute(
+                "UPDATE addresses SET is_default = 1 WHERE id = ("
+                "SELECT id FROM addresses WHERE user_id = ? ORDER BY id DESC LIMIT 1"
+                ") AND NOT EXISTS ("
+                "SELECT 1 FROM addresses WHERE user_id = ? AND is_default = 1)",
+                (user_id, user_id),
+            )
+
+        await db.run(delete)
+
+
+account_store = AccountStore()
@@ -0,0 +1,160 @@
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import TYPE_CHECKING
+from app.services.db import db
+
+if TYPE_CHECKING:
+    from app.states.cart_state import CartLine
+
+CART_WRITE_DELAY = float(os.getenv("CART_WRITE_DELAY", "1"))
+CART_ANON_TTL = float(os.getenv("CART_ANON_TTL", str(30 * 24 * 3600)))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS carts (
+    cart_key TEXT PRIMARY KEY,
+    items TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS carts_by_updated_at ON carts (updated_at);
+"""
+
+
+def user_cart_key(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def guest_cart_key(token: str) -> str:
+    return f"anon:{token}"
+
+
+def merge_carts(
+    guest: dict[int, "CartLine"], user: dict[int, "CartLine"]
+) -> dict[int, "CartLine"]:
+    """Fold a guest cart into the user's saved cart.
+
+    A product in both keeps the larger quantity rather than the sum, so
+    logging in on a device that already showed the saved cart does not
+    double it.
+    """
+    merged = dict(user)
+    for product_id, line in guest.items():
+        saved = merged.get(product_id)
+        if saved is None or saved["quantity"] < line["quantity"]:
+            merged[product_id] = line
+    return merged
+
+
+class CartStore:
+    """Carts persisted in SQLite, keyed by user or anonymous token.
+
+    Saves are coalesced: the latest contents per key are held in memory and
+    written in one transaction CART_WRITE_DELAY seconds after the first
+    change, so a burst of quantity edits costs a single write. Loads see
+    pending and in-flight contents before they reach the database. The
+    flush task keeps going until nothing is pending, so saves made during
+    a write, and batches put back after a failed one, are written too.
+    """
+
+    def __init__(self, delay: float = CART_WRITE_DELAY):
+        self.delay = delay
+        self._pending: dict[str, dict[int, "CartLine"]] = {}
+        self._writing: dict[str, dict[int, "CartLine"]] = {}
+        self._flush_task: asyncio.Task | None = None
+
+    def _schema(self):
+        db.ensure_schema("carts", SCHEMA)
+
+    async def load(self, key: str) -> dict[int, "CartLine"]:
+        for contents in (self._pending, self._writing):
+            if key in contents:
+                return dict(contents[key])
+        self._schema()
+        row = await db.run(
+            lambda conn: conn.execute(
+                "SELECT items FROM carts WHERE cart_key = ?", (key,)
+            ).fetchone()
+        )
+        if row is None:
+            return {}
+        # JSON object keys are strings; carts are keyed by product id.
+        items = json.loads(row["items"])
+        return {int(product_id): line for product_id, line in items.items()}
+
+    def save(self, key: str, items: dict[int, "CartLine"]):
+        self._pending[key] = {
+            product_id: dict(line) for product_id, line in items.items()
+        }
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    def delete(self, key: str):
+        self.save(key, {})
+
+    async def _flush_later(self):
+        while self._pending:
+            await asyncio.sleep(self.delay)
+            try:
+                await self.flush()
+            except Exception as e:
+                logging.exception(f"Cart flush failed: {e}")
+
+    async def flush(self) -> int:
+        if not self._pending:
+            return 0
+        self._schema()
+        batch, self._pending = self._pending, {}
+        self._writing = batch
+        now = time.time()
+
+        def write(conn: sqlite3.Connection):
+            conn.executemany(
+                "INSERT INTO carts (cart_key, items, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (cart_key) DO UPDATE SET items = excluded.items, "
+                "updated_at = excluded.updated_at",
+                [
+                    (key, json.dumps(items), now)
+                    for key, items in batch.items()
+                    if items
+                ],
+            )
+            conn.executemany(
+                "DELETE FROM carts WHERE cart_key = ?",
+                [(key,) for key, items in batch.items() if not items],
+            )
+
+        try:
+            await db.run(write)
+        except sqlite3.Error:
+            # Put the batch back unless newer contents arrived meanwhile.
+            self._pending = {**batch, **self._pending}
+            raise
+        finally:
+            self._writing = {}
+        return len(batch)
+
+    async def purge_guest_carts(self, max_age: float = CART_ANON_TTL) -> int:
+        self._schema()
+        return await db.run(
+            lambda conn: conn.execute(
+                "DELETE FROM carts WHERE cart_key LIKE 'anon:%' AND updated_at < ?",
+                (time.time() - max_age,),
+            ).rowcount
+        )
+
+
+cart_store = CartStore()
+
+
+@contextlib.asynccontextmanager
+async def cart_store_lifespan():
+    with contextlib.suppress(sqlite3.Error):
+        await cart_store.purge_guest_carts()
+    try:
+        yield
+    finally:
+        await cart_store.flush()
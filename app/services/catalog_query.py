@@ -0,0 +1,142 @@
+import math
+from typing import TYPE_CHECKING, TypedDict
+from app.services.product_index import ProductIndex
+
+if TYPE_CHECKING:
+    from app.states.product_state import Product
+
+FACETS = ("category", "occasion", "recipient")
+
+
+class ProductQuery(TypedDict):
+    category: list[str]
+    occasion: list[str]
+    recipient: list[str]
+    min_price: float | None
+    max_price: float | None
+    in_stock: bool
+    sort: str
+    page: int
+    page_size: int
+    cursor: str
+
+
+class FacetValue(TypedDict):
+    value: str
+    label: str
+    count: int
+    selected: bool
+
+
+class ProductPage(TypedDict):
+    products: list["Product"]
+    total: int
+    page: int
+    page_count: int
+    next_cursor: str
+    facets: dict[str, list[FacetValue]]
+
+
+def _intersect(sets: list[set[int]]) -> set[int] | None:
+    """Intersection of ``sets``, or None (meaning "everything") if empty."""
+    if not sets:
+        return None
+    sets = sorted(sets, key=len)
+    result = set(sets[0])
+    for other in sets[1:]:
+        result &= other
+    return result
+
+
+def _facet_buckets(index: ProductIndex, facet: str) -> dict[str, str]:
+    if facet == "category":
+        return index.category_names
+    buckets = index.by_occasion if facet == "occasion" else index.by_recipient
+    return {value: value for value, products in buckets.items() if products}
+
+
+def _parse_cursor(cursor: str, version: int) -> int | None:
+    cursor_version, _, position = cursor.partition(":")
+    if cursor_version != str(version) or not position.isdigit():
+        return None
+    return int(position)
+
+
+def query_products(
+    index: ProductIndex, version: int, query: ProductQuery
+) -> ProductPage:
+    """Filter, facet, sort and paginate the catalog without copying it.
+
+    Facets are OR-ed within a dimension and AND-ed across dimensions. Each
+    facet's counts are computed against every other active filter so the
+    sidebar shows how many results picking that value would give. A cursor
+    is a position in the pre-sorted order for one catalog version and is
+    passed together with the page number it starts; a stale cursor falls
+    back to offset paging.
+    """
+    base_filters = []
+    if query["min_price"] is not None or query["max_price"] is not None:
+        base_filters.append(
+            index.ids_in_price_range(query["min_price"], query["max_price"])
+        )
+    if query["in_stock"]:
+        base_filters.append(index.in_stock_ids())
+    facet_filters = {
+        facet: set().union(*(index.bucket_ids(facet, v) for v in query[facet]))
+        for facet in FACETS
+        if query[facet]
+    }
+    matches = _intersect(base_filters + list(facet_filters.values()))
+
+    facets: dict[str, list[FacetValue]] = {}
+    for facet in FACETS:
+        others = _intersect(
+            base_filters + [ids for f, ids in facet_filters.items() if f != facet]
+        )
+        values = []
+        for value, label in sorted(_facet_buckets(index, facet).items()):
+            ids = index.bucket_ids(facet, value)
+            count = len(ids) if others is None else len(ids & others)
+            selected = value in query[facet]
+            if count or selected:
+                values.append(
+                    {
+                        "value": value,
+                        "label": label,
+                        "count": count,
+                        "selected": selected,
+                    }
+                )
+        facets[facet] = values
+
+    page_size = max(1, query["page_size"])
+    total = len(index.products) if matches is None else len(matches)
+    page_count = max(1, math.ceil(total / page_size))
+    page = min(max(1, query["page"]), page_count)
+    order = index.sorted_by(query["sort"])
+    start = _parse_cursor(query["cursor"], version) if query["cursor"] else None
+
+    if matches is None:
+        position = (page - 1) * page_size if start is None else start
+        products = order[position : position + page_size]
+        end = position + len(products)
+    else:
+        skip = 0 if start is not None else (page - 1) * page_size
+        products = []
+        end = start or 0
+        while end < len(order) and len(products) < page_size:
+            product = order[end]
+            end += 1
+            if product["id"] in matches:
+                if skip:
+                    skip -= 1
+                else:
+                    products.append(product)
+    return {
+        "products": products,
+        "total": total,
+        "page": page,
+        "page_count": page_count,
+        "next_cursor": f"{version}:{end}" if page < page_count else "",
+        "facets": facets,
+    }
@@ -0,0 +1,182 @@
+import logging
+import math
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.states.product_state import Product
+
+CATALOG_SNAPSHOT_PATH = os.getenv("CATALOG_SNAPSHOT_PATH", "data/catalog.snapshot")
+
+MAGIC = b"DKCAT\x00\x01\x00"
+HEADER = struct.Struct("<8sBxxxII")
+COLUMN = struct.Struct("<16scxxxQQ")
+STRING_SEPARATOR = "\x00"
+IMAGE_SEPARATOR = "\x1f"
+ALIGNMENT = 8
+
+# (field, type code) in file order. "q" and "d" columns are raw int64 /
+# float64 arrays; "s" columns are NUL-joined UTF-8 so a whole column
+# decodes with one bytes.decode() and one str.split().
+PRODUCT_COLUMNS = [
+    ("id", b"q"),
+    ("name", b"s"),
+    ("sku", b"s"),
+    ("price", b"d"),
+    ("original_price", b"d"),
+    ("description", b"s"),
+    ("images", b"s"),
+    ("category", b"s"),
+    ("occasion", b"s"),
+    ("recipient", b"s"),
+    ("stock", b"q"),
+    ("rating", b"d"),
+    ("num_reviews", b"q"),
+]
+
+
+def _encode_strings(values: list[str]) -> bytes:
+    return STRING_SEPARATOR.join(
+        value.replace(STRING_SEPARATOR, "") for value in values
+    ).encode()
+
+
+def _encode_column(field: str, kind: bytes, products: list["Product"]) -> bytes:
+    if field == "images":
+        return _encode_strings([IMAGE_SEPARATOR.join(p["images"]) for p in products])
+    if field == "original_price":
+        # NaN stands in for "no original price".
+        values = [
+            float("nan") if p["original_price"] is None else p["original_price"]
+            for p in products
+        ]
+        return array("d", values).tobytes()
+    if kind == b"s":
+        return _encode_strings([str(p[field] or "") for p in products])
+    return array(kind.decode(), [p[field] for p in products]).tobytes()
+
+
+def write_catalog_snapshot(
+    products: list["Product"],
+    categories: list[str],
+    path: str = CATALOG_SNAPSHOT_PATH,
+):
+    """Write the catalog as a columnar file, atomically replacing ``path``."""
+    columns = [
+        (field, kind, _encode_column(field, kind, products))
+        for field, kind in PRODUCT_COLUMNS
+    ]
+    columns.append(("categories", b"s", _encode_strings(categories)))
+    offset = HEADER.size + COLUMN.size * len(columns)
+    directory, blobs = [], []
+    for field, kind, data in columns:
+        padding = -offset % ALIGNMENT
+        blobs.append(b"\x00" * padding + data)
+        offset += padding
+        directory.append(COLUMN.pack(field.encode(), kind, offset, len(data)))
+        offset += len(data)
+    byteorder = 0 if sys.byteorder == "little" else 1
+    directory_dir = os.path.dirname(path) or "."
+    os.makedirs(directory_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, byteorder, len(products), len(columns)))
+            f.writelines(directory)
+            f.writelines(blobs)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class CatalogSnapshotFile:
+    """Read-only, memory-mapped view of a file written by write_catalog_snapshot.
+
+    Opening only parses the fixed-size header and column directory; each
+    column is decoded from the mapping the first time it is read.
+    """
+
+    def __init__(self, path: str = CATALOG_SNAPSHOT_PATH):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, byteorder, self.row_count, column_count = HEADER.unpack_from(
+            self._map
+        )
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a catalog snapshot")
+        self._swap = byteorder != (0 if sys.byteorder == "little" else 1)
+        self._columns: dict[str, tuple[bytes, int, int]] = {}
+        for i in range(column_count):
+            name, kind, offset, length = COLUMN.unpack_from(
+                self._map, HEADER.size + i * COLUMN.size
+            )
+            self._columns[name.rstrip(b"\x00").decode()] = (kind, offset, length)
+
+    def column(self, field: str) -> list:
+        if field not in self._columns:
+            raise ValueError(f"Catalog snapshot has no {field} column")
+        kind, offset, length = self._columns[field]
+        if offset + length > len(self._map):
+            raise ValueError(f"Catalog snapshot is truncated in the {field} column")
+        data = self._map[offset : offset + length]
+        if kind == b"s":
+            return data.decode().split(STRING_SEPARATOR)
+        values = array(kind.decode())
+        values.frombytes(data)
+        if self._swap:
+            values.byteswap()
+        return values.tolist()
+
+    def products(self) -> list["Product"]:
+        if self.row_count == 0:
+            return []
+        columns = {field: self.column(field) for field, _ in PRODUCT_COLUMNS}
+        for field, values in columns.items():
+            # zip() would quietly drop rows past the shortest column.
+            if len(values) != self.row_count:
+                raise ValueError(
+                    f"Catalog snapshot {field} column has {len(values)} values, "
+                    f"expected {self.row_count}"
+                )
+        columns["images"] = [
+            images.split(IMAGE_SEPARATOR) for images in columns["images"]
+        ]
+        columns["original_price"] = [
+            None if math.isnan(price) else price for price in columns["original_price"]
+        ]
+        fields = list(columns)
+        return [dict(zip(fields, row)) for row in zip(*columns.values())]
+
+    def categories(self) -> list[str]:
+        return [category for category in self.column("categories") if category]
+
+    def close(self):
+        self._map.close()
+
+
+def read_catalog_snapshot(
+    path: str = CATALOG_SNAPSHOT_PATH,
+) -> tuple[list["Product"], list[str]] | None:
+    """Products and categories from the saved snapshot, or None if unusable."""
+    if not os.path.exists(path):
+        return None
+    try:
+        snapshot = CatalogSnapshotFile(path)
+    except (OSError, ValueError, struct.error) as e:
+        logging.warning(f"Ignoring unreadable catalog snapshot {path}: {e}")
+        return None
+    try:
+        return snapshot.products(), snapshot.categories()
+    except ValueError as e:
+        # Includes UnicodeDecodeError and array sizes that don't divide.
+        logging.warning(f"Ignoring corrupt catalog snapshot {path}: {e}")
+        return None
+    finally:
+        snapshot.close()
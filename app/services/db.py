@@ -0,0 +1,65 @@
+import asyncio
+import os
+import sqlite3
+import threading
+from typing import Callable, TypeVar
+
+DATABASE_PATH = os.getenv("DATABASE_PATH", "data/dreamknot.db")
+
+T = TypeVar("T")
+
+
+class Database:
+    """One SQLite connection in WAL mode, used from worker threads.
+
+    SQLite serialises writers anyway, so callers share a single connection
+    behind a lock and run their queries through ``run`` to keep blocking
+    I/O off the event loop. Each feature creates its own tables through
+    ``ensure_schema`` the first time it touches the database.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._schemas: set[str] = set()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._conn = conn
+        return self._conn
+
+    def ensure_schema(self, name: str, ddl: str):
+        """Run ``ddl`` once per process; it must be idempotent (IF NOT EXISTS)."""
+        if name in self._schemas:
+            return
+        with self._lock:
+            if name not in self._schemas:
+                with self._connect() as conn:
+                    conn.executescript(ddl)
+                self._schemas.add(name)
+
+    def call(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Run ``fn`` in a transaction on the calling thread."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                return fn(conn)
+
+    async def run(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        return await asyncio.to_thread(self.call, fn)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+db = Database(DATABASE_PATH)
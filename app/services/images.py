@@ -0,0 +1,241 @@
+import asyncio
+import contextlib
+import hashlib
+import importlib.util
+import io
+import logging
+import os
+from urllib.parse import urlparse
+import httpx
+from starlette.requests import Request
+from starlette.responses import RedirectResponse, Response
+from starlette.routing import Route
+from app.services.metrics import cache_result
+from app.services.strapi_client import STRAPI_URL
+
+IMAGE_CACHE_DIR = os.getenv("IMAGE_CACHE_DIR", "data/images")
+IMAGE_CACHE_MAX_BYTES = int(os.getenv("IMAGE_CACHE_MAX_BYTES", str(512 * 2**20)))
+IMAGE_FETCH_TIMEOUT = float(os.getenv("IMAGE_FETCH_TIMEOUT", "15"))
+IMAGE_MAX_SOURCE_BYTES = int(os.getenv("IMAGE_MAX_SOURCE_BYTES", str(20 * 2**20)))
+# Derivative widths; requests are rounded up to the next one so the cache
+# holds a bounded set per image.
+IMAGE_WIDTHS = (96, 160, 320, 480, 640, 960, 1280)
+IMAGE_QUALITY = {"avif": 50, "webp": 78, "jpeg": 82}
+IMAGE_ROUTE = "/_img"
+
+IMAGING_AVAILABLE = importlib.util.find_spec("PIL") is not None
+
+
+def _allowed_hosts() -> set[str]:
+    """Hosts we will fetch originals from, so the route is not an open proxy."""
+    strapi_host = urlparse(STRAPI_URL).hostname or ""
+    hosts = {strapi_host}
+    if strapi_host.endswith(".strapiapp.com"):
+        # Strapi Cloud serves uploads from a sibling media host.
+        hosts.add(strapi_host.replace(".strapiapp.com", ".media.strapiapp.com"))
+    hosts.update(filter(None, os.getenv("IMAGE_SOURCE_HOSTS", "").split(",")))
+    return hosts
+
+
+ALLOWED_SOURCE_HOSTS = _allowed_hosts()
+
+
+def _pick_format(accept: str) -> str:
+    from PIL import features
+
+    if "image/avif" in accept and features.check("avif"):
+        return "avif"
+    if "image/webp" in accept:
+        return "webp"
+    return "jpeg"
+
+
+def _render(original: bytes, width: int, fmt: str) -> bytes:
+    """Centre-crop to a square ``width`` px wide and encode as ``fmt``.
+
+    Every place a product image is shown is square (object-cover), so
+    cropping here lets pages declare exact width/height.
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(original)) as image:
+        image = ImageOps.exif_transpose(image)
+        side = min(width, image.width, image.height)
+        image = ImageOps.fit(image, (side, side), Image.Resampling.LANCZOS)
+        if fmt == "jpeg" or image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGB" if fmt == "jpeg" else "RGBA")
+        out = io.BytesIO()
+        image.save(out, fmt.upper(), quality=IMAGE_QUALITY[fmt])
+        return out.getvalue()
+
+
+class DerivativeCache:
+    """Resized images on disk, named by a hash of source URL, width and format.
+
+    Keys hash the URL, not the image bytes. That is safe because Strapi
+    upload URLs embed a hash of the file, so a URL never changes meaning
+    and entries never need invalidating. Hits bump the file's mtime; when
+    the directory grows past ``max_bytes`` the least recently used files
+    are removed until it is back under 90% of the limit.
+    """
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._size: int | None = None
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._client: httpx.AsyncClient | None = None
+        self._evicting = False
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key)
+
+    def _read(self, path: str) -> bytes | None:
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        os.utime(path)
+        return data
+
+    def _write(self, path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _scan(self) -> list[tuple[float, int, str]]:
+        entries = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                with contextlib.suppress(FileNotFoundError):
+                    stat = os.stat(path)
+                    entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict(self) -> int:
+        entries = sorted(self._scan())
+        size = sum(entry[1] for entry in entries)
+        target = self.max_bytes * 0.9
+        for _, entry_size, path in entries:
+            if size <= target:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+                size -= entry_size
+        return size
+
+    async def _account(self, added: int):
+        if self._size is None:
+            self._size = sum(
+                entry[1] for entry in await asyncio.to_thread(self._scan)
+            )
+        self._size += added
+        if self._size > self.max_bytes and not self._evicting:
+            self._evicting = True
+            try:
+                self._size = await asyncio.to_thread(self._evict)
+            finally:
+                self._evicting = False
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            # No redirects: they could lead outside ALLOWED_SOURCE_HOSTS.
+            self._client = httpx.AsyncClient(timeout=IMAGE_FETCH_TIMEOUT)
+        return self._client
+
+    async def _original(self, src: str) -> bytes:
+        key = hashlib.sha256(f"original|{src}".encode()).hexdigest()
+        path = self._path(key)
+        if (data := await asyncio.to_thread(self._read, path)) is not None:
+            return data
+        chunks, size = [], 0
+        # Stream so an oversized original is dropped before it is all in memory.
+        async with self._get_client().stream("GET", src) as response:
+            response.raise_for_status()
+            declared = int(response.headers.get("content-length") or 0)
+            if declared > IMAGE_MAX_SOURCE_BYTES:
+                raise ValueError(f"Image too large: {src}")
+            async for chunk in response.aiter_bytes():
+                size += len(chunk)
+                if size > IMAGE_MAX_SOURCE_BYTES:
+                    raise ValueError(f"Image too large: {src}")
+                chunks.append(chunk)
+        data = b"".join(chunks)
+        await asyncio.to_thread(self._write, path, data)
+        await self._account(size)
+        return data
+
+    async def _build(self, src: str, width: int, fmt: str, path: str) -> bytes:
+        original = await self._original(src)
+        data = await asyncio.to_thread(_render, original, width, fmt)
+        await asyncio.to_thread(self._write, path, data)
+        await self._account(len(data))
+        return data
+
+    async def get(self, src: str, width: int, fmt: str) -> bytes:
+        key = hashlib.sha256(f"{src}|{width}|{fmt}".encode()).hexdigest()
+        path = self._path(key)
+        if (data := await asyncio.to_thread(self._read, path)) is not None:
+            cache_result("image_derivative", "hit")
+            return data
+        cache_result("image_derivative", "miss")
+        # Concurrent requests for the same derivative share one build.
+        if key not in self._inflight:
+            self._inflight[key] = asyncio.ensure_future(
+                self._build(src, width, fmt, path)
+            )
+            self._inflight[key].add_done_callback(
+                lambda _: self._inflight.pop(key, None)
+            )
+        return await asyncio.shield(self._inflight[key])
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+derivative_cache = DerivativeCache(IMAGE_CACHE_DIR, IMAGE_CACHE_MAX_BYTES)
+
+
+async def image_endpoint(request: Request) -> Response:
+    src = request.path_params["src"]
+    # Some proxies collapse the "//" after the scheme inside a path.
+    if src.startswith(("https:/", "http:/")) and "://" not in src:
+        src = src.replace(":/", "://", 1)
+    if urlparse(src).hostname not in ALLOWED_SOURCE_HOSTS:
+        return Response("Image source not allowed", status_code=403)
+    if not IMAGING_AVAILABLE:
+        return RedirectResponse(src)
+    requested = int(request.path_params["width"])
+    width = next((w for w in IMAGE_WIDTHS if w >= requested), IMAGE_WIDTHS[-1])
+    fmt = _pick_format(request.headers.get("accept", ""))
+    try:
+        data = await derivative_cache.get(src, width, fmt)
+    except Exception as e:
+        # Unreachable or undecodable originals fall back to the original.
+        logging.warning(f"Could not resize {src}: {e}")
+        return RedirectResponse(src)
+    return Response(
+        data,
+        media_type=f"image/{fmt}",
+        headers={
+            "Cache-Control": "public, max-age=31536000, immutable",
+            "Vary": "Accept",
+        },
+    )
+
+
+image_routes = [Route(f"{IMAGE_ROUTE}/{{width:int}}/{{src:path}}", image_endpoint)]
+
+
+@contextlib.asynccontextmanager
+async def image_cache_lifespan():
+    try:
+        yield
+    finally:
+        await derivative_cache.aclose()
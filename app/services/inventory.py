@@ -0,0 +1,313 @@
+import asyncio
+import contextlib
+import heapq
+import logging
+import os
+import threading
+import time
+from typing import TYPE_CHECKING
+from app.services.strapi_client import HTTPError, strapi
+
+if TYPE_CHECKING:
+    from app.states.product_state import Product
+
+INVENTORY_LOCK_STRIPES = int(os.getenv("INVENTORY_LOCK_STRIPES", "64"))
+CART_RESERVATION_TTL = float(os.getenv("CART_RESERVATION_TTL", "900"))
+INVENTORY_FLUSH_INTERVAL = float(os.getenv("INVENTORY_FLUSH_INTERVAL", "5"))
+INVENTORY_FLUSH_BATCH = int(os.getenv("INVENTORY_FLUSH_BATCH", "50"))
+
+
+class InsufficientStock(Exception):
+    def __init__(self, product_id: int, available: int):
+        super().__init__(f"Only {available} left in stock for product {product_id}")
+        self.product_id = product_id
+        self.available = available
+
+
+class Inventory:
+    """Stock levels and cart reservations for this process.
+
+    Available stock is ``on_hand - reserved``. A holder (one cart) reserves
+    an absolute quantity per product for CART_RESERVATION_TTL seconds;
+    committing at checkout turns the reservation into a real decrement,
+    and expired reservations are released lazily and by a sweeper.
+
+    State for a product is guarded by one of INVENTORY_LOCK_STRIPES locks
+    chosen by product id, so checkouts for different products do not
+    contend; multi-product operations take their stripes in a fixed order.
+    Committed decrements are queued and written back to Strapi in batches.
+    Strapi has no atomic decrement, so two workers flushing the same
+    product at the same moment can still race between read and write.
+    """
+
+    def __init__(self, stripes: int = INVENTORY_LOCK_STRIPES):
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        # One expiry heap per stripe so it is guarded by the same lock.
+        self._expiry: list[list[tuple[float, int, str]]] = [[] for _ in range(stripes)]
+        self.on_hand: dict[int, int] = {}
+        self.reserved: dict[int, int] = {}
+        # product id -> holder -> (quantity, expires_at)
+        self._holds: dict[int, dict[str, tuple[int, float]]] = {}
+        self._dirty: set[int] = set()
+        self._pending_decrements: dict[int, int] = {}
+        # product id -> time.monotonic() of its last completed write-back
+        self._written_at: dict[int, float] = {}
+        self._dirty_lock = threading.Lock()
+
+    def _stripe(self, product_id: int) -> int:
+        return product_id % len(self._locks)
+
+    @contextlib.contextmanager
+    def _locked(self, product_ids):
+        # Always acquire in stripe order so multi-product callers can't deadlock.
+        stripes = sorted({self._stripe(product_id) for product_id in product_ids})
+        for stripe in stripes:
+            self._locks[stripe].acquire()
+        try:
+            yield
+        finally:
+            for stripe in reversed(stripes):
+                self._locks[stripe].release()
+
+    def sync(
+        self,
+        products: list["Product"],
+        authoritative: bool = True,
+        fetched_at: float | None = None,
+    ):
+        """Take stock levels from the catalog.
+
+        Decrements that have not been written back yet are subtracted so a
+        refresh never hands sold units back out. ``fetched_at`` is the
+        ``time.monotonic()`` at which the catalog request started; products
+        written back since then keep their newer local level. A
+        non-authoritative catalog (saved or dummy data) only seeds products
+        we know nothing about.
+        """
+        with self._dirty_lock:
+            pending = dict(self._pending_decrements)
+            written_at = dict(self._written_at)
+        for product in products:
+            product_id = product["id"]
+            if (
+                fetched_at is not None
+                and written_at.get(product_id, float("-inf")) > fetched_at
+            ):
+                continue
+            with self._locked([product_id]):
+                if authoritative or product_id not in self.on_hand:
+                    self.on_hand[product_id] = max(
+                        0, product["stock"] - pending.get(product_id, 0)
+                    )
+
+    def available(self, product_id: int) -> int:
+        with self._locked([product_id]):
+            self._expire_holds(product_id)
+            return max(self._available(product_id), 0)
+
+    def _available(self, product_id: int) -> int:
+        return self.on_hand.get(product_id, 0) - self.reserved.get(product_id, 0)
+
+    def _held(self, holder: str, product_id: int) -> int:
+        hold = self._holds.get(product_id, {}).get(holder)
+        return hold[0] if hold else 0
+
+    def _set_hold(self, holder: str, product_id: int, quantity: int, ttl: float = 0):
+        holds = self._holds.setdefault(product_id, {})
+        previous = holds.pop(holder, (0, 0.0))[0]
+        self.reserved[product_id] = self.reserved.get(product_id, 0) - previous
+        if quantity > 0:
+            expires_at = time.monotonic() + ttl
+            holds[holder] = (quantity, expires_at)
+            self.reserved[product_id] += quantity
+            heapq.heappush(
+                self._expiry[self._stripe(product_id)], (expires_at, product_id, holder)
+            )
+        elif not holds:
+            del self._holds[product_id]
+
+    def _expire_holds(self, product_id: int):
+        now = time.monotonic()
+        holds = self._holds.get(product_id, {})
+        for holder in [h for h, (_, expires_at) in holds.items() if expires_at <= now]:
+            self._set_hold(holder, product_id, 0)
+
+    def _check(self, holder: str, quantities: dict[int, int]):
+        for product_id, quantity in quantities.items():
+            if quantity - self._held(holder, product_id) > self._available(product_id):
+                # Only pay for expiry cleanup when stock looks short.
+                self._expire_holds(product_id)
+                held = self._held(holder, product_id)
+                available = self._available(product_id)
+                if quantity - held > available:
+                    raise InsufficientStock(product_id, held + max(available, 0))
+
+    def reserve(
+        self, holder: str, quantities: dict[int, int], ttl: float = CART_RESERVATION_TTL
+    ):
+        """Hold exactly the given quantities for ``holder``, renewing the TTL.
+
+        All lines are reserved or none are: InsufficientStock leaves the
+        holder's existing reservations untouched.
+        """
+        with self._locked(quantities):
+            self._check(holder, quantities)
+            for product_id, quantity in quantities.items():
+                self._set_hold(holder, product_id, quantity, ttl)
+
+    def release(self, holder: str, product_ids):
+        with self._locked(product_ids):
+            for product_id in product_ids:
+                self._set_hold(holder, product_id, 0)
+
+    def commit(self, holder: str, quantities: dict[int, int]):
+        """Turn ``holder``'s reservations for ``quantities`` into sold stock.
+
+        Lines whose reservation lapsed are re-checked against available
+        stock; if any line cannot be filled nothing is committed.
+        """
+        with self._locked(quantities):
+            self._check(holder, quantities)
+            # Queue the decrements before releasing the stripes so a
+            # concurrent write-back sees on_hand and pending change together.
+            with self._dirty_lock:
+                for product_id, quantity in quantities.items():
+                    self._set_hold(holder, product_id, 0)
+                    self.on_hand[product_id] = (
+                        self.on_hand.get(product_id, 0) - quantity
+                    )
+                    self._pending_decrements[product_id] = (
+                        self._pending_decrements.get(product_id, 0) + quantity
+                    )
+                    self._dirty.add(product_id)
+
+    def restock(self, quantities: dict[int, int]):
+        """Undo a ``commit`` whose order could not be recorded."""
+        with self._locked(quantities), self._dirty_lock:
+            for product_id, quantity in quantities.items():
+                self.on_hand[product_id] = self.on_hand.get(product_id, 0) + quantity
+                # Negative when the decrement was already written back; the
+                # next flush then adds the units back in Strapi.
+                pending = self._pending_decrements.get(product_id, 0) - quantity
+                if pending:
+                    self._pending_decrements[product_id] = pending
+                    self._dirty.add(product_id)
+                else:
+                    self._pending_decrements.pop(product_id, None)
+
+    def sweep(self) -> int:
+        """Release every reservation whose TTL has passed."""
+        now = time.monotonic()
+        released = 0
+        for lock, heap in zip(self._locks, self._expiry):
+            with lock:
+                while heap and heap[0][0] <= now:
+                    expires_at, product_id, holder = heapq.heappop(heap)
+                    hold = self._holds.get(product_id, {}).get(holder)
+                    # Renewed holds leave stale heap entries behind; skip them.
+                    if hold and hold[1] == expires_at:
+                        self._set_hold(holder, product_id, 0)
+                        released += 1
+        return released
+
+    async def flush(self) -> int:
+        """Write committed decrements back to Strapi in one batch.
+
+        Each product's current Strapi stock is read and reduced by the
+        decrements pending when the write started, so sales from other
+        workers are kept rather than overwritten with this process's level.
+        Decrements committed while the write is in flight stay pending for
+        the next flush.
+        """
+        with self._dirty_lock:
+            batch = list(self._dirty)[:INVENTORY_FLUSH_BATCH]
+            self._dirty.difference_update(batch)
+            sent = {
+                product_id: self._pending_decrements.get(product_id, 0)
+                for product_id in batch
+            }
+        if not batch:
+            return 0
+
+        async def write(product_id: int):
+            quantity = sent[product_id]
+            try:
+                response = await strapi.get(
+                    f"/api/products/{product_id}", params={"fields[0]": "stock"}
+                )
+                if response.status_code == 404:
+                    # Unknown to Strapi (e.g. a fallback catalog item); keep
+                    # the level locally and stop retrying.
+                    logging.warning(f"No Strapi product {product_id} to update stock")
+                    self._written(product_id, quantity, None)
+                    return
+                response.raise_for_status()
+                data = response.json()["data"]
+                remote = int(data.get("attributes", data).get("stock", 0))
+                stock = max(0, remote - quantity)
+                response = await strapi.request(
+                    "PUT",
+                    f"/api/products/{product_id}",
+                    json={"data": {"stock": stock}},
+                )
+                if 400 <= response.status_code < 500 and response.status_code not in (
+                    408,
+                    429,
+                ):
+                    logging.warning(
+                        f"Strapi rejected stock update for {product_id}: "
+                        f"{response.status_code}"
+                    )
+                    self._written(product_id, quantity, None)
+                    return
+                response.raise_for_status()
+            except (HTTPError, ValueError, KeyError) as e:
+                logging.warning(f"Stock write-back failed for {product_id}: {e}")
+                with self._dirty_lock:
+                    self._dirty.add(product_id)
+                return
+            self._written(product_id, quantity, stock)
+
+        await asyncio.gather(*(write(product_id) for product_id in batch))
+        return len(batch)
+
+    def _written(self, product_id: int, quantity: int, stock: int | None):
+        """Settle ``quantity`` written-back units; ``stock`` is Strapi's new level."""
+        with self._locked([product_id]), self._dirty_lock:
+            remaining = self._pending_decrements.get(product_id, 0) - quantity
+            if remaining:
+                self._pending_decrements[product_id] = remaining
+                self._dirty.add(product_id)
+            else:
+                self._pending_decrements.pop(product_id, None)
+            self._written_at[product_id] = time.monotonic()
+            if stock is not None:
+                # Strapi now includes other workers' sales; only decrements
+                # committed during the write are still missing from it.
+                self.on_hand[product_id] = max(0, stock - remaining)
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(INVENTORY_FLUSH_INTERVAL)
+            try:
+                self.sweep()
+                if strapi.available:
+                    await self.flush()
+            except Exception as e:
+                logging.exception(f"Inventory worker error: {e}")
+
+
+inventory = Inventory()
+
+
+@contextlib.asynccontextmanager
+async def inventory_lifespan():
+    worker = asyncio.create_task(inventory.run())
+    try:
+        yield
+    finally:
+        worker.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await worker
+        if strapi.available:
+            await inventory.flush()
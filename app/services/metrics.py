@@ -0,0 +1,428 @@
+import bisect
+import functools
+import hmac
+import inspect
+import os
+import random
+import re
+import time
+from collections.abc import Callable, Iterable
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+from app.services import tracing
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") != "0"
+# Each worker keeps its own registry, so scrape every worker. Handler and
+# computed var timings are sampled at this rate; their call counters, and
+# outbound request and cache metrics, are always exact.
+METRICS_SAMPLE_RATE = float(os.getenv("METRICS_SAMPLE_RATE", "0.1"))
+# When set, scrapes must send "Authorization: Bearer <token>".
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+METRICS_ROUTE = "/metrics"
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+FAMILIES: dict[str, tuple[str, str]] = {
+    "dk_event_handler_seconds": (
+        "histogram",
+        "Time spent inside state event handlers (sampled).",
+    ),
+    "dk_event_handler_calls_total": ("counter", "State event handler invocations."),
+    "dk_computed_var_seconds": (
+        "histogram",
+        "Time spent recomputing computed vars (sampled).",
+    ),
+    "dk_computed_var_calls_total": ("counter", "Computed var recomputations."),
+    "dk_outbound_request_seconds": (
+        "histogram",
+        "Outbound Strapi and Stripe requests by endpoint and status.",
+    ),
+    "dk_cache_requests_total": ("counter", "Cache lookups by cache and result."),
+    "dk_metrics_sample_rate": ("gauge", "Fraction of handler and var calls timed."),
+}
+
+
+class Counter:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+
+class Histogram:
+    __slots__ = ("buckets", "count", "sum")
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: LabelKey, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Registry:
+    """Labelled counters and histograms for the families in FAMILIES.
+
+    Look a series up once and keep it (``counter()``/``histogram()``) when
+    it sits on a hot path; updating it is then a couple of attribute writes.
+    """
+
+    def __init__(self):
+        self._series: dict[str, dict[LabelKey, Counter | Histogram]] = {
+            name: {} for name in FAMILIES
+        }
+        self._collectors: list[
+            tuple[str, Callable[[], Iterable[tuple[dict[str, str], float]]]]
+        ] = []
+
+    def _get(self, name: str, factory: type, labels: dict[str, str]):
+        key = tuple(sorted(labels.items()))
+        series = self._series[name]
+        if key not in series:
+            series[key] = factory()
+        return series[key]
+
+    def counter(self, name: str, **labels: str) -> Counter:
+        return self._get(name, Counter, labels)
+
+    def histogram(self, name: str, **labels: str) -> Histogram:
+        return self._get(name, Histogram, labels)
+
+    def collect(
+        self, name: str, fn: Callable[[], Iterable[tuple[dict[str, str], float]]]
+    ):
+        """Add samples to family ``name`` computed by ``fn`` at scrape time."""
+        self._collectors.append((name, fn))
+
+    def render(self) -> str:
+        collected: dict[str, list[tuple[LabelKey, float]]] = {}
+        for name, fn in self._collectors:
+            for labels, value in fn():
+                collected.setdefault(name, []).append(
+                    (tuple(sorted(labels.items())), value)
+                )
+        lines = []
+        for name, (kind, help_text) in FAMILIES.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if name == "dk_metrics_sample_rate":
+                lines.append(f"{name} {METRICS_SAMPLE_RATE}")
+                continue
+            for labels, series in list(self._series[name].items()):
+                if isinstance(series, Counter):
+                    lines.append(f"{name}{_format_labels(labels)} {series.value}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(
+                    (*LATENCY_BUCKETS, "+Inf"), series.buckets
+                ):
+                    cumulative += count
+                    le = f'le="{bound}"'
+                    lines.append(
+                        f"{name}_bucket{_format_labels(labels, le)} {cumulative}"
+                    )
+                lines.append(f"{name}_sum{_format_labels(labels)} {series.sum}")
+                lines.append(f"{name}_count{_format_labels(labels)} {series.count}")
+            for labels, value in collected.get(name, []):
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = Registry()
+
+
+def observe_request(
+    service: str, method: str, endpoint: str, status: str, seconds: float
+):
+    metrics.histogram(
+        "dk_outbound_request_seconds",
+        service=service,
+        method=method,
+        endpoint=endpoint,
+        status=status,
+    ).observe(seconds)
+
+
+def strapi_endpoint(path: str) -> str:
+    """``/api/products/42`` -> ``/api/products/{id}``, to bound label values."""
+    return re.sub(r"/\d+(?=/|$)", "/{id}", path.split("?", 1)[0])
+
+
+def cache_result(cache: str, result: str):
+    metrics.counter("dk_cache_requests_total", cache=cache, result=result).value += 1
+
+
+def collect_lru_cache(cache: str, fn: Callable):
+    """Report a ``functools.lru_cache``'s own hit and miss counts."""
+
+    def samples():
+        info = fn.cache_info()
+        yield {"cache": cache, "result": "hit"}, info.hits
+        yield {"cache": cache, "result": "miss"}, info.misses
+
+    metrics.collect("dk_cache_requests_total", samples)
+
+
+def _begin(
+    calls: Counter | None, state, span_name: str, navigation: bool
+) -> tuple[bool, tracing.EventSpan | None]:
+    timed = False
+    if calls is not None:
+        calls.value += 1
+        timed = random.random() < METRICS_SAMPLE_RATE
+    if not span_name:
+        return timed, None
+    return timed, tracing.EventSpan(state, span_name, navigation)
+
+
+def _end(
+    latency: Histogram | None,
+    elapsed: float | None,
+    handler_span: tracing.EventSpan | None,
+    error: BaseException | None,
+):
+    if elapsed is not None:
+        latency.observe(elapsed)
+    if handler_span is not None:
+        handler_span.finish(error)
+
+
+def _instrumented(
+    fn: Callable,
+    calls: Counter | None = None,
+    latency: Histogram | None = None,
+    span_name: str = "",
+    navigation: bool = False,
+) -> Callable:
+    """Wrap ``fn`` once for both metrics and tracing, keeping its kind.
+
+    ``calls`` and ``latency`` count and time it; ``span_name`` gives each
+    call of an event handler its own span. Generators are timed, and their
+    span made current, step by step, so the time Reflex spends sending the
+    update for each ``yield`` is not counted against the handler.
+    """
+    if inspect.isasyncgenfunction(fn):
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            timed, handler_span = _begin(calls, args[0], span_name, navigation)
+            events = fn(*args, **kwargs)
+            if not timed and handler_span is None:
+                async for event in events:
+                    yield event
+                return
+            elapsed, error = 0.0, None
+            try:
+                while True:
+                    context = handler_span.enter() if handler_span else None
+                    started = time.perf_counter()
+                    try:
+                        event = await events.__anext__()
+                    except StopAsyncIteration:
+                        break
+                    finally:
+                        elapsed += time.perf_counter() - started
+                        if context is not None:
+                            handler_span.leave(context)
+                    yield event
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                await events.aclose()
+                _end(latency, elapsed if timed else None, handler_span, error)
+
+    elif inspect.isgeneratorfunction(fn):
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            timed, handler_span = _begin(calls, args[0], span_name, navigation)
+            events = fn(*args, **kwargs)
+            if not timed and handler_span is None:
+                # Reflex reads a generator's return value, so pass it on.
+                return (yield from events)
+            elapsed, error = 0.0, None
+            try:
+                while True:
+                    context = handler_span.enter() if handler_span else None
+                    started = time.perf_counter()
+                    try:
+                        event = next(events)
+                    except StopIteration as stop:
+                        return stop.value
+                    finally:
+                        elapsed += time.perf_counter() - started
+                        if context is not None:
+                            handler_span.leave(context)
+                    yield event
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                events.close()
+                _end(latency, elapsed if timed else None, handler_span, error)
+
+    elif inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            timed, handler_span = _begin(calls, args[0], span_name, navigation)
+            if not timed and handler_span is None:
+                return await fn(*args, **kwargs)
+            context = handler_span.enter() if handler_span else None
+            started = time.perf_counter()
+            error = None
+            try:
+                return await fn(*args, **kwargs)
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                if context is not None:
+                    handler_span.leave(context)
+                _end(latency, elapsed if timed else None, handler_span, error)
+
+    else:
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            timed, handler_span = _begin(calls, args[0], span_name, navigation)
+            if not timed and handler_span is None:
+                return fn(*args, **kwargs)
+            context = handler_span.enter() if handler_span else None
+            started = time.perf_counter()
+            error = None
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                if context is not None:
+                    handler_span.leave(context)
+                _end(latency, elapsed if timed else None, handler_span, error)
+
+    wrapper._dk_instrumented = True
+    return wrapper
+
+
+def _own(fn: Callable | None, module_prefix: str) -> bool:
+    return (
+        fn is not None
+        and not getattr(fn, "_dk_instrumented", False)
+        and getattr(fn, "__module__", "").startswith(module_prefix)
+    )
+
+
+def instrument_states(root: type, module_prefix: str = "app.states") -> int:
+    """Time and trace every event handler defined under ``module_prefix``.
+
+    Walks ``root``'s substates once at startup and swaps in one wrapper
+    per function, doing whichever of metrics and tracing is enabled.
+    Computed vars are timed only, and get their dependencies pinned first:
+    Reflex finds them by reading the getter's bytecode, which a wrapper
+    hides. With tracing on, Reflex's ``on_load_internal``, which runs first
+    on every navigation, is wrapped too and roots each trace. Returns how
+    many functions were wrapped.
+    """
+    from reflex.state import OnLoadInternalState
+
+    traced = tracing.TRACING_ENABLED
+    if not (METRICS_ENABLED or traced):
+        return 0
+    wrapped = 0
+    on_load = OnLoadInternalState.event_handlers["on_load_internal"]
+    if traced and not getattr(on_load.fn, "_dk_instrumented", False):
+        object.__setattr__(
+            on_load,
+            "fn",
+            _instrumented(on_load.fn, span_name="navigate", navigation=True),
+        )
+        wrapped += 1
+    states = [root]
+    while states:
+        state = states.pop()
+        states.extend(state.class_subclasses)
+        for handler in state.event_handlers.values():
+            if not _own(handler.fn, module_prefix):
+                continue
+            name = handler.fn.__qualname__
+            calls = latency = None
+            if METRICS_ENABLED:
+                calls = metrics.counter("dk_event_handler_calls_total", handler=name)
+                latency = metrics.histogram("dk_event_handler_seconds", handler=name)
+            object.__setattr__(
+                handler,
+                "fn",
+                _instrumented(handler.fn, calls, latency, name if traced else ""),
+            )
+            wrapped += 1
+        if not METRICS_ENABLED:
+            continue
+        for name, var in state.computed_vars.items():
+            # The class attribute is a separate copy, and the one instances
+            # read through; computed_vars is what dependency tracking uses.
+            for copy in (var, state.__dict__.get(name)):
+                if copy is None or not _own(copy._fget, module_prefix):
+                    continue
+                label = copy._fget.__qualname__
+                object.__setattr__(copy, "_static_deps", copy._deps(objclass=state))
+                object.__setattr__(copy, "_auto_deps", False)
+                object.__setattr__(
+                    copy,
+                    "_fget",
+                    _instrumented(
+                        copy._fget,
+                        metrics.counter("dk_computed_var_calls_total", var=label),
+                        metrics.histogram("dk_computed_var_seconds", var=label),
+                    ),
+                )
+                wrapped += 1
+    return wrapped
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    if METRICS_TOKEN and not hmac.compare_digest(
+        request.headers.get("authorization", ""), f"Bearer {METRICS_TOKEN}"
+    ):
+        return Response("Unauthorized", status_code=401)
+    return Response(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+metrics_routes = [Route(METRICS_ROUTE, metrics_endpoint)]
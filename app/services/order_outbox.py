@@ -0,0 +1,223 @@
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import random
+import sqlite3
+import time
+from httpx import Response
+from app.services.db import db
+from app.services.strapi_client import HTTPError, strapi
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "20"))
+OUTBOX_CONCURRENCY = int(os.getenv("OUTBOX_CONCURRENCY", "4"))
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "30"))
+OUTBOX_BASE_BACKOFF = float(os.getenv("OUTBOX_BASE_BACKOFF", "2"))
+OUTBOX_MAX_BACKOFF = float(os.getenv("OUTBOX_MAX_BACKOFF", "600"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "20"))
+# How long a worker owns a claimed row; a worker that dies mid-send leaves
+# the row to be reclaimed after this.
+OUTBOX_LEASE = float(os.getenv("OUTBOX_LEASE", "120"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS order_outbox (
+    order_id TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    -- pending, sending (claimed by a worker until next_attempt_at), sent, failed
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    sent_at REAL
+);
+CREATE INDEX IF NOT EXISTS order_outbox_due
+    ON order_outbox (status, next_attempt_at);
+"""
+
+
+class PermanentSyncError(Exception):
+    """Strapi rejected the order; retrying the same payload will not help."""
+
+
+def _check_response(response: Response):
+    """Raise HTTPError for failures worth retrying, PermanentSyncError for the rest."""
+    if response.status_code in (408, 429) or response.status_code >= 500:
+        response.raise_for_status()
+    if response.status_code >= 400:
+        raise PermanentSyncError(
+            f"Status: {response.status_code}, Body: {response.text}"
+        )
+
+
+class OrderOutbox:
+    """Durable queue of orders waiting to be pushed to Strapi.
+
+    Checkout inserts a row in the same transaction as the order (keyed by
+    the DK order id, so inserting twice is harmless) and returns. A
+    background worker in each process claims due rows in batches, marking
+    them ``sending`` with a lease so no two workers post the same order,
+    sends them with bounded concurrency and reschedules failures with
+    jittered exponential backoff. ``attempts`` counts claims; before
+    re-posting an order that may already have reached Strapi, it checks
+    for an existing entry with that ``order_id_string`` so retries never
+    create duplicates.
+    """
+
+    def __init__(self):
+        self._wakeup = asyncio.Event()
+
+    def ensure_schema(self):
+        db.ensure_schema("order_outbox", SCHEMA)
+
+    def insert(self, conn: sqlite3.Connection, order_id: str, payload: dict):
+        """Queue ``payload`` inside the caller's transaction (after ensure_schema)."""
+        now = time.time()
+        conn.execute(
+            "INSERT OR IGNORE INTO order_outbox "
+            "(order_id, payload, next_attempt_at, created_at) VALUES (?, ?, ?, ?)",
+            (order_id, json.dumps(payload), now, now),
+        )
+
+    def notify(self):
+        """Wake this process's worker after inserting rows."""
+        self._wakeup.set()
+
+    async def _claim(self) -> list[sqlite3.Row]:
+        """Atomically take due rows, including ones whose lease ran out."""
+        now = time.time()
+        return await db.run(
+            lambda conn: conn.execute(
+                "UPDATE order_outbox SET status = 'sending', "
+                "attempts = attempts + 1, next_attempt_at = ? "
+                "WHERE order_id IN ("
+                "SELECT order_id FROM order_outbox "
+                "WHERE status IN ('pending', 'sending') AND next_attempt_at <= ? "
+                "ORDER BY next_attempt_at LIMIT ?"
+                ") RETURNING order_id, payload, attempts",
+                (now + OUTBOX_LEASE, now, OUTBOX_BATCH_SIZE),
+            ).fetchall()
+        )
+
+    async def _next_due_in(self) -> float:
+        next_at = await db.run(
+            lambda conn: conn.execute(
+                "SELECT MIN(next_attempt_at) FROM order_outbox "
+                "WHERE status IN ('pending', 'sending')"
+            ).fetchone()[0]
+        )
+        if next_at is None:
+            return OUTBOX_POLL_INTERVAL
+        return min(max(next_at - time.time(), 0.0), OUTBOX_POLL_INTERVAL)
+
+    async def _already_synced(self, order_id: str) -> bool:
+        response = await strapi.get(
+            "/api/orders",
+            params={
+                "filters[order_id_string][$eq]": order_id,
+                "fields[0]": "order_id_string",
+            },
+        )
+        _check_response(response)
+        return bool(response.json().get("data"))
+
+    async def _send(self, order_id: str, payload: str, attempts: int):
+        if attempts > 1 and await self._already_synced(order_id):
+            return
+        response = await strapi.request(
+            "POST",
+            "/api/orders",
+            content=payload,
+            headers={"Content-Type": "application/json", "Idempotency-Key": order_id},
+        )
+        _check_response(response)
+
+    async def _deliver(self, row: sqlite3.Row):
+        order_id, attempts = row["order_id"], row["attempts"]
+        try:
+            await self._send(order_id, row["payload"], attempts)
+        except PermanentSyncError as e:
+            logging.error(f"Strapi rejected order {order_id}: {e}")
+            await self._mark(order_id, "failed", attempts, str(e))
+        except HTTPError as e:
+            if attempts >= OUTBOX_MAX_ATTEMPTS:
+                logging.error(f"Giving up syncing order {order_id}: {e}")
+                await self._mark(order_id, "failed", attempts, str(e))
+                return
+            delay = min(OUTBOX_BASE_BACKOFF * 2**attempts, OUTBOX_MAX_BACKOFF)
+            delay *= random.uniform(0.5, 1.0)
+            logging.warning(
+                f"Order {order_id} sync failed (attempt {attempts}), retrying in {delay:.0f}s: {e}"
+            )
+            await self._mark(order_id, "pending", attempts, str(e), delay)
+        else:
+            await self._mark(order_id, "sent", attempts, None)
+
+    async def _mark(
+        self,
+        order_id: str,
+        status: str,
+        attempts: int,
+        error: str | None,
+        delay: float = 0.0,
+    ):
+        now = time.time()
+        await db.run(
+            lambda conn: conn.execute(
+                "UPDATE order_outbox SET status = ?, attempts = ?, last_error = ?, "
+                "next_attempt_at = ?, sent_at = ? WHERE order_id = ?",
+                (
+                    status,
+                    attempts,
+                    error,
+                    now + delay,
+                    now if status == "sent" else None,
+                    order_id,
+                ),
+            )
+        )
+
+    async def drain_once(self) -> int:
+        """Deliver one batch of due orders; returns how many were attempted."""
+        self.ensure_schema()
+        if not strapi.available:
+            return 0
+        rows = await self._claim()
+        semaphore = asyncio.Semaphore(OUTBOX_CONCURRENCY)
+
+        async def deliver(row):
+            async with semaphore:
+                await self._deliver(row)
+
+        await asyncio.gather(*(deliver(row) for row in rows))
+        return len(rows)
+
+    async def run(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                if await self.drain_once() == OUTBOX_BATCH_SIZE:
+                    continue
+                timeout = await self._next_due_in()
+                if not strapi.available:
+                    timeout = max(timeout, strapi.breaker.reset_timeout)
+            except Exception as e:
+                logging.exception(f"Order outbox worker error: {e}")
+                timeout = OUTBOX_POLL_INTERVAL
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+
+
+order_outbox = OrderOutbox()
+
+
+@contextlib.asynccontextmanager
+async def order_outbox_lifespan():
+    worker = asyncio.create_task(order_outbox.run())
+    try:
+        yield
+    finally:
+        worker.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await worker
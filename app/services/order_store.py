@@ -0,0 +1,191 @@
+import json
+import sqlite3
+from typing import TYPE_CHECKING, TypedDict
+from app.services import sales_metrics
+from app.services.account_store import account_store
+from app.services.db import db
+from app.services.order_outbox import order_outbox
+
+if TYPE_CHECKING:
+    from app.states.payment_state import Order
+
+ORDER_PAGE_SIZE = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    id TEXT PRIMARY KEY,
+    user_email TEXT NOT NULL,
+    status TEXT NOT NULL,
+    payment_status TEXT NOT NULL,
+    payment_method_type TEXT NOT NULL,
+    subtotal REAL NOT NULL,
+    shipping_cost REAL NOT NULL,
+    cod_advance REAL,
+    cod_remaining REAL,
+    total_amount REAL NOT NULL,
+    created_at TEXT NOT NULL,
+    stripe_payment_intent_id TEXT,
+    payment_method TEXT NOT NULL,
+    shipping_address TEXT NOT NULL,
+    items TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS orders_by_user
+    ON orders (user_email, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS orders_by_status
+    ON orders (status, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS orders_by_payment_status
+    ON orders (payment_status, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS orders_by_created_at
+    ON orders (created_at DESC, id DESC);
+"""
+
+
+class OrderFilter(TypedDict, total=False):
+    user_email: str
+    status: str
+    payment_status: str
+    created_from: str
+    created_to: str
+
+
+class OrderPage(TypedDict):
+    orders: list["Order"]
+    next_cursor: str
+
+
+def _row_to_order(row: sqlite3.Row) -> "Order":
+    return {
+        "id": row["id"],
+        "user_email": row["user_email"],
+        "items": json.loads(row["items"]),
+        "subtotal": row["subtotal"],
+        "shipping_cost": row["shipping_cost"],
+        "cod_advance": row["cod_advance"],
+        "cod_remaining": row["cod_remaining"],
+        "total_amount": row["total_amount"],
+        "payment_method": json.loads(row["payment_method"]),
+        "shipping_address": json.loads(row["shipping_address"]),
+        "status": row["status"],
+        "payment_status": row["payment_status"],
+        "created_at": row["created_at"],
+        "stripe_payment_intent_id": row["stripe_payment_intent_id"],
+    }
+
+
+def _encode_cursor(order: "Order") -> str:
+    return f"{order['created_at']}|{order['id']}"
+
+
+class OrderStore:
+    """Orders persisted in SQLite, newest first.
+
+    Listing uses keyset pagination on ``(created_at, id)``: the cursor is
+    the last order of the previous page, so each page is an index range
+    scan however deep the history goes.
+    """
+
+    def _schema(self):
+        db.ensure_schema("orders", SCHEMA)
+
+    def insert(self, conn: sqlite3.Connection, order: "Order"):
+        conn.execute(
+            "INSERT INTO orders (id, user_email, status, payment_status, "
+            "payment_method_type, subtotal, shipping_cost, cod_advance, "
+            "cod_remaining, total_amount, created_at, stripe_payment_intent_id, "
+            "payment_method, shipping_address, items) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                order["id"],
+                order["user_email"],
+                order["status"],
+                order["payment_status"],
+                order["payment_method"]["type"],
+                order["subtotal"],
+                order["shipping_cost"],
+                order["cod_advance"],
+                order["cod_remaining"],
+                order["total_amount"],
+                order["created_at"],
+                order["stripe_payment_intent_id"],
+                json.dumps(order["payment_method"]),
+                json.dumps(order["shipping_address"]),
+                json.dumps(order["items"]),
+            ),
+        )
+
+    async def save(
+        self,
+        order: "Order",
+        sync_payload: dict | None = None,
+        user_id: int | None = None,
+    ):
+        """Insert ``order`` and fold it into the sales rollups atomically.
+
+        ``sync_payload`` is queued for Strapi in the same transaction, so an
+        order is never saved without its sync. With ``user_id`` the shipping
+        address is remembered for that user in the same transaction too.
+        """
+        self._schema()
+        sales_metrics.ensure_schema()
+        order_outbox.ensure_schema()
+        account_store.ensure_schema()
+
+        def save(conn: sqlite3.Connection):
+            self.insert(conn, order)
+            sales_metrics.record_order(conn, order)
+            if sync_payload is not None:
+                order_outbox.insert(conn, order["id"], sync_payload)
+            if user_id is not None:
+                account_store.remember_address(
+                    conn, user_id, order["shipping_address"]
+                )
+
+        await db.run(save)
+        if sync_payload is not None:
+            order_outbox.notify()
+
+    async def get(self, order_id: str) -> "Order | None":
+        self._schema()
+        row = await db.run(
+            lambda conn: conn.execute(
+                "SELECT * FROM orders WHERE id = ?", (order_id,)
+            ).fetchone()
+        )
+        return _row_to_order(row) if row else None
+
+    async def query(
+        self, filters: OrderFilter, cursor: str = "", limit: int = ORDER_PAGE_SIZE
+    ) -> OrderPage:
+        self._schema()
+        clauses, params = [], []
+        for field in ("user_email", "status", "payment_status"):
+            if filters.get(field):
+                clauses.append(f"{field} = ?")
+                params.append(filters[field])
+        if filters.get("created_from"):
+            clauses.append("created_at >= ?")
+            params.append(filters["created_from"])
+        if filters.get("created_to"):
+            clauses.append("created_at < ?")
+            params.append(filters["created_to"])
+        if cursor:
+            created_at, _, order_id = cursor.partition("|")
+            clauses.append("(created_at, id) < (?, ?)")
+            params.extend([created_at, order_id])
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = await db.run(
+            lambda conn: conn.execute(
+                f"SELECT * FROM orders {where} "
+                "ORDER BY created_at DESC, id DESC LIMIT ?",
+                (*params, limit + 1),
+            ).fetchall()
+        )
+        orders = [_row_to_order(row) for row in rows[:limit]]
+        has_more = len(rows) > limit
+        return {
+            "orders": orders,
+            "next_cursor": _encode_cursor(orders[-1]) if has_more else "",
+        }
+
+
+order_store = OrderStore()
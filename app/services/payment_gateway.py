@@ -0,0 +1,118 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import TypedDict
+import stripe
+from app.services.metrics import observe_request
+from app.services.tracing import span
+
+STRIPE_SECRET_KEY = os.getenv("STRIPE_SECRET_KEY", "")
+# Point at a local Stripe-compatible stub (e.g. stripe-mock) in development.
+STRIPE_API_BASE = os.getenv("STRIPE_API_BASE", "")
+STRIPE_TIMEOUT = float(os.getenv("STRIPE_TIMEOUT", "20"))
+STRIPE_MAX_CONCURRENCY = int(os.getenv("STRIPE_MAX_CONCURRENCY", "10"))
+STRIPE_MAX_NETWORK_RETRIES = int(os.getenv("STRIPE_MAX_NETWORK_RETRIES", "2"))
+
+
+class PaymentIntentResult(TypedDict):
+    id: str
+    client_secret: str
+
+
+class PaymentGatewayError(Exception):
+    """Creating a payment failed; the message is safe to show the customer."""
+
+
+def idempotency_key(*parts) -> str:
+    """Stable key for a payment attempt, so a double submit reuses one intent."""
+    digest = hashlib.sha256(
+        json.dumps(parts, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return f"dk-{digest[:40]}"
+
+
+class StripeGateway:
+    """Creates Stripe PaymentIntents without blocking the event loop.
+
+    Uses one StripeClient per event loop with stripe's async httpx
+    transport, so connections are reused and the global ``stripe.api_key``
+    is never touched. Concurrent calls are capped by a semaphore, and
+    every call is timed into the outbound request metrics.
+    """
+
+    def __init__(self, api_key: str, api_base: str = ""):
+        self.api_key = api_key
+        self.api_base = api_base
+        self._client: stripe.StripeClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key)
+
+    def _get_client(self) -> stripe.StripeClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = stripe.StripeClient(
+                self.api_key,
+                base_addresses={"api": self.api_base} if self.api_base else {},
+                http_client=stripe.HTTPXClient(timeout=STRIPE_TIMEOUT),
+                max_network_retries=STRIPE_MAX_NETWORK_RETRIES,
+            )
+            self._semaphore = asyncio.Semaphore(STRIPE_MAX_CONCURRENCY)
+            self._loop = loop
+        return self._client
+
+    def _record(self, endpoint: str, started: float, status: str):
+        observe_request(
+            "stripe", "POST", endpoint, status, time.perf_counter() - started
+        )
+
+    async def create_payment_intent(
+        self,
+        amount: float,
+        description: str,
+        metadata: dict,
+        idempotency_key: str,
+        currency: str = "inr",
+    ) -> PaymentIntentResult:
+        if not self.configured:
+            raise PaymentGatewayError("Stripe is not properly configured")
+        client = self._get_client()
+        async with self._semaphore:
+            with span(
+                "stripe POST /v1/payment_intents",
+                "client",
+                **{"http.method": "POST", "http.route": "/v1/payment_intents"},
+            ):
+                started = time.perf_counter()
+                try:
+                    intent = await client.v1.payment_intents.create_async(
+                        {
+                            "amount": round(amount * 100),
+                            "currency": currency,
+                            "payment_method_types": ["card"],
+                            "description": description,
+                            "metadata": metadata,
+                        },
+                        {"idempotency_key": idempotency_key},
+                    )
+                except stripe.StripeError as e:
+                    self._record(
+                        "/v1/payment_intents",
+                        started,
+                        str(e.http_status or type(e).__name__),
+                    )
+                    logging.exception(f"Error creating Stripe payment intent: {e}")
+                    raise PaymentGatewayError(
+                        e.user_message or f"Payment setup failed: {e}"
+                    ) from e
+                self._record("/v1/payment_intents", started, "200")
+        return {"id": intent.id, "client_secret": intent.client_secret}
+
+
+payment_gateway = StripeGateway(STRIPE_SECRET_KEY, STRIPE_API_BASE)
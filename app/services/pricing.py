@@ -0,0 +1,62 @@
+import functools
+import os
+from typing import TypedDict
+from app.services.metrics import collect_lru_cache
+
+SHIPPING_COST = float(os.getenv("SHIPPING_COST", "50"))
+COD_ADVANCE_PERCENTAGE = float(os.getenv("COD_ADVANCE_PERCENTAGE", "50"))
+# Catalog prices are GST-inclusive, so no tax is added on top by default.
+CHECKOUT_TAX_RATE = float(os.getenv("CHECKOUT_TAX_RATE", "0"))
+
+
+class CheckoutQuote(TypedDict):
+    subtotal: float
+    shipping: float
+    tax: float
+    discount: float
+    total: float
+    amount_due_now: float
+    cod_advance: float
+    cod_remaining: float
+
+
+def _round(amount: float) -> float:
+    return round(amount + 1e-9, 2)
+
+
+@functools.lru_cache(maxsize=4096)
+def quote_checkout(
+    lines: tuple[tuple[float, int], ...],
+    payment_method: str,
+    shipping: float = SHIPPING_COST,
+    cod_advance_percentage: float = COD_ADVANCE_PERCENTAGE,
+    tax_rate: float = CHECKOUT_TAX_RATE,
+    discount: float = 0.0,
+) -> CheckoutQuote:
+    """Price a cart of ``(unit price, quantity)`` lines in one pass.
+
+    Results are memoised on the arguments, so carts with the same contents
+    and payment method share one computation across sessions. Treat the
+    returned dict as read-only.
+    """
+    subtotal = _round(sum(price * quantity for price, quantity in lines))
+    discount = _round(min(discount, subtotal))
+    tax = _round((subtotal - discount) * tax_rate)
+    total = _round(subtotal - discount + tax + shipping)
+    # COD amounts are always filled in so the payment options can show
+    # them before the customer picks one.
+    cod_advance = _round(total * cod_advance_percentage / 100)
+    cod_remaining = _round(total - cod_advance)
+    return {
+        "subtotal": subtotal,
+        "shipping": shipping,
+        "tax": tax,
+        "discount": discount,
+        "total": total,
+        "amount_due_now": cod_advance if payment_method == "cod" else total,
+        "cod_advance": cod_advance,
+        "cod_remaining": cod_remaining,
+    }
+
+
+collect_lru_cache("checkout_quote", quote_checkout)
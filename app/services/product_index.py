@@ -0,0 +1,122 @@
+import bisect
+from collections import defaultdict
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from app.states.product_state import Product
+
+
+def category_slug(category: str) -> str:
+    return category.strip().lower().replace(" ", "-")
+
+
+SORT_KEYS: dict[str, tuple[Callable[["Product"], object], bool] | None] = {
+    "featured": None,
+    "price_asc": (lambda p: p["price"], False),
+    "price_desc": (lambda p: p["price"], True),
+    "rating": (lambda p: (p["rating"], p["num_reviews"]), True),
+    "num_reviews": (lambda p: p["num_reviews"], True),
+    "newest": (lambda p: p["id"], True),
+}
+
+
+class ProductIndex:
+    """Lookup tables over one catalog version.
+
+    Built once when the shared catalog changes so that handlers can find a
+    product by id, or all products in a category, occasion or recipient
+    bucket, without scanning the whole list on every event.
+    """
+
+    def __init__(self, products: list["Product"]):
+        self.products: list["Product"] = []
+        self.by_id: dict[int, "Product"] = {}
+        self.by_category: dict[str, list["Product"]] = defaultdict(list)
+        self.by_occasion: dict[str, list["Product"]] = defaultdict(list)
+        self.by_recipient: dict[str, list["Product"]] = defaultdict(list)
+        self.category_names: dict[str, str] = {}
+        self._derived: dict = {}
+        for product in products:
+            self.add(product)
+
+    def add(self, product: "Product"):
+        if product["id"] in self.by_id:
+            self.remove(product["id"])
+        slug = category_slug(product["category"])
+        self.products.append(product)
+        self.by_id[product["id"]] = product
+        self.by_category[slug].append(product)
+        self.by_occasion[product["occasion"]].append(product)
+        self.by_recipient[product["recipient"]].append(product)
+        self.category_names.setdefault(slug, product["category"])
+        self._derived.clear()
+
+    def remove(self, product_id: int):
+        product = self.by_id.pop(product_id, None)
+        if product is None:
+            return
+        self.products.remove(product)
+        slug = category_slug(product["category"])
+        self.by_category[slug].remove(product)
+        self.by_occasion[product["occasion"]].remove(product)
+        self.by_recipient[product["recipient"]].remove(product)
+        if not self.by_category[slug]:
+            del self.by_category[slug]
+            del self.category_names[slug]
+        self._derived.clear()
+
+    def get(self, product_id: int) -> "Product | None":
+        return self.by_id.get(product_id)
+
+    def in_category(self, slug: str) -> list["Product"]:
+        return self.by_category.get(category_slug(slug), [])
+
+    def for_occasion(self, occasion: str) -> list["Product"]:
+        return self.by_occasion.get(occasion, [])
+
+    def for_recipient(self, recipient: str) -> list["Product"]:
+        return self.by_recipient.get(recipient, [])
+
+    @property
+    def categories(self) -> list[str]:
+        return sorted(self.category_names.values())
+
+    def _memo(self, key, build):
+        if key not in self._derived:
+            self._derived[key] = build()
+        return self._derived[key]
+
+    def sorted_by(self, sort: str) -> list["Product"]:
+        """Products in ``sort`` order, sorted once per catalog change."""
+        spec = SORT_KEYS.get(sort)
+        if spec is None:
+            return self.products
+        key, reverse = spec
+        return self._memo(
+            ("sorted", sort), lambda: sorted(self.products, key=key, reverse=reverse)
+        )
+
+    def bucket_ids(self, facet: str, value: str) -> set[int]:
+        buckets = {
+            "category": self.by_category,
+            "occasion": self.by_occasion,
+            "recipient": self.by_recipient,
+        }[facet]
+        return self._memo(
+            ("ids", facet, value),
+            lambda: {p["id"] for p in buckets.get(value, [])},
+        )
+
+    def in_stock_ids(self) -> set[int]:
+        return self._memo(
+            "in_stock", lambda: {p["id"] for p in self.products if p["stock"] > 0}
+        )
+
+    def ids_in_price_range(
+        self, min_price: float | None, max_price: float | None
+    ) -> set[int]:
+        by_price = self.sorted_by("price_asc")
+        prices = self._memo("prices", lambda: [p["price"] for p in by_price])
+        lo = 0 if min_price is None else bisect.bisect_left(prices, min_price)
+        hi = len(prices) if max_price is None else bisect.bisect_right(prices, max_price)
+        return {p["id"] for p in by_price[lo:hi]}
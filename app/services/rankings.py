@@ -0,0 +1,93 @@
+import bisect
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from app.states.product_state import Product
+
+# Bayesian prior for the featured score: a product needs a few reviews
+# before its rating outweighs the catalog-wide default.
+FEATURED_PRIOR_RATING = 4.0
+FEATURED_PRIOR_REVIEWS = 10
+
+
+class Ranking:
+    """Product ids kept ordered by a score as products change.
+
+    Entries are ``(score, id)`` tuples in a sorted list, so an update is a
+    bisect plus a memmove and reading the top k is a slice.
+    """
+
+    def __init__(
+        self, key: Callable[["Product"], tuple], products: list["Product"] = ()
+    ):
+        self._key = key
+        self._entry_by_id: dict[int, tuple] = {
+            p["id"]: (key(p), p["id"]) for p in products
+        }
+        self._entries: list[tuple] = sorted(self._entry_by_id.values())
+
+    def update(self, product: "Product"):
+        self.remove(product["id"])
+        entry = (self._key(product), product["id"])
+        bisect.insort(self._entries, entry)
+        self._entry_by_id[product["id"]] = entry
+
+    def remove(self, product_id: int):
+        entry = self._entry_by_id.pop(product_id, None)
+        if entry is not None:
+            del self._entries[bisect.bisect_left(self._entries, entry)]
+
+    def top(self, k: int) -> list[int]:
+        if k <= 0:
+            return []
+        return [product_id for _, product_id in reversed(self._entries[-k:])]
+
+
+def featured_score(product: "Product") -> tuple:
+    rating = (
+        product["rating"] * product["num_reviews"]
+        + FEATURED_PRIOR_RATING * FEATURED_PRIOR_REVIEWS
+    ) / (product["num_reviews"] + FEATURED_PRIOR_REVIEWS)
+    return (product["stock"] > 0, rating)
+
+
+class ProductRankings:
+    """Featured and best-seller rankings for one catalog version.
+
+    Built once per catalog refresh and shared by every session. Best
+    sellers rank by units sold, falling back to review count for products
+    that have not sold yet. ``units_sold`` is owned by the catalog cache,
+    which reloads it from the sales rollup on every refresh, so rankings
+    survive restarts and converge across workers.
+    """
+
+    def __init__(self, products: list["Product"], units_sold: dict[int, int]):
+        self.units_sold = units_sold
+        self.by_id: dict[int, "Product"] = {p["id"]: p for p in products}
+        self.featured = Ranking(featured_score, products)
+        self.best_selling = Ranking(self._sales_score, products)
+
+    def _sales_score(self, product: "Product") -> tuple:
+        return (self.units_sold.get(product["id"], 0), product["num_reviews"])
+
+    def add(self, product: "Product"):
+        self.by_id[product["id"]] = product
+        self.featured.update(product)
+        self.best_selling.update(product)
+
+    def remove(self, product_id: int):
+        self.by_id.pop(product_id, None)
+        self.featured.remove(product_id)
+        self.best_selling.remove(product_id)
+
+    def record_sale(self, product_id: int, quantity: int):
+        self.units_sold[product_id] = self.units_sold.get(product_id, 0) + quantity
+        product = self.by_id.get(product_id)
+        if product is not None:
+            self.best_selling.update(product)
+
+    def top_featured(self, k: int) -> list["Product"]:
+        return [self.by_id[product_id] for product_id in self.featured.top(k)]
+
+    def top_selling(self, k: int) -> list["Product"]:
+        return [self.by_id[product_id] for product_id in self.best_selling.top(k)]
@@ -0,0 +1,173 @@
+import datetime
+import sqlite3
+from typing import TYPE_CHECKING, TypedDict
+from app.services.db import db
+
+if TYPE_CHECKING:
+    from app.states.payment_state import Order
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sales_daily (
+    day TEXT NOT NULL,
+    payment_method_type TEXT NOT NULL,
+    orders INTEGER NOT NULL,
+    units INTEGER NOT NULL,
+    revenue REAL NOT NULL,
+    PRIMARY KEY (day, payment_method_type)
+);
+CREATE TABLE IF NOT EXISTS sales_by_product (
+    product_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    units INTEGER NOT NULL,
+    revenue REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sales_by_product_units
+    ON sales_by_product (units DESC);
+"""
+
+
+class DailySales(TypedDict):
+    day: str
+    orders: int
+    revenue: float
+
+
+class PaymentMix(TypedDict):
+    method: str
+    orders: int
+    revenue: float
+    share: float
+
+
+class ProductSales(TypedDict):
+    product_id: int
+    name: str
+    units: int
+    revenue: float
+
+
+class SalesSummary(TypedDict):
+    orders: int
+    revenue: float
+    average_order_value: float
+
+
+def ensure_schema():
+    db.ensure_schema("sales_metrics", SCHEMA)
+
+
+def record_order(conn: sqlite3.Connection, order: "Order"):
+    """Fold one order into the rollups; call inside the order's insert transaction."""
+    units = sum(line["quantity"] for line in order["items"])
+    conn.execute(
+        "INSERT INTO sales_daily (day, payment_method_type, orders, units, revenue) "
+        "VALUES (?, ?, 1, ?, ?) ON CONFLICT (day, payment_method_type) DO UPDATE SET "
+        "orders = orders + 1, units = units + excluded.units, "
+        "revenue = revenue + excluded.revenue",
+        (
+            order["created_at"][:10],
+            order["payment_method"]["type"],
+            units,
+            order["total_amount"],
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO sales_by_product (product_id, name, units, revenue) "
+        "VALUES (?, ?, ?, ?) ON CONFLICT (product_id) DO UPDATE SET "
+        "name = excluded.name, units = units + excluded.units, "
+        "revenue = revenue + excluded.revenue",
+        [
+            (
+                line["product_id"],
+                line["name"],
+                line["quantity"],
+                line["price"] * line["quantity"],
+            )
+            for line in order["items"]
+        ],
+    )
+
+
+async def daily_sales(days: int = 14) -> list[DailySales]:
+    """Revenue per day for the last ``days`` days, oldest first, zero-filled."""
+    ensure_schema()
+    today = datetime.date.today()
+    start = today - datetime.timedelta(days=days - 1)
+    rows = await db.run(
+        lambda conn: conn.execute(
+            "SELECT day, SUM(orders) AS orders, SUM(revenue) AS revenue "
+            "FROM sales_daily WHERE day >= ? GROUP BY day",
+            (start.isoformat(),),
+        ).fetchall()
+    )
+    by_day = {row["day"]: row for row in rows}
+    result = []
+    for offset in range(days):
+        day = (start + datetime.timedelta(days=offset)).isoformat()
+        row = by_day.get(day)
+        result.append(
+            {
+                "day": day,
+                "orders": row["orders"] if row else 0,
+                "revenue": round(row["revenue"], 2) if row else 0.0,
+            }
+        )
+    return result
+
+
+async def summary() -> tuple[SalesSummary, list[PaymentMix]]:
+    """All-time totals, average order value and the COD/Stripe mix."""
+    ensure_schema()
+    rows = await db.run(
+        lambda conn: conn.execute(
+            "SELECT payment_method_type, SUM(orders) AS orders, "
+            "SUM(revenue) AS revenue FROM sales_daily GROUP BY payment_method_type"
+        ).fetchall()
+    )
+    orders = sum(row["orders"] for row in rows)
+    revenue = sum(row["revenue"] for row in rows)
+    mix: list[PaymentMix] = [
+        {
+            "method": row["payment_method_type"],
+            "orders": row["orders"],
+            "revenue": round(row["revenue"], 2),
+            "share": round(100 * row["orders"] / orders, 1) if orders else 0.0,
+        }
+        for row in rows
+    ]
+    return {
+        "orders": orders,
+        "revenue": round(revenue, 2),
+        "average_order_value": round(revenue / orders, 2) if orders else 0.0,
+    }, mix
+
+
+async def top_products(limit: int = 10) -> list[ProductSales]:
+    ensure_schema()
+    rows = await db.run(
+        lambda conn: conn.execute(
+            "SELECT product_id, name, units, revenue FROM sales_by_product "
+            "ORDER BY units DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+    )
+    return [
+        {
+            "product_id": row["product_id"],
+            "name": row["name"],
+            "units": row["units"],
+            "revenue": round(row["revenue"], 2),
+        }
+        for row in rows
+    ]
+
+
+async def units_by_product() -> dict[int, int]:
+    """Units sold per product id, all time."""
+    ensure_schema()
+    rows = await db.run(
+        lambda conn: conn.execute(
+            "SELECT product_id, units FROM sales_by_product"
+        ).fetchall()
+    )
+    return {row["product_id"]: row["units"] for row in rows}
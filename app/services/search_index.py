@@ -0,0 +1,257 @@
+import bisect
+import heapq
+import math
+import re
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.states.product_state import Product
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+FIELD_WEIGHTS = {
+    "name": 3.0,
+    "sku": 2.0,
+    "category": 1.5,
+    "occasion": 1.5,
+    "description": 1.0,
+}
+K1 = 1.2
+B = 0.75
+PREFIX_PENALTY = 0.8
+FUZZY_PENALTY = 0.6
+MAX_EXPANSIONS = 20
+MIN_FUZZY_LENGTH = 4
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+def _deletes(term: str) -> set[str]:
+    return {term[:i] + term[i + 1 :] for i in range(len(term))}
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """True if ``a`` and ``b`` differ by at most one edit or transposition."""
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) == len(b):
+        diffs = [i for i in range(len(a)) if a[i] != b[i]]
+        if len(diffs) == 1:
+            return True
+        return (
+            len(diffs) == 2
+            and diffs[1] == diffs[0] + 1
+            and a[diffs[0]] == b[diffs[1]]
+            and a[diffs[1]] == b[diffs[0]]
+        )
+    shorter, longer = (a, b) if len(a) < len(b) else (b, a)
+    return any(
+        shorter == longer[:i] + longer[i + 1 :] for i in range(len(longer))
+    )
+
+
+class SearchIndex:
+    """Inverted index over the catalog with BM25 ranking.
+
+    Terms from name, sku, category, occasion and description are weighted
+    per field (BM25F-style) and each posting stores its precomputed BM25
+    term-frequency component, so a query only multiplies by idf. Postings
+    are walked in descending impact order and the walk stops as soon as no
+    unseen product can beat the current top-k (max-score early
+    termination). The last query token matches as a prefix for typeahead,
+    and tokens with no exact or prefix match fall back to terms within one
+    edit through a deletion-neighbourhood table.
+    """
+
+    def __init__(self, products: list["Product"]):
+        self.postings: dict[str, dict[int, float]] = defaultdict(dict)
+        self.doc_lengths: dict[int, float] = {}
+        self.doc_terms: dict[int, dict[str, float]] = {}
+        self.products: dict[int, "Product"] = {}
+        self.vocabulary: list[str] = []
+        self.deletes: dict[str, set[str]] = defaultdict(set)
+        self.total_length = 0.0
+        self._ranked: dict[str, list[tuple[float, int]]] = {}
+        for product in products:
+            self._index_document(product)
+        self.vocabulary = sorted(self.postings)
+        average_length = self._average_length()
+        for doc_id, frequencies in self.doc_terms.items():
+            for term, frequency in frequencies.items():
+                self.postings[term][doc_id] = self._impact(
+                    frequency, self.doc_lengths[doc_id], average_length
+                )
+        for term in self.vocabulary:
+            self._add_deletes(term)
+
+    def _average_length(self) -> float:
+        return self.total_length / len(self.products) if self.products else 1.0
+
+    @staticmethod
+    def _impact(frequency: float, length: float, average_length: float) -> float:
+        norm = K1 * (1 - B + B * length / average_length)
+        return frequency * (K1 + 1) / (frequency + norm)
+
+    def _add_deletes(self, term: str):
+        if len(term) >= MIN_FUZZY_LENGTH and term.isalpha():
+            for variant in _deletes(term):
+                self.deletes[variant].add(term)
+
+    def _index_document(self, product: "Product") -> dict[str, float]:
+        weighted: dict[str, float] = defaultdict(float)
+        for field, weight in FIELD_WEIGHTS.items():
+            tokens = tokenize(str(product.get(field) or ""))
+            if field == "sku" and len(tokens) > 1:
+                tokens.append("".join(tokens))
+            for token in tokens:
+                weighted[token] += weight
+        doc_id = product["id"]
+        length = sum(weighted.values())
+        self.doc_lengths[doc_id] = length
+        self.doc_terms[doc_id] = dict(weighted)
+        self.products[doc_id] = product
+        self.total_length += length
+        for term in weighted:
+            self.postings[term][doc_id] = 0.0
+        return weighted
+
+    def add(self, product: "Product"):
+        if product["id"] in self.products:
+            self.remove(product["id"])
+        new_terms = [t for t in self._terms_of(product) if t not in self.postings]
+        weighted = self._index_document(product)
+        doc_id = product["id"]
+        average_length = self._average_length()
+        for term, frequency in weighted.items():
+            self.postings[term][doc_id] = self._impact(
+                frequency, self.doc_lengths[doc_id], average_length
+            )
+            self._ranked.pop(term, None)
+        for term in new_terms:
+            bisect.insort(self.vocabulary, term)
+            self._add_deletes(term)
+
+    def _terms_of(self, product: "Product") -> set[str]:
+        terms = set()
+        for field in FIELD_WEIGHTS:
+            tokens = tokenize(str(product.get(field) or ""))
+            terms.update(tokens)
+            if field == "sku" and len(tokens) > 1:
+                terms.add("".join(tokens))
+        return terms
+
+    def remove(self, product_id: int):
+        if product_id not in self.products:
+            return
+        for term in self.doc_terms.pop(product_id):
+            self.postings[term].pop(product_id, None)
+            self._ranked.pop(term, None)
+            if not self.postings[term]:
+                del self.postings[term]
+                del self.vocabulary[bisect.bisect_left(self.vocabulary, term)]
+                if len(term) >= MIN_FUZZY_LENGTH and term.isalpha():
+                    for variant in _deletes(term):
+                        self.deletes[variant].discard(term)
+        self.total_length -= self.doc_lengths.pop(product_id)
+        del self.products[product_id]
+
+    def _ranked_postings(self, term: str) -> list[tuple[float, int]]:
+        ranked = self._ranked.get(term)
+        if ranked is None:
+            postings = self.postings[term]
+            ranked = sorted(((i, d) for d, i in postings.items()), reverse=True)
+            self._ranked[term] = ranked
+        return ranked
+
+    def _prefix_terms(self, prefix: str) -> list[str]:
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        matches = []
+        for term in self.vocabulary[start:]:
+            if not term.startswith(prefix):
+                break
+            matches.append(term)
+        # Prefer the closest completions when a short prefix matches many terms.
+        return heapq.nsmallest(MAX_EXPANSIONS, matches, key=len)
+
+    def _fuzzy_terms(self, token: str) -> list[str]:
+        if len(token) < MIN_FUZZY_LENGTH or not token.isalpha():
+            return []
+        candidates = set(self.deletes.get(token, ()))
+        for variant in _deletes(token):
+            if variant in self.postings:
+                candidates.add(variant)
+            candidates |= self.deletes.get(variant, set())
+        return [term for term in candidates if _within_one_edit(token, term)]
+
+    def _expand(self, token: str, is_prefix: bool) -> dict[str, float]:
+        """Map each index term ``token`` can match to its weight (penalty x idf)."""
+        expansions = {}
+        if token in self.postings:
+            expansions[token] = 1.0
+        if is_prefix:
+            for term in self._prefix_terms(token):
+                expansions.setdefault(term, PREFIX_PENALTY)
+        if not expansions:
+            for term in self._fuzzy_terms(token):
+                expansions[term] = FUZZY_PENALTY
+        doc_count = len(self.products)
+        for term, penalty in expansions.items():
+            matches = len(self.postings[term])
+            idf = math.log(1 + (doc_count - matches + 0.5) / (matches + 0.5))
+            expansions[term] = penalty * idf
+        return expansions
+
+    def _token_score(self, doc_id: int, expansions: dict[str, float]) -> float:
+        best = 0.0
+        for term, weight in expansions.items():
+            impact = self.postings[term].get(doc_id)
+            if impact is not None and impact * weight > best:
+                best = impact * weight
+        return best
+
+    def search(self, query: str, k: int = 8) -> list["Product"]:
+        tokens = tokenize(query)
+        if not tokens or not self.products:
+            return []
+        expanded = [
+            self._expand(token, position == len(tokens) - 1)
+            for position, token in enumerate(tokens)
+        ]
+        if not all(expanded):
+            return []
+        # Drive the walk from the token with the fewest postings; every
+        # other token is then a dictionary lookup per candidate.
+        expanded.sort(key=lambda e: sum(len(self.postings[t]) for t in e))
+        driver, others = expanded[0], expanded[1:]
+        others_bound = sum(
+            max(self._ranked_postings(t)[0][0] * w for t, w in e.items())
+            for e in others
+        )
+        streams = [
+            ((impact * weight, d) for impact, d in self._ranked_postings(t))
+            for t, weight in driver.items()
+        ]
+        top: list[tuple[float, int]] = []
+        seen = set()
+        for contribution, doc_id in heapq.merge(*streams, reverse=True):
+            if len(top) == k and contribution + others_bound <= top[0][0]:
+                break
+            if doc_id in seen:
+                continue
+            seen.add(doc_id)
+            score = contribution
+            for expansions in others:
+                token_score = self._token_score(doc_id, expansions)
+                if not token_score:
+                    break
+                score += token_score
+            else:
+                if len(top) < k:
+                    heapq.heappush(top, (score, doc_id))
+                elif score > top[0][0]:
+                    heapq.heapreplace(top, (score, doc_id))
+        return [self.products[doc_id] for _, doc_id in sorted(top, reverse=True)]
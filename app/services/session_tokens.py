@@ -0,0 +1,111 @@
+import base64
+import functools
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+import time
+from typing import Literal, TypedDict
+from app.services.metrics import collect_lru_cache
+
+SESSION_TTL = int(os.getenv("SESSION_TTL", str(14 * 24 * 3600)))
+SESSION_KEY_PATH = os.getenv("SESSION_KEY_PATH", "data/session.key")
+SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", "4096"))
+
+
+class SessionClaims(TypedDict):
+    uid: int
+    role: Literal["customer", "admin"]
+    exp: int
+
+
+def _load_secret() -> bytes:
+    """SESSION_SECRET if set, else a key generated once and kept on disk.
+
+    All workers and restarts must share the key, or existing logins would
+    stop verifying.
+    """
+    if secret := os.getenv("SESSION_SECRET"):
+        return secret.encode()
+    try:
+        with open(SESSION_KEY_PATH, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        pass
+    os.makedirs(os.path.dirname(SESSION_KEY_PATH) or ".", exist_ok=True)
+    key = secrets.token_bytes(32)
+    try:
+        fd = os.open(SESSION_KEY_PATH, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        # Another worker won the race; use its key.
+        with open(SESSION_KEY_PATH, "rb") as f:
+            return f.read()
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    logging.info(f"Generated session signing key at {SESSION_KEY_PATH}")
+    return key
+
+
+_secret: bytes | None = None
+
+
+def _key() -> bytes:
+    global _secret
+    if _secret is None:
+        _secret = _load_secret()
+    return _secret
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(payload: str) -> str:
+    return _b64encode(hmac.new(_key(), payload.encode(), hashlib.sha256).digest())
+
+
+def issue_token(
+    user_id: int, role: Literal["customer", "admin"], ttl: int = SESSION_TTL
+) -> str:
+    claims: SessionClaims = {
+        "uid": user_id,
+        "role": role,
+        "exp": int(time.time()) + ttl,
+    }
+    payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode())
+    return f"{payload}.{_sign(payload)}"
+
+
+@functools.lru_cache(maxsize=SESSION_CACHE_SIZE)
+def _decode(token: str) -> SessionClaims | None:
+    payload, _, signature = token.partition(".")
+    # Compare bytes: compare_digest refuses str with non-ASCII characters.
+    if not hmac.compare_digest(_sign(payload).encode(), signature.encode()):
+        return None
+    try:
+        return json.loads(_b64decode(payload))
+    except ValueError:
+        return None
+
+
+collect_lru_cache("session_token", _decode)
+
+
+def verify_token(token: str) -> SessionClaims | None:
+    """Claims for a validly signed, unexpired token, else None.
+
+    Signature checks are memoised per token, so the role check each page
+    load runs is a dictionary lookup plus an expiry comparison.
+    """
+    if not token:
+        return None
+    claims = _decode(token)
+    if claims is None or claims["exp"] <= time.time():
+        return None
+    return claims
@@ -0,0 +1,224 @@
+import asyncio
+import contextlib
+import importlib.util
+import os
+import time
+from typing import Literal
+import httpx
+from app.services.metrics import observe_request, strapi_endpoint
+from app.services.tracing import span
+
+STRAPI_URL = os.getenv(
+    "STRAPI_URL", "https://committed-treasure-916aeef9fd.strapiapp.com/"
+)
+STRAPI_API_TOKEN = os.getenv(
+    "STRAPI_API_TOKEN",
+    "29c56c8d922ac739a56215545ff19501b2aa79b777294f7e212247861bd5102db96c808a4cd74223a8c5fcedbf045705a38d511857880968d194d64a040ea9dca7485a986f06f56d6e092ea1e1939409e933adbdf26057e8accb13ce0ef2994532e6b24e5f935fa32df69b9b02e3545e9af691096710e062cee2538b508756f8",
+)
+STRAPI_CONFIGURED = bool(STRAPI_URL and STRAPI_API_TOKEN)
+STRAPI_TIMEOUT = float(os.getenv("STRAPI_TIMEOUT", "10"))
+STRAPI_CONNECT_TIMEOUT = float(os.getenv("STRAPI_CONNECT_TIMEOUT", "5"))
+STRAPI_MAX_CONNECTIONS = int(os.getenv("STRAPI_MAX_CONNECTIONS", "20"))
+STRAPI_MAX_KEEPALIVE_CONNECTIONS = int(
+    os.getenv("STRAPI_MAX_KEEPALIVE_CONNECTIONS", "10")
+)
+STRAPI_KEEPALIVE_EXPIRY = float(os.getenv("STRAPI_KEEPALIVE_EXPIRY", "30"))
+STRAPI_HTTP2 = importlib.util.find_spec("h2") is not None
+STRAPI_BREAKER_FAILURE_THRESHOLD = int(
+    os.getenv("STRAPI_BREAKER_FAILURE_THRESHOLD", "3")
+)
+STRAPI_BREAKER_RESET_TIMEOUT = float(os.getenv("STRAPI_BREAKER_RESET_TIMEOUT", "5"))
+STRAPI_BREAKER_MAX_RESET_TIMEOUT = float(
+    os.getenv("STRAPI_BREAKER_MAX_RESET_TIMEOUT", "120")
+)
+
+HTTPError = httpx.HTTPError
+HTTPStatusError = httpx.HTTPStatusError
+StrapiHealth = Literal["ok", "degraded", "error", "misconfigured", "unknown"]
+
+
+class StrapiUnavailable(httpx.HTTPError):
+    """Raised without touching the network while the circuit is open."""
+
+
+class CircuitBreaker:
+    """Tracks Strapi health from the outcome of real requests.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls fail fast. Once the reset timeout elapses a single probe request is
+    let through (half-open): success closes the circuit, failure re-opens it
+    with the timeout doubled, up to ``max_reset_timeout``.
+    """
+
+    def __init__(
+        self, failure_threshold: int, reset_timeout: float, max_reset_timeout: float
+    ):
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.has_outcome = False
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> Literal["closed", "open", "half_open"]:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow_request(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def release_probe(self):
+        self._probe_in_flight = False
+
+    def record_success(self):
+        self.has_outcome = True
+        self.failures = 0
+        self.opened_at = None
+        self.reset_timeout = self.base_reset_timeout
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self.has_outcome = True
+        if self._probe_in_flight:
+            self._probe_in_flight = False
+            self.reset_timeout = min(self.reset_timeout * 2, self.max_reset_timeout)
+            self.opened_at = time.monotonic()
+            return
+        self.failures += 1
+        if self.opened_at is None and self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class StrapiClient:
+    """Async client for the Strapi REST API shared by every session.
+
+    A single connection pool is kept per event loop so requests reuse
+    keep-alive (and, when the ``h2`` package is installed, multiplexed
+    HTTP/2) connections instead of opening a new TLS session per call.
+    All traffic goes to STRAPI_URL, so the pool limits are the per-host
+    limits.
+    """
+
+    def __init__(self, base_url: str, api_token: str):
+        self.base_url = base_url.rstrip("/")
+        self.api_token = api_token
+        self.breaker = CircuitBreaker(
+            STRAPI_BREAKER_FAILURE_THRESHOLD,
+            STRAPI_BREAKER_RESET_TIMEOUT,
+            STRAPI_BREAKER_MAX_RESET_TIMEOUT,
+        )
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def health(self) -> StrapiHealth:
+        if not STRAPI_CONFIGURED:
+            return "misconfigured"
+        if not self.breaker.has_outcome:
+            return "unknown"
+        return {"closed": "ok", "half_open": "degraded", "open": "error"}[
+            self.breaker.state
+        ]
+
+    @property
+    def available(self) -> bool:
+        return self.health not in ("error", "misconfigured")
+
+    def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"Authorization": f"Bearer {self.api_token}"},
+                http2=STRAPI_HTTP2,
+                timeout=httpx.Timeout(STRAPI_TIMEOUT, connect=STRAPI_CONNECT_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=STRAPI_MAX_CONNECTIONS,
+                    max_keepalive_connections=STRAPI_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=STRAPI_KEEPALIVE_EXPIRY,
+                ),
+            )
+            self._loop = loop
+        return self._client
+
+    async def request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        endpoint = strapi_endpoint(path)
+        if not self.breaker.allow_request():
+            observe_request("strapi", method, endpoint, "circuit_open", 0.0)
+            raise StrapiUnavailable(f"Strapi circuit is open; skipped {method} {path}")
+        with span(
+            f"strapi {method} {endpoint}",
+            "client",
+            **{"http.method": method, "http.route": endpoint},
+        ) as request_span:
+            started = time.perf_counter()
+            try:
+                response = await self._get_client().request(method, path, **kwargs)
+            except httpx.HTTPError as e:
+                self.breaker.record_failure()
+                observe_request(
+                    "strapi",
+                    method,
+                    endpoint,
+                    type(e).__name__,
+                    time.perf_counter() - started,
+                )
+                raise
+            except BaseException:
+                self.breaker.release_probe()
+                raise
+            request_span.set("http.status_code", response.status_code)
+            observe_request(
+                "strapi",
+                method,
+                endpoint,
+                str(response.status_code),
+                time.perf_counter() - started,
+            )
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+
+    async def get(
+        self, path: str, params: dict | None = None, timeout: float | None = None
+    ) -> httpx.Response:
+        return await self.request(
+            "GET", path, params=params, timeout=timeout or httpx.USE_CLIENT_DEFAULT
+        )
+
+    async def post(
+        self, path: str, json: dict, timeout: float | None = None
+    ) -> httpx.Response:
+        return await self.request(
+            "POST", path, json=json, timeout=timeout or httpx.USE_CLIENT_DEFAULT
+        )
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+strapi = StrapiClient(STRAPI_URL, STRAPI_API_TOKEN)
+
+
+@contextlib.asynccontextmanager
+async def strapi_lifespan():
+    try:
+        yield
+    finally:
+        await strapi.aclose()
@@ -0,0 +1,300 @@
+import asyncio
+import contextlib
+import contextvars
+import json
+import logging
+import os
+import random
+import time
+from collections import deque
+import httpx
+
+# Spans are written as JSON lines to TRACE_FILE and/or posted as OTLP/HTTP
+# JSON to TRACE_OTLP_ENDPOINT (e.g. http://localhost:4318/v1/traces).
+TRACE_FILE = os.getenv("TRACE_FILE", "")
+TRACE_OTLP_ENDPOINT = os.getenv("TRACE_OTLP_ENDPOINT", "")
+TRACING_ENABLED = bool(TRACE_FILE or TRACE_OTLP_ENDPOINT)
+# Fraction of traces kept; the decision is made once per trace.
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "1.0"))
+TRACE_IDLE_GAP = float(os.getenv("TRACE_IDLE_GAP", "1.0"))
+TRACE_FLUSH_INTERVAL = float(os.getenv("TRACE_FLUSH_INTERVAL", "5"))
+# Spans beyond this many between flushes are dropped, oldest first.
+TRACE_BUFFER_SIZE = int(os.getenv("TRACE_BUFFER_SIZE", "10000"))
+TRACE_SERVICE_NAME = os.getenv("TRACE_SERVICE_NAME", "dream-knot")
+
+
+class Span:
+    __slots__ = (
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "name",
+        "kind",
+        "sampled",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "error",
+    )
+
+    def __init__(self, name: str, kind: str, parent: "Span | None", attributes: dict):
+        if parent is None:
+            self.trace_id = f"{random.getrandbits(128):032x}"
+            self.parent_id = ""
+            self.sampled = TRACING_ENABLED and random.random() < TRACE_SAMPLE_RATE
+        else:
+            self.trace_id = parent.trace_id
+            self.parent_id = parent.span_id
+            self.sampled = parent.sampled
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes = attributes
+        self.error = ""
+
+    def set(self, key: str, value: str | int | float | bool):
+        self.attributes[key] = value
+
+    def end(self, error: BaseException | None = None):
+        self.end_ns = time.time_ns()
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        if self.sampled:
+            exporter.add(self)
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "status": "error" if self.error else "ok",
+            "error": self.error,
+            "service": TRACE_SERVICE_NAME,
+        }
+
+
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+def detached_context() -> contextvars.Context:
+    """A copy of the current context with no active span.
+
+    Pass it to ``asyncio.create_task`` for work that outlives the handler
+    starting it, so its spans don't hang off a span that already ended.
+    """
+    context = contextvars.copy_context()
+    context.run(_current_span.set, None)
+    return context
+
+
+@contextlib.contextmanager
+def span(name: str, kind: str = "internal", **attributes):
+    """Run the block as a child of the current span (or a new trace)."""
+    current = Span(name, kind, _current_span.get(), attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except Exception as e:
+        current.end(e)
+        raise
+    else:
+        current.end()
+    finally:
+        _current_span.reset(token)
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: dict) -> list[dict]:
+    return [{"key": k, "value": _otlp_value(v)} for k, v in attributes.items()]
+
+
+OTLP_KINDS = {"internal": 1, "server": 2, "client": 3}
+
+
+def _otlp_span(span: Span) -> dict:
+    otlp = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": OTLP_KINDS.get(span.kind, 1),
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": _otlp_attributes(span.attributes),
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+    }
+    if span.parent_id:
+        otlp["parentSpanId"] = span.parent_id
+    return otlp
+
+
+class SpanExporter:
+    """Buffers finished spans and ships them in batches off the event path."""
+
+    def __init__(self, path: str, otlp_endpoint: str):
+        self.path = path
+        self.otlp_endpoint = otlp_endpoint
+        self.dropped = 0
+        self._buffer: deque[Span] = deque(maxlen=TRACE_BUFFER_SIZE)
+        self._client: httpx.AsyncClient | None = None
+
+    def add(self, span: Span):
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1
+        self._buffer.append(span)
+
+    def _write(self, spans: list[Span]):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a") as f:
+            f.writelines(json.dumps(span.to_dict()) + "\n" for span in spans)
+
+    async def _post(self, spans: list[Span]):
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=10)
+        response = await self._client.post(
+            self.otlp_endpoint,
+            json={
+                "resourceSpans": [
+                    {
+                        "resource": {
+                            "attributes": _otlp_attributes(
+                                {"service.name": TRACE_SERVICE_NAME}
+                            )
+                        },
+                        "scopeSpans": [
+                            {
+                                "scope": {"name": __name__},
+                                "spans": [_otlp_span(span) for span in spans],
+                            }
+                        ],
+                    }
+                ]
+            },
+        )
+        response.raise_for_status()
+
+    async def flush(self) -> int:
+        spans = list(self._buffer)
+        self._buffer.clear()
+        if not spans:
+            return 0
+        if self.path:
+            try:
+                await asyncio.to_thread(self._write, spans)
+            except OSError as e:
+                logging.warning(f"Could not write {len(spans)} spans: {e}")
+        if self.otlp_endpoint:
+            try:
+                await self._post(spans)
+            except httpx.HTTPError as e:
+                logging.warning(f"Could not export {len(spans)} spans: {e}")
+        return len(spans)
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(TRACE_FLUSH_INTERVAL)
+            _forget_idle_navigations()
+            await self.flush()
+
+    async def aclose(self):
+        await self.flush()
+        if self._client is not None:
+            await self._client.aclose()
+
+
+exporter = SpanExporter(TRACE_FILE, TRACE_OTLP_ENDPOINT)
+
+
+class _Navigation:
+    __slots__ = ("root", "last_active")
+
+    def __init__(self, root: Span):
+        self.root = root
+        self.last_active = time.monotonic()
+
+
+# Client token -> the trace its events currently belong to.
+_navigations: dict[str, _Navigation] = {}
+
+
+def _forget_idle_navigations():
+    cutoff = time.monotonic() - TRACE_IDLE_GAP
+    for token, navigation in list(_navigations.items()):
+        if navigation.last_active < cutoff:
+            _navigations.pop(token, None)
+
+
+class EventSpan:
+    """The span of one event handler call, opened when the call starts.
+
+    A navigation's ``on_load_internal`` event starts a trace, and every
+    event the same tab sends until it goes quiet for TRACE_IDLE_GAP seconds
+    joins it as a child span. The span is current only between ``enter()``
+    and ``leave()``, so Strapi and Stripe requests made by the handler nest
+    under it but Reflex sending a generator's updates does not.
+    """
+
+    __slots__ = ("span", "token")
+
+    def __init__(self, state, name: str, navigation: bool = False):
+        self.token = state.router.session.client_token
+        page = state.router.page
+        attributes = {"page.route": page.path, "page.path": page.raw_path}
+        if navigation:
+            name = f"{name} {page.path}"
+        current = _navigations.get(self.token)
+        if navigation or current is None:
+            parent = None
+        elif time.monotonic() - current.last_active > TRACE_IDLE_GAP:
+            parent = None
+        else:
+            parent = current.root
+        self.span = Span(name, "server", parent, attributes)
+        if parent is None:
+            _navigations[self.token] = _Navigation(self.span)
+
+    def enter(self) -> contextvars.Token:
+        return _current_span.set(self.span)
+
+    def leave(self, context: contextvars.Token):
+        _current_span.reset(context)
+
+    def finish(self, error: BaseException | None = None):
+        self.span.end(error)
+        if (navigation := _navigations.get(self.token)) is not None:
+            navigation.last_active = time.monotonic()
+
+
+@contextlib.asynccontextmanager
+async def tracing_lifespan():
+    if not TRACING_ENABLED:
+        yield
+        return
+    worker = asyncio.create_task(exporter.run())
+    try:
+        yield
+    finally:
+        worker.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await worker
+        await exporter.aclose()
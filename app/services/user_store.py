@@ -0,0 +1,204 @@
+import asyncio
+import datetime
+import hashlib
+import hmac
+import os
+import secrets
+import sqlite3
+from typing import Literal, TypedDict
+from app.services.db import db
+
+# scrypt cost is 2**PASSWORD_HASH_LOG_N; raise it as hardware gets faster.
+# Existing hashes keep their own parameters and are upgraded on next login.
+PASSWORD_HASH_LOG_N = int(os.getenv("PASSWORD_HASH_LOG_N", "14"))
+PASSWORD_HASH_R = 8
+PASSWORD_HASH_P = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    email TEXT NOT NULL,
+    full_name TEXT NOT NULL,
+    phone_number TEXT,
+    role TEXT NOT NULL DEFAULT 'customer',
+    password_hash TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS users_by_email ON users (email);
+"""
+
+DEMO_USERS = [
+    ("admin@example.com", "Admin User", "123-456-7890", "admin", "admin123"),
+    ("customer@example.com", "John Doe", "111-222-3333", "customer", "password123"),
+]
+
+
+class User(TypedDict):
+    id: int
+    full_name: str
+    email: str
+    phone_number: str | None
+    role: Literal["customer", "admin"]
+
+
+class EmailTaken(Exception):
+    pass
+
+
+def hash_password(password: str, log_n: int = PASSWORD_HASH_LOG_N) -> str:
+    salt = secrets.token_bytes(16)
+    n = 2**log_n
+    digest = hashlib.scrypt(
+        password.encode(),
+        salt=salt,
+        n=n,
+        r=PASSWORD_HASH_R,
+        p=PASSWORD_HASH_P,
+        maxmem=256 * n * PASSWORD_HASH_R,
+    )
+    params = f"{log_n}${PASSWORD_HASH_R}${PASSWORD_HASH_P}"
+    return f"scrypt${params}${salt.hex()}${digest.hex()}"
+
+
+def verify_password(password: str, encoded: str) -> bool:
+    _, log_n, r, p, salt, expected = encoded.split("$")
+    n = 2 ** int(log_n)
+    digest = hashlib.scrypt(
+        password.encode(),
+        salt=bytes.fromhex(salt),
+        n=n,
+        r=int(r),
+        p=int(p),
+        maxmem=256 * n * int(r),
+    )
+    return hmac.compare_digest(digest.hex(), expected)
+
+
+def _needs_rehash(encoded: str) -> bool:
+    return encoded.split("$")[1] != str(PASSWORD_HASH_LOG_N)
+
+
+def _row_to_user(row: sqlite3.Row) -> User:
+    return {
+        "id": row["id"],
+        "full_name": row["full_name"],
+        "email": row["email"],
+        "phone_number": row["phone_number"],
+        "role": row["role"],
+    }
+
+
+class UserStore:
+    """Accounts persisted in SQLite, looked up by a unique email index.
+
+    Password hashing is deliberately slow, so it always runs in a worker
+    thread via ``asyncio.to_thread`` and never on the event loop.
+    """
+
+    def __init__(self):
+        self._seeded = False
+        # Verified against when the email is unknown, so a miss costs the
+        # same as a wrong password.
+        self._dummy_hash: str | None = None
+
+    async def _ready(self):
+        db.ensure_schema("users", SCHEMA)
+        if self._seeded:
+            return
+        existing = await db.run(
+            lambda conn: {
+                row["email"]
+                for row in conn.execute(
+                    "SELECT email FROM users WHERE email IN (?, ?)",
+                    [user[0] for user in DEMO_USERS],
+                )
+            }
+        )
+        for email, full_name, phone_number, role, password in DEMO_USERS:
+            if email not in existing:
+                try:
+                    await self.create(
+                        full_name, email, password, phone_number, role, seed=True
+                    )
+                except EmailTaken:
+                    pass
+        self._seeded = True
+
+    async def create(
+        self,
+        full_name: str,
+        email: str,
+        password: str,
+        phone_number: str | None = None,
+        role: Literal["customer", "admin"] = "customer",
+        seed: bool = False,
+    ) -> User:
+        if not seed:
+            await self._ready()
+        email = email.strip().lower()
+        password_hash = await asyncio.to_thread(hash_password, password)
+
+        def insert(conn: sqlite3.Connection) -> int:
+            return conn.execute(
+                "INSERT INTO users (email, full_name, phone_number, role, "
+                "password_hash, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    email,
+                    full_name,
+                    phone_number,
+                    role,
+                    password_hash,
+                    datetime.datetime.now().isoformat(),
+                ),
+            ).lastrowid
+
+        try:
+            user_id = await db.run(insert)
+        except sqlite3.IntegrityError as e:
+            raise EmailTaken(email) from e
+        return {
+            "id": user_id,
+            "full_name": full_name,
+            "email": email,
+            "phone_number": phone_number,
+            "role": role,
+        }
+
+    async def authenticate(self, email: str, password: str) -> User | None:
+        await self._ready()
+        email = email.strip().lower()
+        row = await db.run(
+            lambda conn: conn.execute(
+                "SELECT * FROM users WHERE email = ?", (email,)
+            ).fetchone()
+        )
+        if row is None:
+            if self._dummy_hash is None:
+                self._dummy_hash = await asyncio.to_thread(
+                    hash_password, secrets.token_hex(8)
+                )
+            await asyncio.to_thread(verify_password, password, self._dummy_hash)
+            return None
+        if not await asyncio.to_thread(verify_password, password, row["password_hash"]):
+            return None
+        if _needs_rehash(row["password_hash"]):
+            password_hash = await asyncio.to_thread(hash_password, password)
+            await db.run(
+                lambda conn: conn.execute(
+                    "UPDATE users SET password_hash = ? WHERE id = ?",
+                    (password_hash, row["id"]),
+                )
+            )
+        return _row_to_user(row)
+
+    async def get(self, user_id: int) -> User | None:
+        await self._ready()
+        row = await db.run(
+            lambda conn: conn.execute(
+                "SELECT * FROM users WHERE id = ?", (user_id,)
+            ).fetchone()
+        )
+        return _row_to_user(row) if row else None
+
+
+user_store = UserStore()
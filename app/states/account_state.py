@@ -0,0 +1,102 @@
+import reflex as rx
+from app.services.account_store import ADDRESS_FIELDS, SavedAddress, account_store
+from app.services.user_store import User
+from app.states.auth_state import AuthState
+from app.states.product_state import Product, catalog_cache
+
+
+class AccountState(rx.State):
+    """Profile, wishlist and address book for the signed-in user.
+
+    Each is loaded lazily, the first time a page showing it opens, and
+    kept for the rest of the connection.
+    """
+
+    profile: User | None = None
+    wishlist_ids: list[int] = []
+    addresses: list[SavedAddress] = []
+    _profile_user: int | None = None
+    _wishlist_user: int | None = None
+    _addresses_user: int | None = None
+
+    @rx.var
+    def wishlist_products(self) -> list[Product]:
+        index = catalog_cache.index
+        products = (index.get(product_id) for product_id in self.wishlist_ids)
+        return [product for product in products if product]
+
+    async def _user_id(self) -> int | None:
+        return (await self.get_state(AuthState)).user_id
+
+    async def _ensure_wishlist(self) -> int | None:
+        user_id = await self._user_id()
+        if user_id is not None and self._wishlist_user != user_id:
+            self.wishlist_ids = await account_store.wishlist(user_id)
+            self._wishlist_user = user_id
+        return user_id
+
+    async def _reload_addresses(self, user_id: int):
+        self.addresses = await account_store.addresses(user_id)
+        self._addresses_user = user_id
+
+    @rx.event
+    async def load_profile(self):
+        auth_state = await self.get_state(AuthState)
+        if self._profile_user != auth_state.user_id:
+            self.profile = await auth_state._profile()
+            self._profile_user = auth_state.user_id
+
+    @rx.event
+    async def load_wishlist(self):
+        await catalog_cache.get()
+        await self._ensure_wishlist()
+
+    @rx.event
+    async def toggle_wishlist(self, product_id: int):
+        user_id = await self._ensure_wishlist()
+        if user_id is None:
+            yield rx.toast.info("Please log in to save items to your wishlist.")
+            yield rx.redirect("/login")
+            return
+        if product_id in self.wishlist_ids:
+            await account_store.remove_from_wishlist(user_id, product_id)
+            self.wishlist_ids = [i for i in self.wishlist_ids if i != product_id]
+            yield rx.toast.info("Removed from wishlist.")
+        else:
+            await account_store.add_to_wishlist(user_id, product_id)
+            self.wishlist_ids = [product_id, *self.wishlist_ids]
+            yield rx.toast.success("Saved to wishlist!")
+
+    @rx.event
+    async def load_addresses(self):
+        user_id = await self._user_id()
+        if user_id is not None and self._addresses_user != user_id:
+            await self._reload_addresses(user_id)
+
+    @rx.event
+    async def save_address(self, form_data: dict):
+        user_id = await self._user_id()
+        if user_id is None:
+            return
+        address = {field: form_data.get(field, "").strip() for field in ADDRESS_FIELDS}
+        if not all(address.values()):
+            return rx.toast.error("Please fill in every address field.")
+        await account_store.save_address(
+            user_id, address, make_default=bool(form_data.get("is_default"))
+        )
+        await self._reload_addresses(user_id)
+        return rx.toast.success("Address saved.")
+
+    @rx.event
+    async def set_default_address(self, address_id: int):
+        user_id = await self._user_id()
+        if user_id is not None:
+            await account_store.set_default_address(user_id, address_id)
+            await self._reload_addresses(user_id)
+
+    @rx.event
+    async def delete_address(self, address_id: int):
+        user_id = await self._user_id()
+        if user_id is not None:
+            await account_store.delete_address(user_id, address_id)
+            await self._reload_addresses(user_id)
@@ -0,0 +1,89 @@
+import datetime
+import reflex as rx
+from app.services import sales_metrics
+from app.services.order_store import OrderFilter, order_store
+from app.services.sales_metrics import DailySales, PaymentMix, ProductSales
+from app.states.auth_state import AuthState
+from app.states.payment_state import Order
+from app.states.product_state import catalog_cache
+
+ORDER_STATUSES = ["confirmed", "processing", "shipped", "delivered", "cancelled"]
+ADMIN_ORDER_PAGE_SIZE = 25
+
+
+class SkuSales(ProductSales):
+    sku: str
+
+
+class AdminState(rx.State):
+    orders: list[Order] = []
+    orders_next_cursor: str = ""
+    status_filter: str = ""
+    date_from: str = ""
+    date_to: str = ""
+    daily_sales: list[DailySales] = []
+    payment_mix: list[PaymentMix] = []
+    total_orders: int = 0
+    total_revenue: float = 0.0
+    average_order_value: float = 0.0
+    top_skus: list[SkuSales] = []
+
+    async def _is_admin(self) -> bool:
+        return (await self.get_state(AuthState)).is_admin
+
+    def _order_filter(self) -> OrderFilter:
+        filters: OrderFilter = {}
+        if self.status_filter:
+            filters["status"] = self.status_filter
+        if self.date_from:
+            filters["created_from"] = self.date_from
+        if self.date_to:
+            # created_at is an ISO timestamp; include the whole end day.
+            end = datetime.date.fromisoformat(self.date_to) + datetime.timedelta(1)
+            filters["created_to"] = end.isoformat()
+        return filters
+
+    async def _fetch_orders(self, cursor: str = ""):
+        page = await order_store.query(
+            self._order_filter(), cursor=cursor, limit=ADMIN_ORDER_PAGE_SIZE
+        )
+        self.orders = self.orders + page["orders"] if cursor else page["orders"]
+        self.orders_next_cursor = page["next_cursor"]
+
+    @rx.event
+    async def load_dashboard(self):
+        if not await self._is_admin():
+            return
+        self.daily_sales = await sales_metrics.daily_sales()
+        totals, self.payment_mix = await sales_metrics.summary()
+        self.total_orders = totals["orders"]
+        self.total_revenue = totals["revenue"]
+        self.average_order_value = totals["average_order_value"]
+        index = catalog_cache.index
+        top_skus = []
+        for row in await sales_metrics.top_products():
+            product = index.get(row["product_id"])
+            top_skus.append({**row, "sku": product["sku"] if product else ""})
+        self.top_skus = top_skus
+
+    @rx.event
+    async def load_orders(self):
+        if await self._is_admin():
+            await self._fetch_orders()
+
+    @rx.event
+    async def filter_orders(self, form_data: dict):
+        if not await self._is_admin():
+            return
+        self.status_filter = form_data.get("status", "")
+        self.date_from = form_data.get("date_from", "")
+        self.date_to = form_data.get("date_to", "")
+        try:
+            await self._fetch_orders()
+        except ValueError:
+            yield rx.toast.error("Please enter valid dates.")
+
+    @rx.event
+    async def load_more_orders(self):
+        if self.orders_next_cursor and await self._is_admin():
+            await self._fetch_orders(self.orders_next_cursor)
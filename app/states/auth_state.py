@@ -1,89 +1,107 @@
 import reflex as rx
-from typing import TypedDict, Literal
-
-
-class User(TypedDict):
-    full_name: str
-    email: str
-    password: str
-    phone_number: str | None
-    role: Literal["customer", "admin"]
+from app.services.session_tokens import (
+    SESSION_TTL,
+    SessionClaims,
+    issue_token,
+    verify_token,
+)
+from app.services.user_store import EmailTaken, User, user_store
+from app.states.cart_state import CartState
 
 
 class AuthState(rx.State):
-    users: dict[str, User] = {
-        "admin@example.com": {
-            "full_name": "Admin User",
-            "email": "admin@example.com",
-            "password": "admin123",
-            "phone_number": "123-456-7890",
-            "role": "admin",
-        },
-        "customer@example.com": {
-            "full_name": "John Doe",
-            "email": "customer@example.com",
-            "password": "password123",
-            "phone_number": "111-222-3333",
-            "role": "customer",
-        },
-    }
-    logged_in_user: User | None = None
+    # The signed token is the login. State keeps only the user id and role
+    # from it; handlers and pages that show the profile load it when needed.
+    session_token: str = rx.Cookie(
+        "", name="dk_session", max_age=SESSION_TTL, same_site="strict"
+    )
+    user_id: int | None = None
+    user_role: str = ""
     show_login_toast: bool = False
 
     @rx.var
     def is_authenticated(self) -> bool:
-        return self.logged_in_user is not None
+        return self.user_id is not None
 
     @rx.var
     def is_admin(self) -> bool:
-        return (
-            self.logged_in_user is not None
-            and self.logged_in_user.get("role") == "admin"
-        )
+        return self.user_role == "admin"
+
+    def _start_session(self, user: User):
+        self.session_token = issue_token(user["id"], user["role"])
+        self.user_id = user["id"]
+        self.user_role = user["role"]
+
+    def _end_session(self):
+        self.session_token = ""
+        self.user_id = None
+        self.user_role = ""
+
+    async def _restore_session(self) -> SessionClaims | None:
+        claims = verify_token(self.session_token)
+        if claims is None:
+            self.user_id = None
+            self.user_role = ""
+            return None
+        if self.user_id != claims["uid"]:
+            # Once per connection, make sure the account still exists.
+            if await user_store.get(claims["uid"]) is None:
+                self._end_session()
+                return None
+            self.user_id = claims["uid"]
+            self.user_role = claims["role"]
+        return claims
+
+    async def _profile(self) -> User | None:
+        if self.user_id is None:
+            return None
+        return await user_store.get(self.user_id)
 
     @rx.event
-    def signup(self, form_data: dict):
-        email = form_data["email"].lower()
-        if email in self.users:
-            return rx.toast.error("Email already exists.")
+    async def restore_session(self):
+        await self._restore_session()
+
+    @rx.event
+    async def signup(self, form_data: dict):
         if form_data["password"] != form_data["confirm_password"]:
             return rx.toast.error("Passwords do not match.")
-        new_user: User = {
-            "full_name": form_data["full_name"],
-            "email": email,
-            "password": form_data["password"],
-            "phone_number": None,
-            "role": "customer",
-        }
-        self.users[email] = new_user
-        self.logged_in_user = new_user
-        return rx.redirect("/")
+        try:
+            user = await user_store.create(
+                form_data["full_name"], form_data["email"], form_data["password"]
+            )
+        except EmailTaken:
+            return rx.toast.error("Email already exists.")
+        self._start_session(user)
+        return [CartState.merge_guest_cart, rx.redirect("/")]
 
     @rx.event
-    def login(self, form_data: dict):
-        email = form_data["email"].lower()
-        password = form_data["password"]
-        user = self.users.get(email)
-        if user and user["password"] == password:
-            self.logged_in_user = user
+    async def login(self, form_data: dict):
+        user = await user_store.authenticate(form_data["email"], form_data["password"])
+        if user:
+            self._start_session(user)
+            yield CartState.merge_guest_cart
             yield rx.toast.success("Login Successful!")
-            return rx.redirect("/")
+            yield rx.redirect("/")
         else:
-            return rx.toast.error("Invalid email or password.")
+            yield rx.toast.error("Invalid email or password.")
 
     @rx.event
     def logout(self):
-        self.logged_in_user = None
+        self._end_session()
+        # The saved cart stays with the account; this browser goes back to
+        # its guest cart.
+        yield CartState.hydrate
         yield rx.toast.info("You have been logged out.")
         return rx.redirect("/")
 
     @rx.event
-    def check_login(self):
-        if not self.is_authenticated:
+    async def check_login(self):
+        if await self._restore_session() is None:
             return rx.redirect("/login")
 
     @rx.event
-    def check_admin(self):
-        if not self.is_admin:
+    async def check_admin(self):
+        claims = await self._restore_session()
+        if claims is None or claims["role"] != "admin":
             yield rx.toast.error("You are not authorized to view this page.")
-            return rx.redirect("/")
\ No newline at end of file
+            yield rx.redirect("/")
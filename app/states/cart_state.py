@@ -1,19 +1,76 @@
 import reflex as rx
+import secrets
 from typing import TypedDict
-from app.states.product_state import Product
+from app.services.cart_store import (
+    CART_ANON_TTL,
+    cart_store,
+    guest_cart_key,
+    merge_carts,
+    user_cart_key,
+)
+from app.services.inventory import InsufficientStock, inventory
+from app.services.session_tokens import verify_token
+from app.states.product_state import catalog_cache
+
+
+def reservation_holder(cart: "CartState") -> str:
+    """Stock is held per cart, so every tab showing a cart shares its holds."""
+    return cart._cart_key
+
+
+class CartLine(TypedDict):
+    """A cart or order line as stored in session state.
+
+    Name and price are snapshots taken when the product was added; images,
+    sku and the rest are resolved from the shared catalog when displayed.
+    """
+
+    product_id: int
+    quantity: int
+    price: float
+    name: str
 
 
 class CartItem(TypedDict):
-    product: Product
+    product_id: int
     quantity: int
+    price: float
+    name: str
+    sku: str
+    image: str
+    line_total: float
 
 
 class CartState(rx.State):
-    items: dict[int, CartItem] = {}
+    """The shopper's cart, persisted through the cart store.
+
+    Guests are keyed by a random ``dk_cart`` cookie and signed-in users by
+    their id. Contents are loaded on first use in a connection rather than
+    on connect, and every change is handed to the store, which coalesces
+    writes.
+    """
+
+    items: dict[int, CartLine] = {}
+    cart_token: str = rx.Cookie(
+        "", name="dk_cart", max_age=int(CART_ANON_TTL), same_site="lax"
+    )
+    _cart_key: str = ""
 
     @rx.var
     def cart_items(self) -> list[CartItem]:
-        return list(self.items.values())
+        index = catalog_cache.index
+        cart_items = []
+        for line in self.items.values():
+            product = index.get(line["product_id"])
+            cart_items.append(
+                {
+                    **line,
+                    "sku": product["sku"] if product else "",
+                    "image": product["images"][0] if product else "/placeholder.svg",
+                    "line_total": line["price"] * line["quantity"],
+                }
+            )
+        return cart_items
 
     @rx.var
     def item_count(self) -> int:
@@ -21,40 +78,122 @@ class CartState(rx.State):
 
     @rx.var
     def subtotal(self) -> float:
-        return sum(
-            (
-                item["product"]["price"] * item["quantity"]
-                for item in self.items.values()
-            )
-        )
+        return sum((item["price"] * item["quantity"] for item in self.items.values()))
+
+    async def _current_key(self) -> str:
+        from app.states.auth_state import AuthState
+
+        claims = verify_token((await self.get_state(AuthState)).session_token)
+        if claims:
+            return user_cart_key(claims["uid"])
+        if not self.cart_token:
+            self.cart_token = secrets.token_urlsafe(16)
+        return guest_cart_key(self.cart_token)
+
+    def _reserve_items(self):
+        # Holds may have lapsed while the cart sat in storage; checkout
+        # re-checks stock anyway, so a shortfall here is not an error.
+        for product_id, line in self.items.items():
+            try:
+                inventory.reserve(self._cart_key, {product_id: line["quantity"]})
+            except InsufficientStock:
+                pass
+
+    async def _hydrate(self):
+        key = await self._current_key()
+        if key != self._cart_key:
+            self._cart_key = key
+            self.items = await cart_store.load(key)
+            self._reserve_items()
+
+    def _save(self):
+        cart_store.save(self._cart_key, self.items)
+
+    def _clear(self):
+        self.items = {}
+        self._save()
+
+    @rx.event
+    async def hydrate(self):
+        await self._hydrate()
+
+    @rx.event
+    async def merge_guest_cart(self):
+        """Fold the guest cart into the user's saved cart after login."""
+        user_key = await self._current_key()
+        if not self.cart_token or not user_key.startswith("user:"):
+            await self._hydrate()
+            return
+        guest_key = guest_cart_key(self.cart_token)
+        if self._cart_key == guest_key:
+            guest = self.items
+        else:
+            guest = await cart_store.load(guest_key)
+        inventory.release(guest_key, list(guest))
+        cart_store.delete(guest_key)
+        self._cart_key = user_key
+        self.items = merge_carts(guest, await cart_store.load(user_key))
+        self._save()
+        self._reserve_items()
 
     @rx.event
     async def add_to_cart(self, product_id: int, quantity: int = 1):
+        await self._hydrate()
         if product_id in self.items:
-            self.items[product_id]["quantity"] += quantity
+            new_quantity = self.items[product_id]["quantity"] + quantity
+            try:
+                inventory.reserve(reservation_holder(self), {product_id: new_quantity})
+            except InsufficientStock as e:
+                yield rx.toast.error(f"Only {e.available} left in stock.")
+                return
+            self.items[product_id]["quantity"] = new_quantity
         else:
-            from app.states.product_state import ProductState
-
-            product_state = await self.get_state(ProductState)
-            product = next(
-                (p for p in product_state.products if p["id"] == product_id), None
-            )
-            if product:
-                self.items[product_id] = {"product": product, "quantity": quantity}
+            product = (await catalog_cache.get())["index"].get(product_id)
+            if product is None:
+                yield rx.toast.error("Sorry, this item is no longer available.")
+                return
+            try:
+                inventory.reserve(reservation_holder(self), {product_id: quantity})
+            except InsufficientStock as e:
+                yield rx.toast.error(
+                    f"Only {e.available} left in stock."
+                    if e.available
+                    else "Sorry, this item is out of stock."
+                )
+                return
+            self.items[product_id] = {
+                "product_id": product_id,
+                "quantity": quantity,
+                "price": product["price"],
+                "name": product["name"],
+            }
+        self._save()
         yield rx.toast.success(f"Added to cart!")
 
     @rx.event
-    def remove_from_cart(self, product_id: int):
+    async def remove_from_cart(self, product_id: int):
+        await self._hydrate()
         if product_id in self.items:
             del self.items[product_id]
+            inventory.release(reservation_holder(self), [product_id])
+            self._save()
 
     @rx.event
-    def update_quantity(self, product_id: int, quantity: int):
+    async def update_quantity(self, product_id: int, quantity: int):
+        await self._hydrate()
         if product_id in self.items:
             if int(quantity) > 0:
+                try:
+                    inventory.reserve(
+                        reservation_holder(self), {product_id: int(quantity)}
+                    )
+                except InsufficientStock as e:
+                    return rx.toast.error(f"Only {e.available} left in stock.")
                 self.items[product_id]["quantity"] = int(quantity)
             else:
                 del self.items[product_id]
+                inventory.release(reservation_holder(self), [product_id])
+            self._save()
 
     @rx.event
     async def proceed_to_checkout(self):
@@ -1,18 +1,25 @@
 import reflex as rx
-import stripe
 import os
+import uuid
 from typing import TypedDict, Literal
-from app.states.cart_state import CartState
+from app.states.cart_state import CartLine, CartState, reservation_holder
 from app.states.auth_state import AuthState
-from app.states.product_state import (
-    ProductState,
-    STRAPI_URL,
-    STRAPI_API_TOKEN,
-    STRAPI_CONFIGURED,
+from app.states.product_state import catalog_cache
+from app.services.account_store import account_store
+from app.services.inventory import InsufficientStock, inventory
+from app.services.order_store import order_store
+from app.services.pricing import CheckoutQuote, quote_checkout
+from app.services.payment_gateway import (
+    PaymentGatewayError,
+    idempotency_key,
+    payment_gateway,
 )
 import logging
-import requests
 import json
+import sqlite3
+
+# Order ids are short, so a clash is possible; draw again this many times.
+ORDER_ID_ATTEMPTS = 3
 
 
 class PaymentMethod(TypedDict):
@@ -24,7 +31,7 @@ class PaymentMethod(TypedDict):
 class Order(TypedDict):
     id: str
     user_email: str
-    items: list
+    items: list[CartLine]
     subtotal: float
     shipping_cost: float
     cod_advance: float | None
@@ -40,36 +47,108 @@ class Order(TypedDict):
     stripe_payment_intent_id: str | None
 
 
+def _new_order_id() -> str:
+    return f"DK{uuid.uuid4().hex[:8].upper()}"
+
+
+async def _save_order(order: Order, user_id: int) -> bool:
+    """Save ``order`` with its Strapi sync, drawing a new id on a clash."""
+    for _ in range(ORDER_ID_ATTEMPTS):
+        try:
+            await order_store.save(
+                order,
+                sync_payload={"data": _strapi_order_data(order)},
+                user_id=user_id,
+            )
+            return True
+        except sqlite3.IntegrityError as e:
+            logging.warning(f"Order id {order['id']} is taken, drawing another: {e}")
+            order["id"] = _new_order_id()
+        except sqlite3.Error as e:
+            logging.exception(f"Could not save order {order['id']}: {e}")
+            return False
+    return False
+
+
+def _out_of_stock_message(e: InsufficientStock) -> str:
+    product = catalog_cache.index.get(e.product_id)
+    name = product["name"] if product else "an item in your cart"
+    return f"Only {e.available} of {name} left in stock"
+
+
+def _strapi_order_data(order: Order) -> dict:
+    return {
+        "order_id_string": order["id"],
+        "user_email": order["user_email"],
+        "subtotal": order["subtotal"],
+        "shipping_cost": order["shipping_cost"],
+        "cod_advance": order["cod_advance"],
+        "cod_remaining": order["cod_remaining"],
+        "total_amount": order["total_amount"],
+        "payment_method_type": order["payment_method"]["type"],
+        "payment_status": order["payment_status"],
+        "shipping_address": json.dumps(order["shipping_address"]),
+        "status": order["status"],
+        "created_at": order["created_at"],
+        "stripe_payment_intent_id": order["stripe_payment_intent_id"],
+        "items_json": json.dumps(
+            [
+                {
+                    "id": line["product_id"],
+                    "name": line["name"],
+                    "quantity": line["quantity"],
+                    "price": line["price"],
+                }
+                for line in order["items"]
+            ]
+        ),
+    }
+
+
 class PaymentState(rx.State):
     stripe_publishable_key: str = os.getenv("STRIPE_PUBLISHABLE_KEY", "")
     orders: list[Order] = []
+    orders_next_cursor: str = ""
     current_order: Order | None = None
     selected_payment_method: Literal["stripe", "cod"] = "stripe"
     processing_payment: bool = False
     payment_error: str = ""
     shipping_address: dict = {}
-    shipping_cost: float = 50.0
-    cod_advance_percentage: float = 50.0
+    _checkout_id: str = ""
+    _payment_intent_id: str | None = None
 
     @rx.var
     def stripe_available(self) -> bool:
-        return bool(self.stripe_publishable_key and os.getenv("STRIPE_SECRET_KEY"))
+        return bool(self.stripe_publishable_key and payment_gateway.configured)
 
     @rx.var
-    async def total_amount_computed(self) -> float:
-        """Computes total amount from cart subtotal and shipping."""
+    async def quote(self) -> CheckoutQuote:
+        """Every checkout amount, priced once per cart or payment method change."""
         cart_state = await self.get_state(CartState)
-        return cart_state.subtotal + self.shipping_cost
+        items = cart_state.items
+        return quote_checkout(
+            tuple((line["price"], line["quantity"]) for line in items.values()),
+            self.selected_payment_method,
+        )
 
-    @rx.var
-    async def cod_advance_amount(self) -> float:
-        """Calculate 50% advance amount for COD"""
-        return await self.total_amount_computed * (self.cod_advance_percentage / 100)
+    async def _fetch_orders(self, cursor: str = ""):
+        user = await (await self.get_state(AuthState))._profile()
+        if user is None:
+            self.orders = []
+            self.orders_next_cursor = ""
+            return
+        page = await order_store.query({"user_email": user["email"]}, cursor=cursor)
+        self.orders = self.orders + page["orders"] if cursor else page["orders"]
+        self.orders_next_cursor = page["next_cursor"]
 
-    @rx.var
-    async def cod_remaining_amount(self) -> float:
-        """Calculate remaining amount to be paid on delivery"""
-        return await self.total_amount_computed - await self.cod_advance_amount
+    @rx.event
+    async def load_orders(self):
+        await self._fetch_orders()
+
+    @rx.event
+    async def load_more_orders(self):
+        if self.orders_next_cursor:
+            await self._fetch_orders(self.orders_next_cursor)
 
     @rx.event
     def set_payment_method(self, method: str):
@@ -88,66 +167,82 @@ class PaymentState(rx.State):
             "phone": form_data.get("phone", ""),
         }
 
+    @rx.event
+    async def prefill_shipping_address(self):
+        """Start checkout from the user's default saved address."""
+        if self.shipping_address:
+            return
+        user = await (await self.get_state(AuthState))._profile()
+        if user is None:
+            return
+        address = await account_store.default_address(user["id"])
+        if address:
+            self.shipping_address = {
+                "full_name": address["full_name"],
+                "email": user["email"],
+                "address_line_1": address["address_line_1"],
+                "city": address["city"],
+                "state": address["state"],
+                "postal_code": address["postal_code"],
+                "phone": address["phone"],
+            }
+
     async def _create_stripe_payment_intent_base(
         self, amount: float, description: str, metadata: dict
-    ):
+    ) -> str | None:
         if not self.stripe_available:
             self.payment_error = "Stripe is not properly configured"
             return None
+        # One key per checkout attempt and cart: a double submit or retry
+        # gets the same PaymentIntent back instead of charging twice.
+        if not self._checkout_id:
+            self._checkout_id = uuid.uuid4().hex
+        cart_state = await self.get_state(CartState)
+        lines = sorted(
+            (line["product_id"], line["quantity"])
+            for line in cart_state.items.values()
+        )
+        key = idempotency_key(self._checkout_id, metadata, lines, amount)
         try:
-            stripe.api_key = os.getenv("STRIPE_SECRET_KEY")
-            amount_in_paise = int(amount * 100)
-            payment_intent = stripe.PaymentIntent.create(
-                amount=amount_in_paise,
-                currency="inr",
-                payment_method_types=["card"],
-                description=description,
-                metadata=metadata,
+            payment_intent = await payment_gateway.create_payment_intent(
+                amount, description, metadata, idempotency_key=key
             )
-            return payment_intent
-        except Exception as e:
-            logging.exception(f"Error creating Stripe payment intent: {e}")
-            self.payment_error = f"Payment setup failed: {str(e)}"
+        except PaymentGatewayError as e:
+            self.payment_error = str(e)
             return None
+        self._payment_intent_id = payment_intent["id"]
+        return payment_intent["client_secret"]
 
     @rx.event
     async def create_stripe_payment_intent(self) -> str | None:
-        auth_state = await self.get_state(AuthState)
-        if not auth_state.is_authenticated:
+        user = await (await self.get_state(AuthState))._profile()
+        if user is None:
             self.payment_error = "Please log in to continue"
             return None
-        total_amount = await self.total_amount_computed
+        total_amount = (await self.quote)["total"]
         metadata = {
-            "customer_email": auth_state.logged_in_user["email"],
+            "customer_email": user["email"],
             "order_type": "full_payment",
         }
-        payment_intent = await self._create_stripe_payment_intent_base(
+        return await self._create_stripe_payment_intent_base(
             total_amount, "Dream Knot - Gift Purchase", metadata
         )
-        if payment_intent:
-            self.current_payment_intent_id = payment_intent.id
-            return payment_intent.client_secret
-        return None
 
     @rx.event
     async def create_cod_advance_payment_intent(self) -> str | None:
-        auth_state = await self.get_state(AuthState)
-        if not auth_state.is_authenticated:
+        user = await (await self.get_state(AuthState))._profile()
+        if user is None:
             self.payment_error = "Please log in to continue"
             return None
-        advance_amount = await self.cod_advance_amount
+        quote = await self.quote
         metadata = {
-            "customer_email": auth_state.logged_in_user["email"],
+            "customer_email": user["email"],
             "order_type": "cod_advance",
-            "remaining_amount": str(await self.cod_remaining_amount),
+            "remaining_amount": str(quote["cod_remaining"]),
         }
-        payment_intent = await self._create_stripe_payment_intent_base(
-            advance_amount, "Dream Knot - COD Advance (50%)", metadata
+        return await self._create_stripe_payment_intent_base(
+            quote["cod_advance"], "Dream Knot - COD Advance (50%)", metadata
         )
-        if payment_intent:
-            self.current_payment_intent_id = payment_intent.id
-            return payment_intent.client_secret
-        return None
 
     @rx.event
     async def process_payment(self):
@@ -159,9 +254,23 @@ class PaymentState(rx.State):
                 self.payment_error = "Please log in to continue"
                 return
             cart_state = await self.get_state(CartState)
-            if not cart_state.cart_items:
+            await cart_state._hydrate()
+            if not cart_state.items:
                 self.payment_error = "Your cart is empty"
                 return
+            # Renew the cart's holds so stock can't run out mid-payment.
+            try:
+                inventory.reserve(
+                    reservation_holder(cart_state),
+                    {
+                        line["product_id"]: line["quantity"]
+                        for line in cart_state.items.values()
+                    },
+                )
+            except InsufficientStock as e:
+                self.payment_error = _out_of_stock_message(e)
+                yield rx.toast.error(self.payment_error)
+                return
             if self.selected_payment_method == "stripe":
                 client_secret = await self.create_stripe_payment_intent()
                 if client_secret:
@@ -188,27 +297,36 @@ class PaymentState(rx.State):
     @rx.event
     async def create_order(self, payment_method: str, payment_status: str):
         import datetime
-        import uuid
 
         cart_state = await self.get_state(CartState)
-        auth_state = await self.get_state(AuthState)
-        product_state = await self.get_state(ProductState)
-        order_id = f"DK{uuid.uuid4().hex[:8].upper()}"
-        subtotal = cart_state.subtotal
-        total_amount = await self.total_amount_computed
+        user = await (await self.get_state(AuthState))._profile()
+        if user is None:
+            self.payment_error = "Please log in to continue"
+            yield rx.toast.error(self.payment_error)
+            return
+        order_id = _new_order_id()
+        lines = [CartLine(**line) for line in cart_state.items.values()]
+        quantities = {line["product_id"]: line["quantity"] for line in lines}
+        quote = quote_checkout(
+            tuple((line["price"], line["quantity"]) for line in lines), payment_method
+        )
+        try:
+            inventory.commit(reservation_holder(cart_state), quantities)
+        except InsufficientStock as e:
+            logging.error(f"Order {order_id} failed stock commit: {e}")
+            self.payment_error = _out_of_stock_message(e)
+            yield rx.toast.error(self.payment_error)
+            return
+        is_cod = payment_method == "cod"
         new_order: Order = {
             "id": order_id,
-            "user_email": auth_state.logged_in_user["email"],
-            "items": cart_state.cart_items,
-            "subtotal": subtotal,
-            "shipping_cost": self.shipping_cost,
-            "cod_advance": await self.cod_advance_amount
-            if payment_method == "cod"
-            else None,
-            "cod_remaining": await self.cod_remaining_amount
-            if payment_method == "cod"
-            else None,
-            "total_amount": total_amount,
+            "user_email": user["email"],
+            "items": lines,
+            "subtotal": quote["subtotal"],
+            "shipping_cost": quote["shipping"],
+            "cod_advance": quote["cod_advance"] if is_cod else None,
+            "cod_remaining": quote["cod_remaining"] if is_cod else None,
+            "total_amount": quote["total"],
             "payment_method": {
                 "type": payment_method,
                 "card_last4": None,
@@ -218,58 +336,19 @@ class PaymentState(rx.State):
             "status": "confirmed",
             "payment_status": payment_status,
             "created_at": datetime.datetime.now().isoformat(),
-            "stripe_payment_intent_id": getattr(
-                self, "current_payment_intent_id", None
-            ),
+            "stripe_payment_intent_id": self._payment_intent_id,
         }
-        self.orders.append(new_order)
+        if not await _save_order(new_order, user["id"]):
+            # Hand the stock back; the checkout id and payment intent are
+            # kept, so trying again reuses the same intent.
+            inventory.restock(quantities)
+            self.payment_error = "We could not record your order. Please try again."
+            yield rx.toast.error(self.payment_error)
+            return
         self.current_order = new_order
-        async with cart_state:
-            cart_state.items = {}
-        if product_state.strapi_health == "ok":
-            self._sync_order_to_strapi(new_order)
-        else:
-            logging.warning("Skipping Strapi order sync: Strapi health is not 'ok'.")
+        self._checkout_id = ""
+        self._payment_intent_id = None
+        catalog_cache.record_sale(quantities)
+        cart_state._clear()
         yield rx.toast.success("Order placed successfully!")
         yield rx.redirect("/account/orders")
-
-    def _sync_order_to_strapi(self, order: Order):
-        try:
-            order_data = {
-                "order_id_string": order["id"],
-                "user_email": order["user_email"],
-                "subtotal": order["subtotal"],
-                "shipping_cost": order["shipping_cost"],
-                "cod_advance": order["cod_advance"],
-                "cod_remaining": order["cod_remaining"],
-                "total_amount": order["total_amount"],
-                "payment_method_type": order["payment_method"]["type"],
-                "payment_status": order["payment_status"],
-                "shipping_address": json.dumps(order["shipping_address"]),
-                "status": order["status"],
-                "created_at": order["created_at"],
-                "stripe_payment_intent_id": order["stripe_payment_intent_id"],
-                "items_json": json.dumps(
-                    [
-                        {
-                            "id": item["product"]["id"],
-                            "name": item["product"]["name"],
-                            "quantity": item["quantity"],
-                        }
-                        for item in order["items"]
-                    ]
-                ),
-            }
-            headers = {"Authorization": f"Bearer {STRAPI_API_TOKEN}"}
-            response = requests.post(
-                f"{STRAPI_URL}/api/orders",
-                json={"data": order_data},
-                headers=headers,
-                timeout=10,
-            )
-            if response.status_code not in [200, 201]:
-                logging.error(
-                    f"Failed to sync order to Strapi. Status: {response.status_code}, Body: {response.text}"
-                )
-        except requests.exceptions.RequestException as e:
-            logging.exception(f"Exception during order sync to Strapi: {e}")
\ No newline at end of file
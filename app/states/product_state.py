@@ -1,17 +1,40 @@
 import reflex as rx
-from typing import TypedDict, Literal
+from typing import Awaitable, Callable, TypedDict, Literal
+import asyncio
 import logging
 import os
-import requests
-
-STRAPI_URL = os.getenv(
-    "STRAPI_URL", "https://committed-treasure-916aeef9fd.strapiapp.com/"
+import sqlite3
+import time
+from app.services import sales_metrics
+from app.services.catalog_snapshot import (
+    read_catalog_snapshot,
+    write_catalog_snapshot,
+)
+from app.services.inventory import inventory
+from app.services.metrics import cache_result
+from app.services.catalog_query import (
+    FACETS,
+    FacetValue,
+    ProductQuery,
+    query_products,
 )
-STRAPI_API_TOKEN = os.getenv(
-    "STRAPI_API_TOKEN",
-    "29c56c8d922ac739a56215545ff19501b2aa79b777294f7e212247861bd5102db96c808a4cd74223a8c5fcedbf045705a38d511857880968d194d64a040ea9dca7485a986f06f56d6e092ea1e1939409e933adbdf26057e8accb13ce0ef2994532e6b24e5f935fa32df69b9b02e3545e9af691096710e062cee2538b508756f8",
+from app.services.product_index import ProductIndex, category_slug
+from app.services.rankings import ProductRankings
+from app.services.search_index import SearchIndex
+from app.services.strapi_client import (
+    STRAPI_URL,
+    STRAPI_CONFIGURED,
+    HTTPError,
+    HTTPStatusError,
+    StrapiHealth,
+    StrapiUnavailable,
+    strapi,
 )
-STRAPI_CONFIGURED = bool(STRAPI_URL and STRAPI_API_TOKEN)
+from app.services.tracing import detached_context, span
+CATALOG_CACHE_TTL = float(os.getenv("CATALOG_CACHE_TTL", "60"))
+STRAPI_PAGE_SIZE = int(os.getenv("STRAPI_PAGE_SIZE", "100"))
+STRAPI_FETCH_CONCURRENCY = int(os.getenv("STRAPI_FETCH_CONCURRENCY", "4"))
+LISTING_PAGE_SIZE = int(os.getenv("LISTING_PAGE_SIZE", "24"))
 
 
 class Product(TypedDict):
@@ -30,204 +53,511 @@ class Product(TypedDict):
     num_reviews: int
 
 
+PRODUCT_FIELDS = [
+    "name",
+    "sku",
+    "price",
+    "original_price",
+    "description",
+    "category",
+    "occasion",
+    "recipient",
+    "stock",
+    "rating",
+    "num_reviews",
+]
+
+
+DUMMY_PRODUCTS: list[Product] = [
+    {
+        "id": 1,
+        "name": "Artisan Leather Journal",
+        "sku": "DK-LJ001",
+        "price": 2499.0,
+        "original_price": 2999.0,
+        "description": "A beautifully crafted leather journal for those who love to write. Made with genuine leather and recycled paper.",
+        "images": ["/placeholder.svg"],
+        "category": "Personalized",
+        "occasion": "Birthday",
+        "recipient": "For All",
+        "stock": 25,
+        "rating": 4.8,
+        "num_reviews": 120,
+    },
+    {
+        "id": 2,
+        "name": "Luxury Scented Candle Set",
+        "sku": "DK-CS002",
+        "price": 3499.0,
+        "original_price": None,
+        "description": "A set of three hand-poured soy wax candles in luxurious scents: Lavender, Sandalwood, and Citrus.",
+        "images": ["/placeholder.svg"],
+        "category": "Anniversary",
+        "occasion": "Anniversary",
+        "recipient": "For Her",
+        "stock": 40,
+        "rating": 4.9,
+        "num_reviews": 250,
+    },
+]
+DUMMY_CATEGORIES: list[str] = [
+    "Personalized",
+    "Anniversary",
+    "Corporate",
+    "Birthday",
+]
+
+
+class CatalogSnapshot(TypedDict):
+    health: StrapiHealth
+    products: list[Product]
+    categories: list[str]
+    error: str | None
+    index: ProductIndex
+    search: SearchIndex
+    rankings: ProductRankings
+    version: int
+
+
+class CatalogCache:
+    """Process-wide catalog shared by every ProductState session.
+
+    Readers are served from memory while the snapshot is fresh. Once it is
+    older than the TTL the stale copy keeps being served while a single
+    background refresh runs; only a cold or invalidated cache makes callers
+    wait, and then only one of them performs the fetch.
+    """
+
+    def __init__(self, loader: Callable[[], Awaitable[dict]], ttl: float):
+        self._loader = loader
+        self.ttl = ttl
+        self.version = 0
+        self.units_sold: dict[int, int] = {}
+        self._snapshot: CatalogSnapshot | None = None
+        self._last_good: CatalogSnapshot | None = None
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh_task: asyncio.Task | None = None
+
+    async def get(self) -> CatalogSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            cache_result("catalog", "miss")
+            async with self._lock:
+                if self._snapshot is None:
+                    await self._refresh()
+                return self._snapshot
+        if time.monotonic() >= self._expires_at:
+            cache_result("catalog", "stale")
+            self._refresh_in_background()
+        else:
+            cache_result("catalog", "hit")
+        return snapshot
+
+    @property
+    def index(self) -> ProductIndex:
+        if self._snapshot is None:
+            return ProductIndex([])
+        return self._snapshot["index"]
+
+    @property
+    def rankings(self) -> ProductRankings:
+        if self._snapshot is None:
+            return ProductRankings([], self.units_sold)
+        return self._snapshot["rankings"]
+
+    def invalidate(self):
+        self._expires_at = 0.0
+
+    def add_product(self, product: Product):
+        """Apply a product we just created without waiting for a full refresh."""
+        if self._snapshot is None:
+            return
+        self.version += 1
+        self._snapshot["index"].add(product)
+        self._snapshot["search"].add(product)
+        self._snapshot["rankings"].add(product)
+        inventory.sync([product])
+        self._snapshot = {**self._snapshot, "version": self.version}
+
+    def record_sale(self, quantities: dict[int, int]):
+        """Feed units sold into the best-seller ranking."""
+        rankings = self.rankings
+        for product_id, quantity in quantities.items():
+            rankings.record_sale(product_id, quantity)
+        if self._snapshot is not None:
+            self.version += 1
+            self._snapshot = {**self._snapshot, "version": self.version}
+
+    async def refresh(self) -> CatalogSnapshot:
+        async with self._lock:
+            await self._refresh()
+            return self._snapshot
+
+    async def _refresh(self):
+        fetched_at = time.monotonic()
+        try:
+            snapshot = await self._loader()
+        except Exception as e:
+            logging.exception(f"Catalog refresh failed: {e}")
+            snapshot = {
+                "health": "error",
+                "products": [],
+                "categories": [],
+                "error": "Could not reach Strapi server. Using dummy data.",
+            }
+        if snapshot["error"] and self._last_good:
+            # Keep serving the last good catalog rather than replacing it
+            # with dummy data because of a transient failure.
+            snapshot = {
+                **self._last_good,
+                "health": snapshot["health"],
+                "error": snapshot["error"],
+            }
+        else:
+            products = snapshot["products"]
+            # Strapi answered in full; an empty catalog then really is empty.
+            fetched = snapshot["health"] != "misconfigured" and not snapshot["error"]
+            if fetched:
+                await self._save_to_disk(products, snapshot["categories"])
+            elif not products:
+                # Prefer the catalog saved by the last successful fetch;
+                # the two dummy products are only for a fresh install.
+                try:
+                    saved = await asyncio.to_thread(read_catalog_snapshot)
+                except Exception as e:
+                    logging.exception(f"Could not read catalog snapshot: {e}")
+                    saved = None
+                if saved and saved[0]:
+                    products = saved[0]
+                    snapshot = {
+                        **snapshot,
+                        "categories": snapshot["categories"] or saved[1],
+                        "error": snapshot["error"]
+                        and "Could not reach Strapi server. Showing the last saved catalog.",
+                    }
+                products = products or DUMMY_PRODUCTS
+            inventory.sync(products, authoritative=fetched, fetched_at=fetched_at)
+            try:
+                # Sales are recorded by every worker; start from the rollup.
+                self.units_sold = await sales_metrics.units_by_product()
+            except sqlite3.Error as e:
+                logging.warning(f"Could not load units sold: {e}")
+            self.version += 1
+            snapshot = {
+                **snapshot,
+                "products": products,
+                "index": ProductIndex(products),
+                # Tokenizing a large catalog takes a while; keep it off the loop.
+                "search": await asyncio.to_thread(SearchIndex, products),
+                "rankings": ProductRankings(products, self.units_sold),
+                "version": self.version,
+            }
+            if products is not DUMMY_PRODUCTS:
+                self._last_good = snapshot
+        self._snapshot = snapshot
+        self._expires_at = time.monotonic() + self.ttl
+
+    async def _save_to_disk(self, products: list[Product], categories: list[str]):
+        if self._last_good is not None and self._last_good["products"] == products:
+            return
+        try:
+            await asyncio.to_thread(write_catalog_snapshot, products, categories)
+        except OSError as e:
+            logging.warning(f"Could not save catalog snapshot: {e}")
+
+    def _refresh_in_background(self):
+        if self._lock.locked():
+            return
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.create_task(
+            self._background_refresh(), context=detached_context()
+        )
+
+    async def _background_refresh(self):
+        with span("catalog refresh"):
+            await self.refresh()
+
+
+def _transform_strapi_product(strapi_product: dict) -> Product:
+    attrs = strapi_product.get("attributes", strapi_product)
+    image_data = attrs.get("images", {}).get("data", [])
+    images = []
+    if image_data:
+        for img in image_data:
+            img_attrs = img.get("attributes", img)
+            url = img_attrs.get("url")
+            if url:
+                images.append(
+                    f"{STRAPI_URL.rstrip('/')}{url}" if url.startswith("/") else url
+                )
+    if not images:
+        images.append("/placeholder.svg")
+    return {
+        "id": strapi_product["id"],
+        "name": attrs.get("name", "N/A"),
+        "sku": attrs.get("sku", "N/A"),
+        "price": float(attrs.get("price", 0)),
+        "original_price": float(attrs.get("original_price"))
+        if attrs.get("original_price") is not None
+        else None,
+        "description": attrs.get("description", ""),
+        "images": images,
+        "category": attrs.get("category", "Uncategorized"),
+        "occasion": attrs.get("occasion", "General"),
+        "recipient": attrs.get("recipient", "For All"),
+        "stock": int(attrs.get("stock", 0)),
+        "rating": float(attrs.get("rating", 0.0)),
+        "num_reviews": int(attrs.get("num_reviews", 0)),
+    }
+
+
+def _product_params(**extra) -> dict:
+    params = {f"fields[{i}]": field for i, field in enumerate(PRODUCT_FIELDS)}
+    params["populate[images][fields][0]"] = "url"
+    params.update(extra)
+    return params
+
+
+async def _fetch_product_page(page: int) -> tuple[list[Product], int]:
+    response = await strapi.get(
+        "/api/products",
+        params=_product_params(
+            **{
+                "pagination[page]": page,
+                "pagination[pageSize]": STRAPI_PAGE_SIZE,
+                "sort[0]": "id:asc",
+            }
+        ),
+    )
+    response.raise_for_status()
+    body = response.json()
+    page_count = body.get("meta", {}).get("pagination", {}).get("pageCount", 1)
+    return [_transform_strapi_product(p) for p in body["data"]], page_count
+
+
+async def _fetch_products_from_strapi() -> tuple[list[Product], str | None]:
+    """Fetch every product page, transforming each page as it arrives.
+
+    The first page tells us the page count; the rest are pulled by at most
+    STRAPI_FETCH_CONCURRENCY workers so a large catalog never has more than
+    that many requests in flight.
+    """
+    try:
+        first_page, page_count = await _fetch_product_page(1)
+        pages = {1: first_page}
+        remaining = iter(range(2, page_count + 1))
+
+        async def worker():
+            for page in remaining:
+                pages[page], _ = await _fetch_product_page(page)
+
+        await asyncio.gather(
+            *(worker() for _ in range(min(STRAPI_FETCH_CONCURRENCY, page_count - 1)))
+        )
+        return [product for page in sorted(pages) for product in pages[page]], None
+    except StrapiUnavailable as e:
+        logging.warning(f"Skipping product fetch: {e}")
+        return [], "Could not reach Strapi server. Using dummy data."
+    except HTTPStatusError as e:
+        if e.response.status_code == 404:
+            logging.warning(
+                "Strapi 'products' endpoint not found (404). Falling back to dummy data."
+            )
+            return (
+                [],
+                "Products endpoint not found. Please create 'Product' collection in Strapi.",
+            )
+        logging.error(
+            f"Failed to fetch products from Strapi. Status: {e.response.status_code}, Body: {e.response.text}"
+        )
+        return [], f"Could not fetch products (Status: {e.response.status_code})."
+    except HTTPError as e:
+        logging.exception(f"Failed to fetch products from Strapi: {e}")
+        return [], "Network error while fetching products."
+
+
+async def _fetch_categories_from_strapi() -> list[str]:
+    try:
+        response = await strapi.get("/api/categories")
+        if response.status_code == 200:
+            data = response.json().get("data", [])
+            return [
+                cat.get("name", cat.get("attributes", {}).get("name")) for cat in data
+            ]
+        logging.warning(
+            f"Could not fetch categories (Status: {response.status_code}). Using fallback."
+        )
+    except StrapiUnavailable as e:
+        logging.warning(f"Skipping category fetch: {e}")
+    except HTTPError as e:
+        logging.exception(f"Failed to fetch categories from Strapi: {e}")
+    return []
+
+
+async def _load_catalog() -> CatalogSnapshot:
+    if not STRAPI_CONFIGURED:
+        return {
+            "health": "misconfigured",
+            "products": [],
+            "categories": [],
+            "error": None,
+        }
+    (products, error), categories = await asyncio.gather(
+        _fetch_products_from_strapi(), _fetch_categories_from_strapi()
+    )
+    return {
+        "health": strapi.health,
+        "products": products,
+        "categories": categories,
+        "error": error,
+    }
+
+
+catalog_cache = CatalogCache(_load_catalog, ttl=CATALOG_CACHE_TTL)
+
+
 class ProductState(rx.State):
-    products: list[Product] = []
     categories_from_strapi: list[str] = []
     selected_product: Product | None = None
-    strapi_health: Literal["ok", "error", "misconfigured", "unknown"] = "unknown"
-    _dummy_products: list[Product] = [
-        {
-            "id": 1,
-            "name": "Artisan Leather Journal",
-            "sku": "DK-LJ001",
-            "price": 2499.0,
-            "original_price": 2999.0,
-            "description": "A beautifully crafted leather journal for those who love to write. Made with genuine leather and recycled paper.",
-            "images": ["/placeholder.svg"],
-            "category": "Personalized",
-            "occasion": "Birthday",
-            "recipient": "For All",
-            "stock": 25,
-            "rating": 4.8,
-            "num_reviews": 120,
-        },
-        {
-            "id": 2,
-            "name": "Luxury Scented Candle Set",
-            "sku": "DK-CS002",
-            "price": 3499.0,
-            "original_price": None,
-            "description": "A set of three hand-poured soy wax candles in luxurious scents: Lavender, Sandalwood, and Citrus.",
-            "images": ["/placeholder.svg"],
-            "category": "Anniversary",
-            "occasion": "Anniversary",
-            "recipient": "For Her",
-            "stock": 40,
-            "rating": 4.9,
-            "num_reviews": 250,
-        },
-    ]
-    _dummy_categories: list[str] = [
-        "Personalized",
-        "Anniversary",
-        "Corporate",
-        "Birthday",
-    ]
+    strapi_health: StrapiHealth = "unknown"
+    catalog_version: int = 0
+    listing: list[Product] = []
+    listing_total: int = 0
+    listing_page: int = 1
+    listing_page_count: int = 1
+    listing_next_cursor: str = ""
+    facets: dict[str, list[FacetValue]] = {}
+    selected_category: list[str] = []
+    selected_occasion: list[str] = []
+    selected_recipient: list[str] = []
+    min_price: float | None = None
+    max_price: float | None = None
+    in_stock_only: bool = False
+    sort_by: str = "featured"
 
-    @rx.event
-    def on_load(self):
-        return ProductState.run_strapi_health_check
+    def _apply_catalog(self, snapshot: CatalogSnapshot):
+        self.strapi_health = strapi.health
+        self.catalog_version = snapshot["version"]
+        self.categories_from_strapi = snapshot["categories"]
+
+    async def _query_listing(self, cursor: str = ""):
+        snapshot = await catalog_cache.get()
+        query: ProductQuery = {
+            "category": self.selected_category,
+            "occasion": self.selected_occasion,
+            "recipient": self.selected_recipient,
+            "min_price": self.min_price,
+            "max_price": self.max_price,
+            "in_stock": self.in_stock_only,
+            "sort": self.sort_by,
+            "page": self.listing_page,
+            "page_size": LISTING_PAGE_SIZE,
+            "cursor": cursor,
+        }
+        result = query_products(snapshot["index"], snapshot["version"], query)
+        self.listing = result["products"]
+        self.listing_total = result["total"]
+        self.listing_page = result["page"]
+        self.listing_page_count = result["page_count"]
+        self.listing_next_cursor = result["next_cursor"]
+        self.facets = result["facets"]
 
     @rx.event
-    def run_strapi_health_check(self):
-        if not STRAPI_CONFIGURED:
-            self.strapi_health = "misconfigured"
-            self.products = self._dummy_products
-            self.categories_from_strapi = self._dummy_categories
+    async def on_load(self):
+        snapshot = await catalog_cache.get()
+        self._apply_catalog(snapshot)
+        if snapshot["health"] == "misconfigured":
             yield rx.toast.warning(
                 "Strapi is not configured. Using dummy data.",
                 description="Please set STRAPI_URL and STRAPI_API_TOKEN.",
                 duration=5000,
             )
-            return
-        try:
-            headers = {"Authorization": f"Bearer {STRAPI_API_TOKEN}"}
-            response = requests.get(
-                f"{STRAPI_URL}/api/categories", headers=headers, timeout=5
-            )
-            if response.status_code == 200:
-                self.strapi_health = "ok"
-                yield [
-                    ProductState.fetch_products_from_strapi,
-                    ProductState.fetch_categories_from_strapi,
-                ]
-            else:
-                self.strapi_health = "error"
-                self.products = self._dummy_products
-                self.categories_from_strapi = self._dummy_categories
-                logging.error(
-                    f"Strapi health check failed. Status: {response.status_code}, Body: {response.text}"
-                )
-                yield rx.toast.error(
-                    "Strapi Connection Error",
-                    description=f"Failed to connect to Strapi. Status: {response.status_code}",
-                    duration=5000,
-                )
-        except requests.exceptions.RequestException as e:
-            self.strapi_health = "error"
-            self.products = self._dummy_products
-            self.categories_from_strapi = self._dummy_categories
-            logging.exception(f"Strapi health check failed with exception: {e}")
+        elif snapshot["error"] and self.strapi_health != "ok":
             yield rx.toast.error(
-                "Strapi Connection Failed",
-                description="Could not reach Strapi server. Using dummy data.",
+                "Strapi Connection Error",
+                description=snapshot["error"],
                 duration=5000,
             )
+        elif snapshot["error"]:
+            yield rx.toast.warning(snapshot["error"], duration=5000)
 
     @rx.event
-    def fetch_products_from_strapi(self):
-        try:
-            headers = {"Authorization": f"Bearer {STRAPI_API_TOKEN}"}
-            response = requests.get(
-                f"{STRAPI_URL}/api/products?populate=*", headers=headers, timeout=10
-            )
-            if response.status_code == 200:
-                strapi_products = response.json()["data"]
-                self.products = [
-                    self._transform_strapi_product(p) for p in strapi_products
-                ]
-            elif response.status_code == 404:
-                logging.warning(
-                    "Strapi 'products' endpoint not found (404). Falling back to dummy data."
-                )
-                self.products = self._dummy_products
-                yield rx.toast.warning(
-                    "Products endpoint not found. Please create 'Product' collection in Strapi.",
-                    duration=5000,
-                )
-            else:
-                logging.error(
-                    f"Failed to fetch products from Strapi. Status: {response.status_code}, Body: {response.text}"
-                )
-                self.products = self._dummy_products
-                yield rx.toast.error(
-                    f"Could not fetch products (Status: {response.status_code}).",
-                    duration=5000,
-                )
-        except requests.exceptions.RequestException as e:
-            logging.exception(f"Failed to fetch products from Strapi: {e}")
-            self.products = self._dummy_products
-            yield rx.toast.error(
-                "Network error while fetching products.", duration=5000
-            )
+    async def load_listing(self):
+        category_name = self.router.page.params.get("category_name")
+        self.selected_category = (
+            [category_slug(category_name)] if category_name else []
+        )
+        self.selected_occasion = []
+        self.selected_recipient = []
+        self.min_price = None
+        self.max_price = None
+        self.in_stock_only = False
+        self.listing_page = 1
+        await self._query_listing()
 
     @rx.event
-    def fetch_categories_from_strapi(self):
-        try:
-            headers = {"Authorization": f"Bearer {STRAPI_API_TOKEN}"}
-            response = requests.get(
-                f"{STRAPI_URL}/api/categories", headers=headers, timeout=10
-            )
-            if response.status_code == 200:
-                data = response.json().get("data", [])
-                self.categories_from_strapi = [
-                    cat.get("name", cat.get("attributes", {}).get("name"))
-                    for cat in data
-                ]
-            else:
-                logging.warning(
-                    f"Could not fetch categories (Status: {response.status_code}). Using fallback."
-                )
-                self.categories_from_strapi = self._dummy_categories
-        except requests.exceptions.RequestException as e:
-            logging.exception(f"Failed to fetch categories from Strapi: {e}")
-            self.categories_from_strapi = self._dummy_categories
-
-    def _transform_strapi_product(self, strapi_product: dict) -> Product:
-        attrs = strapi_product.get("attributes", strapi_product)
-        image_data = attrs.get("images", {}).get("data", [])
-        images = []
-        if image_data:
-            for img in image_data:
-                img_attrs = img.get("attributes", img)
-                url = img_attrs.get("url")
-                if url:
-                    images.append(
-                        f"{STRAPI_URL.rstrip('/')}{url}" if url.startswith("/") else url
-                    )
-        if not images:
-            images.append("/placeholder.svg")
-        return {
-            "id": strapi_product["id"],
-            "name": attrs.get("name", "N/A"),
-            "sku": attrs.get("sku", "N/A"),
-            "price": float(attrs.get("price", 0)),
-            "original_price": float(attrs.get("original_price"))
-            if attrs.get("original_price") is not None
-            else None,
-            "description": attrs.get("description", ""),
-            "images": images,
-            "category": attrs.get("category", "Uncategorized"),
-            "occasion": attrs.get("occasion", "General"),
-            "recipient": attrs.get("recipient", "For All"),
-            "stock": int(attrs.get("stock", 0)),
-            "rating": float(attrs.get("rating", 0.0)),
-            "num_reviews": int(attrs.get("num_reviews", 0)),
-        }
+    async def toggle_facet(self, facet: str, value: str):
+        if facet not in FACETS:
+            return
+        selected = getattr(self, f"selected_{facet}")
+        if value in selected:
+            selected.remove(value)
+        else:
+            selected.append(value)
+        self.listing_page = 1
+        await self._query_listing()
+
+    @rx.event
+    async def toggle_in_stock(self):
+        self.in_stock_only = not self.in_stock_only
+        self.listing_page = 1
+        await self._query_listing()
+
+    @rx.event
+    async def apply_price_range(self, form_data: dict):
+        min_price = form_data.get("min_price", "")
+        max_price = form_data.get("max_price", "")
+        self.min_price = float(min_price) if min_price else None
+        self.max_price = float(max_price) if max_price else None
+        self.listing_page = 1
+        await self._query_listing()
+
+    @rx.event
+    async def sort_listing(self, sort_by: str):
+        self.sort_by = sort_by
+        self.listing_page = 1
+        await self._query_listing()
+
+    @rx.event
+    async def next_page(self):
+        if not self.listing_next_cursor:
+            return
+        self.listing_page += 1
+        await self._query_listing(self.listing_next_cursor)
+
+    @rx.event
+    async def previous_page(self):
+        if self.listing_page > 1:
+            self.listing_page -= 1
+            await self._query_listing()
 
     @rx.var
     def featured_products(self) -> list[Product]:
-        return self.products[:4]
+        if not self.catalog_version:
+            return []
+        return catalog_cache.rankings.top_featured(4)
 
     @rx.var
     def best_selling_products(self) -> list[Product]:
-        if not self.products:
+        if not self.catalog_version:
             return []
-        return sorted(self.products, key=lambda p: p["num_reviews"], reverse=True)[:3]
+        return catalog_cache.rankings.top_selling(3)
 
     @rx.event
-    def create_product(self, form_data: dict):
-        if self.strapi_health != "ok":
+    async def create_product(self, form_data: dict):
+        if strapi.health != "ok":
             yield rx.toast.error("Strapi is not available. Cannot create product.")
             return
         payload = {
@@ -245,13 +575,14 @@ class ProductState(rx.State):
         if form_data.get("original_price"):
             payload["data"]["original_price"] = float(form_data["original_price"])
         try:
-            headers = {"Authorization": f"Bearer {STRAPI_API_TOKEN}"}
-            response = requests.post(
-                f"{STRAPI_URL}/api/products", json=payload, headers=headers, timeout=10
-            )
+            response = await strapi.post("/api/products", json=payload)
             if response.status_code in [200, 201]:
+                catalog_cache.add_product(
+                    _transform_strapi_product(response.json()["data"])
+                )
+                catalog_cache.invalidate()
+                self._apply_catalog(await catalog_cache.get())
                 yield rx.toast.success("Product created successfully in Strapi!")
-                yield ProductState.fetch_products_from_strapi
             else:
                 error_details = (
                     response.json().get("error", {}).get("message", "Unknown error")
@@ -260,7 +591,7 @@ class ProductState(rx.State):
                     f"Strapi error on product creation: {error_details} | Body: {response.text}"
                 )
                 yield rx.toast.error(f"Strapi error: {error_details}")
-        except requests.exceptions.RequestException as e:
+        except HTTPError as e:
             logging.exception(f"Failed to create product in Strapi: {e}")
             yield rx.toast.error(f"Network error: Failed to create product: {e}")
 
@@ -268,53 +599,39 @@ class ProductState(rx.State):
     def categories(self) -> list[str]:
         if self.strapi_health == "ok" and self.categories_from_strapi:
             return self.categories_from_strapi
-        if self.strapi_health != "ok" or not self.products:
-            return self._dummy_categories
-        unique_categories = sorted(list(set((p["category"] for p in self.products))))
-        return unique_categories if unique_categories else self._dummy_categories
+        if self.strapi_health != "ok" or not self.catalog_version:
+            return DUMMY_CATEGORIES
+        return catalog_cache.index.categories or DUMMY_CATEGORIES
 
     @rx.event
-    def get_product_details(self):
+    async def get_product_details(self):
         product_id_str = self.router.page.params.get("product_id", "")
         if not product_id_str.isdigit():
             self.selected_product = None
             return
         product_id = int(product_id_str)
-        if self.strapi_health == "ok":
+        product = (await catalog_cache.get())["index"].get(product_id)
+        if product is not None:
+            self.selected_product = product
+        elif strapi.available:
             try:
-                headers = {"Authorization": f"Bearer {STRAPI_API_TOKEN}"}
-                response = requests.get(
-                    f"{STRAPI_URL}/api/products/{product_id}?populate=*",
-                    headers=headers,
-                    timeout=10,
+                response = await strapi.get(
+                    f"/api/products/{product_id}", params=_product_params()
                 )
                 if response.status_code == 200:
-                    self.selected_product = self._transform_strapi_product(
+                    self.selected_product = _transform_strapi_product(
                         response.json()["data"]
                     )
                 else:
                     self.selected_product = None
                     yield rx.toast.error(f"Product with ID {product_id} not found.")
-            except requests.exceptions.RequestException as e:
+            except HTTPError as e:
                 logging.exception(f"Failed to get product details: {e}")
                 self.selected_product = None
                 yield rx.toast.error("Network error fetching product details.")
         else:
-            self.selected_product = next(
-                (p for p in self.products if p["id"] == product_id), None
-            )
+            self.selected_product = None
 
     @rx.var
     def current_category_name(self) -> str:
         return self.router.page.params.get("category_name", "all").replace("-", " ")
-
-    @rx.var
-    def products_in_category(self) -> list[Product]:
-        category_name = self.current_category_name
-        if category_name == "all":
-            return self.products
-        return [
-            p
-            for p in self.products
-            if p["category"].lower().replace(" ", "-") == category_name
-        ]
\ No newline at end of file
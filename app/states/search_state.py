@@ -0,0 +1,24 @@
+import reflex as rx
+from app.states.product_state import Product, catalog_cache
+
+SEARCH_MIN_QUERY_LENGTH = 2
+SEARCH_RESULT_LIMIT = 8
+
+
+class SearchState(rx.State):
+    search_query: str = ""
+    search_results: list[Product] = []
+
+    @rx.event
+    async def search(self, query: str):
+        self.search_query = query
+        if len(query.strip()) < SEARCH_MIN_QUERY_LENGTH:
+            self.search_results = []
+            return
+        snapshot = await catalog_cache.get()
+        self.search_results = snapshot["search"].search(query, k=SEARCH_RESULT_LIMIT)
+
+    @rx.event
+    def clear_search(self):
+        self.search_query = ""
+        self.search_results = []
@@ -0,0 +1,126 @@
+"""Run the hot-path benchmarks against local Strapi and Stripe stubs.
+
+    python -m benchmarks --sizes 100,10000 --output results.json
+    python -m benchmarks --baseline last-release.json --tolerance 1.25
+
+Each result is checked against the absolute p95 budgets in
+``benchmarks/thresholds.json``; with ``--baseline`` it must also stay
+within ``tolerance`` times the baseline's p50. Any regression makes the
+process exit with status 1.
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+from benchmarks.stubs import StrapiStub, StripeStub, stub_environment
+
+THRESHOLDS_PATH = os.path.join(os.path.dirname(__file__), "thresholds.json")
+
+
+def _configure_environment(strapi: StrapiStub, stripe: StripeStub, workdir: str):
+    os.environ.update(stub_environment(strapi, stripe, workdir))
+    os.environ.update(
+        {
+            # Refreshes are triggered explicitly by the catalog benchmarks.
+            "CATALOG_CACHE_TTL": "86400",
+            "CART_WRITE_DELAY": "0.05",
+        }
+    )
+
+
+def _key(result: dict) -> str:
+    return f"{result['name']}[{result['size']}]"
+
+
+def find_regressions(
+    results: list[dict],
+    thresholds: dict[str, float],
+    baseline: list[dict] | None,
+    tolerance: float,
+) -> list[str]:
+    regressions = []
+    for result in results:
+        key = _key(result)
+        budget = thresholds.get(key, thresholds.get(result["name"]))
+        if budget is not None and result["p95_ms"] > budget:
+            regressions.append(f"{key}: p95 {result['p95_ms']}ms > budget {budget}ms")
+    previous = {_key(result): result for result in baseline or []}
+    for result in results:
+        key = _key(result)
+        if key in previous and previous[key]["p50_ms"] > 0:
+            ratio = result["p50_ms"] / previous[key]["p50_ms"]
+            if ratio > tolerance:
+                regressions.append(
+                    f"{key}: p50 {result['p50_ms']}ms is {ratio:.2f}x "
+                    f"the baseline {previous[key]['p50_ms']}ms"
+                )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument(
+        "--sizes",
+        default="100,10000,100000",
+        help="comma-separated synthetic catalog sizes",
+    )
+    parser.add_argument("--output", help="write JSON results here (default: stdout)")
+    parser.add_argument("--thresholds", default=THRESHOLDS_PATH)
+    parser.add_argument("--baseline", help="earlier results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.25)
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="seconds of simulated network latency per stub request",
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    strapi = StrapiStub(latency=args.latency).start()
+    stripe = StripeStub(latency=args.latency).start()
+    with tempfile.TemporaryDirectory(prefix="dk-bench-") as workdir:
+        _configure_environment(strapi, stripe, workdir)
+        from benchmarks import suite
+
+        try:
+            results = asyncio.run(suite.run(strapi, sizes))
+        finally:
+            strapi.stop()
+            stripe.stop()
+
+    with open(args.thresholds) as f:
+        thresholds = json.load(f)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    regressions = find_regressions(results, thresholds, baseline, args.tolerance)
+    report = {
+        "created_at": datetime.datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sizes": sizes,
+        "results": results,
+        "regressions": regressions,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
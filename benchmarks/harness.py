@@ -0,0 +1,111 @@
+import inspect
+import statistics
+import time
+from typing import Any, Awaitable, Callable, TypedDict
+import reflex as rx
+from reflex.event import EventSpec
+
+
+class BenchmarkResult(TypedDict):
+    name: str
+    size: int | None
+    iterations: int
+    items_per_iteration: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+    items_per_sec: float
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def measure(
+    name: str,
+    fn: Callable[[], Awaitable[Any] | Any],
+    iterations: int,
+    size: int | None = None,
+    items_per_iteration: int = 1,
+    warmup: int = 1,
+) -> BenchmarkResult:
+    """Time ``fn`` ``iterations`` times after ``warmup`` untimed calls."""
+    for _ in range(warmup):
+        result = fn()
+        if inspect.isawaitable(result):
+            await result
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = fn()
+        if inspect.isawaitable(result):
+            await result
+        samples.append((time.perf_counter() - start) * 1000)
+    mean = statistics.fmean(samples)
+    return {
+        "name": name,
+        "size": size,
+        "iterations": iterations,
+        "items_per_iteration": items_per_iteration,
+        "mean_ms": round(mean, 4),
+        "p50_ms": round(percentile(samples, 0.5), 4),
+        "p95_ms": round(percentile(samples, 0.95), 4),
+        "max_ms": round(max(samples), 4),
+        "items_per_sec": round(items_per_iteration * 1000 / mean, 1) if mean else 0.0,
+    }
+
+
+async def call_handler(
+    state: rx.State, handler_name: str, *args, **kwargs
+) -> list[Any]:
+    """Run an event handler on ``state`` the way Reflex would.
+
+    Returns whatever the handler returned or yielded, so callers can follow
+    chained events with ``follow_chain``.
+    """
+    fn = type(state).event_handlers[handler_name].fn
+    result = fn(state, *args, **kwargs)
+    if inspect.isasyncgen(result):
+        return [event async for event in result]
+    if inspect.isgenerator(result):
+        return list(result)
+    if inspect.isawaitable(result):
+        result = await result
+    if result is None:
+        return []
+    return list(result) if isinstance(result, list) else [result]
+
+
+async def follow_chain(root: rx.State, events: list[Any]) -> int:
+    """Run chained state events (``yield OtherState.handler(...)``) in order.
+
+    Toasts, redirects and other client-side events are skipped. Returns
+    how many handlers ran.
+    """
+    ran = 0
+    queue = list(events)
+    while queue:
+        event = queue.pop(0)
+        if not isinstance(event, EventSpec):
+            continue
+        full_name = event.handler.state_full_name
+        state = next(
+            (s for s in _all_states(root) if s.get_full_name() == full_name), None
+        )
+        if state is None:
+            continue
+        kwargs = {
+            name._js_expr: getattr(value, "_var_value", None)
+            for name, value in event.args
+        }
+        queue.extend(await call_handler(state, event.handler.fn.__name__, **kwargs))
+        ran += 1
+    return ran
+
+
+def _all_states(state: rx.State):
+    yield state
+    for substate in state.substates.values():
+        yield from _all_states(substate)
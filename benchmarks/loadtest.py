@@ -0,0 +1,380 @@
+"""Replay concurrent shopper journeys against a local backend.
+
+    python -m benchmarks.loadtest --users 50 --journeys 3 --ramp-up 10
+
+Starts the Strapi and Stripe stubs, runs the app's backend in a separate
+process pointed at them, and has ``--users`` websocket shoppers each run
+``--journeys`` full journeys (landing page, category, product, add to cart,
+sign up, checkout and ``process_payment``). Reports per-event latency
+percentiles, state delta sizes and the server's CPU and memory use.
+
+Needs the asyncio Socket.IO client: ``pip install "python-socketio[asyncio_client]"``.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import datetime
+import importlib.util
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import TypedDict
+import httpx
+from benchmarks.harness import percentile
+from benchmarks.stubs import (
+    CATEGORIES,
+    StrapiStub,
+    StripeStub,
+    stub_environment,
+    synthetic_products,
+)
+
+SOCKETIO_CLIENT_AVAILABLE = importlib.util.find_spec("aiohttp") is not None
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVER_START_TIMEOUT = 120.0
+SAMPLE_INTERVAL = 0.5
+
+
+class EventStats(TypedDict):
+    event: str
+    count: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    mean_delta_bytes: int
+    max_delta_bytes: int
+
+
+class ServerUsage(TypedDict):
+    cpu_seconds: float
+    cpu_percent_mean: float
+    cpu_percent_max: float
+    rss_mb_max: float
+    rss_mb_end: float
+
+
+def _process_tree(pid: int) -> list[int]:
+    """``pid`` and its descendants, from /proc; granian serves from a child."""
+    parents: dict[int, list[int]] = defaultdict(list)
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        with contextlib.suppress(OSError):
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces; fields follow the ")".
+                fields = f.read().rpartition(")")[2].split()
+            parents[int(fields[1])].append(int(entry))
+    tree, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        tree.append(current)
+        stack.extend(parents.get(current, []))
+    return tree
+
+
+def _usage(pids: list[int]) -> tuple[float, int]:
+    """Total CPU seconds and resident bytes of ``pids``."""
+    ticks = os.sysconf("SC_CLK_TCK")
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    cpu, rss = 0.0, 0
+    for pid in pids:
+        with contextlib.suppress(OSError):
+            with open(f"/proc/{pid}/stat") as f:
+                fields = f.read().rpartition(")")[2].split()
+            # utime and stime are fields 14 and 15 of the full line.
+            cpu += (int(fields[11]) + int(fields[12])) / ticks
+            with open(f"/proc/{pid}/statm") as f:
+                rss += int(f.read().split()[1]) * page_size
+    return cpu, rss
+
+
+class ResourceSampler:
+    """Samples a process tree's CPU and memory while the load runs."""
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.samples: list[tuple[float, float, int]] = []
+        self._task: asyncio.Task | None = None
+
+    def _sample(self):
+        cpu, rss = _usage(_process_tree(self.pid))
+        self.samples.append((time.monotonic(), cpu, rss))
+
+    async def _run(self):
+        while True:
+            await asyncio.to_thread(self._sample)
+            await asyncio.sleep(SAMPLE_INTERVAL)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> ServerUsage | None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        await asyncio.to_thread(self._sample)
+        if len(self.samples) < 2:
+            return None
+        percents = [
+            (cpu - prev_cpu) * 100 / (at - prev_at)
+            for (prev_at, prev_cpu, _), (at, cpu, _) in zip(
+                self.samples, self.samples[1:]
+            )
+            if at > prev_at
+        ]
+        return {
+            "cpu_seconds": round(self.samples[-1][1] - self.samples[0][1], 2),
+            "cpu_percent_mean": round(statistics.fmean(percents), 1),
+            "cpu_percent_max": round(max(percents), 1),
+            "rss_mb_max": round(max(s[2] for s in self.samples) / 2**20, 1),
+            "rss_mb_end": round(self.samples[-1][2] / 2**20, 1),
+        }
+
+
+def start_server(port: int, env: dict, log_path: str) -> subprocess.Popen:
+    """Run the backend under granian without compiling the frontend."""
+    with open(log_path, "w") as log:
+        return subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "granian",
+                "--interface",
+                "asgi",
+                "--factory",
+                "--host",
+                "127.0.0.1",
+                "--port",
+                str(port),
+                "app.app:app",
+            ],
+            cwd=REPO_ROOT,
+            env=env,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+
+
+async def wait_for_server(url: str, server: subprocess.Popen):
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    async with httpx.AsyncClient(timeout=2) as client:
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise RuntimeError(f"Server exited with status {server.returncode}")
+            with contextlib.suppress(httpx.HTTPError):
+                if (await client.get(f"{url}/ping")).status_code == 200:
+                    return
+            await asyncio.sleep(0.5)
+    raise RuntimeError(f"Server did not answer {url}/ping in {SERVER_START_TIMEOUT}s")
+
+
+def summarize(timings: list[dict]) -> list[EventStats]:
+    by_event: dict[str, list[dict]] = defaultdict(list)
+    for timing in timings:
+        by_event[timing["event"]].append(timing)
+    stats = []
+    for event, samples in sorted(by_event.items()):
+        latencies = [sample["ms"] for sample in samples]
+        sizes = [sample["delta_bytes"] for sample in samples]
+        stats.append(
+            {
+                "event": event,
+                "count": len(samples),
+                "p50_ms": round(percentile(latencies, 0.5), 2),
+                "p95_ms": round(percentile(latencies, 0.95), 2),
+                "p99_ms": round(percentile(latencies, 0.99), 2),
+                "max_ms": round(max(latencies), 2),
+                "mean_delta_bytes": round(statistics.fmean(sizes)),
+                "max_delta_bytes": max(sizes),
+            }
+        )
+    return stats
+
+
+async def run_shoppers(
+    url: str,
+    users: int,
+    journeys: int,
+    ramp_up: float,
+    think_time: float,
+    catalog_size: int,
+    payment: str,
+) -> tuple[list[dict], list[str], int]:
+    from benchmarks.shopper import Shopper
+    from app.services.product_index import category_slug
+
+    categories = [category_slug(name) for name in CATEGORIES]
+    timings: list[dict] = []
+    errors: list[str] = []
+    completed = 0
+
+    async def shopper(number: int):
+        nonlocal completed
+        # Spread arrivals evenly across the ramp-up window.
+        await asyncio.sleep(ramp_up * number / max(users, 1))
+        for journey in range(journeys):
+            client = Shopper(url, think_time, seed=number * journeys + journey)
+            method = (
+                payment if payment != "mixed" else client.rng.choice(["stripe", "cod"])
+            )
+            try:
+                await client.connect()
+                await client.shop(catalog_size, categories, method)
+                completed += 1
+            except Exception as e:
+                errors.append(f"shopper {number}: {type(e).__name__}: {e}")
+            finally:
+                timings.extend(client.timings)
+                with contextlib.suppress(Exception):
+                    await client.disconnect()
+
+    await asyncio.gather(*(shopper(number) for number in range(users)))
+    return timings, errors, completed
+
+
+def _print_table(report: dict):
+    print(
+        f"{'event':48} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+        f"{'max ms':>9} {'delta B':>9}",
+        file=sys.stderr,
+    )
+    for row in report["events"]:
+        print(
+            f"{row['event']:48} {row['count']:>6} {row['p50_ms']:>9} "
+            f"{row['p95_ms']:>9} {row['p99_ms']:>9} {row['max_ms']:>9} "
+            f"{row['mean_delta_bytes']:>9}",
+            file=sys.stderr,
+        )
+    print(
+        f"journeys: {report['journeys_completed']} completed, "
+        f"{report['journeys_failed']} failed in {report['duration_s']}s; "
+        f"server: {json.dumps(report['server'])}",
+        file=sys.stderr,
+    )
+
+
+async def _main(args) -> dict:
+    strapi = StrapiStub(
+        synthetic_products(args.catalog_size), latency=args.latency
+    ).start()
+    stripe = StripeStub(latency=args.latency).start()
+    with tempfile.TemporaryDirectory(prefix="dk-load-") as workdir:
+        env = {
+            **os.environ,
+            **stub_environment(strapi, stripe, workdir),
+            # Serve the backend only; the frontend is never built.
+            "__REFLEX_SKIP_COMPILE": "true",
+            "REFLEX_WEB_WORKDIR": os.path.join(workdir, ".web"),
+            "REFLEX_STATES_WORKDIR": os.path.join(workdir, ".states"),
+        }
+        url = f"http://127.0.0.1:{args.port}"
+        log_path = os.path.join(workdir, "server.log")
+        server = start_server(args.port, env, log_path)
+        try:
+            try:
+                await wait_for_server(url, server)
+            except RuntimeError:
+                with open(log_path) as f:
+                    sys.stderr.write(f.read()[-4000:])
+                raise
+            sampler = ResourceSampler(server.pid)
+            sampler.start()
+            started = time.monotonic()
+            timings, errors, completed = await run_shoppers(
+                url,
+                args.users,
+                args.journeys,
+                args.ramp_up,
+                args.think_time,
+                args.catalog_size,
+                args.payment,
+            )
+            duration = time.monotonic() - started
+            usage = await sampler.stop()
+        finally:
+            server.terminate()
+            with contextlib.suppress(subprocess.TimeoutExpired):
+                server.wait(timeout=15)
+            if server.poll() is None:
+                server.kill()
+            strapi.stop()
+            stripe.stop()
+    return {
+        "created_at": datetime.datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "users": args.users,
+        "journeys_per_user": args.journeys,
+        "catalog_size": args.catalog_size,
+        "payment": args.payment,
+        "duration_s": round(duration, 2),
+        "journeys_completed": completed,
+        "journeys_failed": len(errors),
+        "events_per_sec": round(len(timings) / duration, 1) if duration else 0.0,
+        "events": summarize(timings),
+        "server": usage,
+        "strapi_requests": strapi.requests,
+        "stripe_requests": stripe.requests,
+        "orders_posted": len(strapi.orders),
+        "errors": errors[:50],
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadtest")
+    parser.add_argument("--users", type=int, default=20, help="concurrent shoppers")
+    parser.add_argument("--journeys", type=int, default=1, help="journeys per shopper")
+    parser.add_argument(
+        "--ramp-up", type=float, default=5.0, help="seconds over which shoppers arrive"
+    )
+    parser.add_argument(
+        "--think-time",
+        type=float,
+        default=0.5,
+        help="maximum random pause in seconds before each step",
+    )
+    parser.add_argument("--catalog-size", type=int, default=1000)
+    parser.add_argument(
+        "--payment", choices=["stripe", "cod", "mixed"], default="mixed"
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="seconds of simulated network latency per stub request",
+    )
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--output", help="write the JSON report here")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    if not SOCKETIO_CLIENT_AVAILABLE:
+        print(
+            "The load test needs aiohttp: "
+            'pip install "python-socketio[asyncio_client]"',
+            file=sys.stderr,
+        )
+        return 2
+    report = asyncio.run(_main(args))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    _print_table(report)
+    for error in report["errors"]:
+        print(f"ERROR {error}", file=sys.stderr)
+    return 1 if report["journeys_failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""A scripted shopper that talks to the Reflex backend the way a browser tab does.
+
+It connects to the ``/_event`` Socket.IO namespace with a client token,
+sends hydrate and ``on_load_internal`` on each navigation, sends chained
+events back as the frontend would, and keeps cookie-backed vars between
+navigations. Events run one at a time per shopper, like the browser's event
+queue, and each one is timed from send to its final state update.
+"""
+
+import asyncio
+import contextlib
+import json
+import random
+import time
+import uuid
+from typing import TypedDict
+import socketio
+from reflex.compiler.utils import compile_client_storage
+from reflex.event import EventHandler, get_hydrate_event
+from reflex.state import OnLoadInternalState, State, UpdateVarsInternalState
+from reflex.utils.format import format_event_handler
+from app.states.auth_state import AuthState
+from app.states.cart_state import CartState
+from app.states.payment_state import PaymentState
+
+EVENT_NAMESPACE = "/_event"
+EVENT_TIMEOUT = 30.0
+# Cookie vars as "<state full name>.<var>", the keys deltas arrive under.
+COOKIE_VARS = frozenset(compile_client_storage(State)["cookies"])
+
+
+class EventTiming(TypedDict):
+    event: str
+    ms: float
+    delta_bytes: int
+    updates: int
+
+
+class JourneyFailed(Exception):
+    pass
+
+
+def event_label(name: str) -> str:
+    """``reflex___state____state.app___states___cart_state____cart_state.add_to_cart``
+    becomes ``cart_state.add_to_cart``."""
+    state, _, handler = name.rpartition(".")
+    return f"{state.rpartition('____')[2]}.{handler}"
+
+
+class Shopper:
+    def __init__(self, base_url: str, think_time: float = 0.0, seed: int | None = None):
+        self.base_url = base_url
+        self.think_time = think_time
+        self.rng = random.Random(seed)
+        self.token = str(uuid.uuid4())
+        self.cookies: dict[str, str] = {}
+        self.timings: list[EventTiming] = []
+        self.redirects: list[str] = []
+        self._router_data: dict = {}
+        self._hydrated = False
+        self._updates: asyncio.Queue[dict] = asyncio.Queue()
+        self._sio = socketio.AsyncClient(reconnection=False)
+        self._sio.on("event", self._on_update, namespace=EVENT_NAMESPACE)
+        self._sio.on("reload", self._on_reload, namespace=EVENT_NAMESPACE)
+
+    async def connect(self):
+        await self._sio.connect(
+            f"{self.base_url}?token={self.token}",
+            socketio_path=EVENT_NAMESPACE,
+            transports=["websocket"],
+            namespaces=[EVENT_NAMESPACE],
+            wait_timeout=EVENT_TIMEOUT,
+        )
+        # Linking the token to this socket pushes a router delta unprompted.
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self._updates.get(), EVENT_TIMEOUT)
+
+    async def disconnect(self):
+        await self._sio.disconnect()
+
+    async def _on_update(self, update: dict):
+        for substate, fields in update.get("delta", {}).items():
+            for field, value in fields.items():
+                key = f"{substate}.{field}"
+                if key in COOKIE_VARS:
+                    if value:
+                        self.cookies[key] = value
+                    else:
+                        self.cookies.pop(key, None)
+        await self._updates.put(update)
+
+    async def _on_reload(self, event: dict):
+        # The server lost this tab's state; a browser would hydrate again.
+        await self._updates.put({"reload": True, "final": True})
+
+    async def _send(self, event: dict) -> list[dict]:
+        """Send one event and wait for its final update; returns chained events."""
+        # Anything already queued was pushed by the server, not a reply.
+        while not self._updates.empty():
+            self._updates.get_nowait()
+        started = time.perf_counter()
+        await self._sio.emit("event", event, namespace=EVENT_NAMESPACE)
+        chained, delta_bytes, updates = [], 0, 0
+        while True:
+            try:
+                update = await asyncio.wait_for(self._updates.get(), EVENT_TIMEOUT)
+            except asyncio.TimeoutError:
+                raise JourneyFailed(f"No response to {event_label(event['name'])}")
+            if update.get("reload"):
+                raise JourneyFailed(f"Server asked to reload on {event['name']}")
+            updates += 1
+            delta_bytes += len(json.dumps(update.get("delta", {})))
+            chained.extend(update.get("events") or [])
+            if update.get("final", True):
+                break
+        self.timings.append(
+            {
+                "event": event_label(event["name"]),
+                "ms": (time.perf_counter() - started) * 1000,
+                "delta_bytes": delta_bytes,
+                "updates": updates,
+            }
+        )
+        return chained
+
+    async def _run(self, events: list[dict]):
+        queue = list(events)
+        while queue:
+            event = queue.pop(0)
+            if event["name"].startswith("_"):
+                # Client-side events (toasts, redirects) never reach the server.
+                if event["name"] == "_redirect":
+                    self.redirects.append(event["payload"].get("path", ""))
+                continue
+            event = {
+                "name": event["name"],
+                "payload": event.get("payload") or {},
+                "router_data": event.get("router_data") or self._router_data,
+                "token": self.token,
+            }
+            queue.extend(await self._send(event))
+
+    async def _pause(self):
+        if self.think_time:
+            await asyncio.sleep(self.rng.uniform(0, self.think_time))
+
+    async def navigate(self, path: str, route: str | None = None, **params):
+        """Open ``path``; ``route`` and ``params`` fill in dynamic segments."""
+        await self._pause()
+        self._router_data = {
+            "pathname": route or path,
+            "query": params,
+            "asPath": path,
+        }
+        events = []
+        if not self._hydrated:
+            events.append({"name": get_hydrate_event(State)})
+            self._hydrated = True
+        if self.cookies:
+            events.append(
+                {
+                    "name": format_event_handler(
+                        UpdateVarsInternalState.update_vars_internal
+                    ),
+                    "payload": {"vars": dict(self.cookies)},
+                }
+            )
+        events.append(
+            {"name": format_event_handler(OnLoadInternalState.on_load_internal)}
+        )
+        await self._run(events)
+
+    async def dispatch(self, handler: EventHandler, **payload):
+        """Trigger ``handler`` as a click or form submit on the current page."""
+        await self._pause()
+        await self._run([{"name": format_event_handler(handler), "payload": payload}])
+
+    async def shop(self, catalog_size: int, categories: list[str], payment_method: str):
+        """Land, browse, add to cart, sign up and pay with ``payment_method``."""
+        product_id = self.rng.randint(1, catalog_size)
+        category = self.rng.choice(categories)
+        await self.navigate("/")
+        await self.navigate(
+            f"/category/{category}", "/category/[category_name]", category_name=category
+        )
+        await self.navigate(
+            f"/product/{product_id}",
+            "/product/[product_id]",
+            product_id=str(product_id),
+        )
+        await self.dispatch(CartState.add_to_cart, product_id=product_id)
+        # Sign up at checkout so the guest cart gets merged, as on the site.
+        email = f"shopper-{self.token}@example.com"
+        password = "load-test-password"
+        await self.navigate("/signup")
+        await self.dispatch(
+            AuthState.signup,
+            form_data={
+                "full_name": "Load Test Shopper",
+                "email": email,
+                "password": password,
+                "confirm_password": password,
+            },
+        )
+        await self.navigate("/checkout")
+        await self.dispatch(
+            PaymentState.update_shipping_address,
+            form_data={
+                "full_name": "Load Test Shopper",
+                "email": email,
+                "address": "1 Load Test Lane",
+                "city": "Pune",
+                "state": "MH",
+                "zip_code": "411001",
+                "phone": "9999999999",
+            },
+        )
+        await self.dispatch(PaymentState.set_payment_method, method=payment_method)
+        await self.dispatch(PaymentState.process_payment)
+        if "/account/orders" not in self.redirects:
+            raise JourneyFailed(
+                f"Checkout with {payment_method} did not place an order"
+            )
@@ -0,0 +1,194 @@
+"""Local stand-ins for Strapi and Stripe, served from background threads.
+
+Both speak just enough of the real APIs for the app's clients: paginated
+``/api/products`` and ``/api/categories`` reads, order and stock writes, and
+``/v1/payment_intents`` with idempotency keys. ``latency`` adds a fixed
+delay per request to mimic a network hop.
+"""
+
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+CATEGORIES = [
+    "Anniversary Gifts",
+    "Birthday Gifts",
+    "Wedding Gifts",
+    "Home Decor",
+    "Personalised",
+    "Jewellery",
+    "Hampers",
+    "Flowers",
+]
+OCCASIONS = ["Anniversary", "Birthday", "Wedding", "Festive", "General"]
+RECIPIENTS = ["For Her", "For Him", "For Couples", "For Kids", "For All"]
+WORDS = (
+    "gold silver rose heart knot charm lamp frame candle mug locket vase "
+    "bouquet hamper keepsake pendant bracelet photo engraved crystal"
+).split()
+
+
+def synthetic_products(count: int, seed: int = 7) -> list[dict]:
+    """``count`` products in Strapi's REST response shape."""
+    rng = random.Random(seed)
+    products = []
+    for product_id in range(1, count + 1):
+        price = round(rng.uniform(199, 9999), 2)
+        products.append(
+            {
+                "id": product_id,
+                "name": " ".join(rng.sample(WORDS, 3)).title(),
+                "sku": f"DK-{product_id:06d}",
+                "price": price,
+                "original_price": round(price * 1.2, 2) if rng.random() < 0.3 else None,
+                "description": " ".join(rng.choices(WORDS, k=20)),
+                "category": rng.choice(CATEGORIES),
+                "occasion": rng.choice(OCCASIONS),
+                "recipient": rng.choice(RECIPIENTS),
+                # Large enough that repeated checkouts never run out.
+                "stock": 1_000_000,
+                "rating": round(rng.uniform(3, 5), 1),
+                "num_reviews": rng.randint(0, 500),
+                "images": {
+                    "data": [
+                        {
+                            "id": product_id,
+                            "attributes": {"url": f"/uploads/p{product_id}.jpg"},
+                        }
+                    ]
+                },
+            }
+        )
+    return products
+
+
+class _StubServer:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.requests = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self):
+                stub.requests += 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                status, payload = stub.handle(
+                    self.command, self.path, self.headers, body
+                )
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PUT = _handle
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def handle(self, method, path, headers, body) -> tuple[int, dict]:
+        raise NotImplementedError
+
+
+class StrapiStub(_StubServer):
+    def __init__(self, products: list[dict] | None = None, latency: float = 0.0):
+        super().__init__(latency)
+        self.products = products or []
+        self.orders: list[dict] = []
+
+    def handle(self, method, path, headers, body):
+        url = urlparse(path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if method == "GET" and url.path == "/api/products":
+            page = int(query.get("pagination[page]", 1))
+            size = int(query.get("pagination[pageSize]", 25))
+            start = (page - 1) * size
+            return 200, {
+                "data": self.products[start : start + size],
+                "meta": {
+                    "pagination": {
+                        "page": page,
+                        "pageSize": size,
+                        "pageCount": max(1, -(-len(self.products) // size)),
+                        "total": len(self.products),
+                    }
+                },
+            }
+        if match := re.fullmatch(r"/api/products/(\d+)", url.path):
+            product_id = int(match.group(1))
+            if 0 < product_id <= len(self.products):
+                return 200, {"data": self.products[product_id - 1]}
+            return 404, {"error": {"status": 404}}
+        if method == "GET" and url.path == "/api/categories":
+            return 200, {"data": [{"name": name} for name in CATEGORIES]}
+        if url.path == "/api/orders":
+            if method == "POST":
+                order = json.loads(body)["data"]
+                self.orders.append(order)
+                return 200, {"data": {"id": len(self.orders), **order}}
+            return 200, {"data": []}
+        return 404, {"error": {"status": 404}}
+
+
+class StripeStub(_StubServer):
+    def __init__(self, latency: float = 0.0):
+        super().__init__(latency)
+        self.intents: dict[str, dict] = {}
+
+    def handle(self, method, path, headers, body):
+        if method == "POST" and urlparse(path).path == "/v1/payment_intents":
+            key = headers.get("Idempotency-Key") or str(len(self.intents))
+            if key not in self.intents:
+                number = len(self.intents) + 1
+                self.intents[key] = {
+                    "id": f"pi_bench_{number}",
+                    "object": "payment_intent",
+                    "client_secret": f"pi_bench_{number}_secret",
+                    "status": "requires_payment_method",
+                }
+            return 200, self.intents[key]
+        return 404, {"error": {"type": "invalid_request_error"}}
+
+
+def stub_environment(strapi: StrapiStub, stripe: StripeStub, workdir: str) -> dict:
+    """Settings that point the app at the stubs and keep its files in ``workdir``."""
+    return {
+        "STRAPI_URL": strapi.url,
+        "STRAPI_API_TOKEN": "bench-token",
+        "STRIPE_SECRET_KEY": "sk_test_bench",
+        "STRIPE_PUBLISHABLE_KEY": "pk_test_bench",
+        "STRIPE_API_BASE": stripe.url,
+        "STRIPE_MAX_NETWORK_RETRIES": "0",
+        "DATABASE_PATH": os.path.join(workdir, "bench.db"),
+        "CATALOG_SNAPSHOT_PATH": os.path.join(workdir, "catalog.snapshot"),
+        "SESSION_KEY_PATH": os.path.join(workdir, "session.key"),
+        "IMAGE_CACHE_DIR": os.path.join(workdir, "images"),
+    }
@@ -0,0 +1,177 @@
+"""The benchmark cases. Import only after ``__main__`` has pointed the app's
+environment at the stubs: app modules read their settings at import time.
+"""
+
+import random
+import reflex as rx
+from reflex.state import State
+from app.services.product_index import category_slug
+from app.services.user_store import EmailTaken, user_store
+from app.states.auth_state import AuthState
+from app.states.cart_state import CartState
+from app.states.payment_state import PaymentState
+from app.states.product_state import (
+    ProductState,
+    _transform_strapi_product,
+    catalog_cache,
+)
+from benchmarks.harness import BenchmarkResult, call_handler, follow_chain, measure
+from benchmarks.stubs import CATEGORIES, StrapiStub, synthetic_products
+
+BENCH_EMAIL = "bench@example.com"
+BENCH_PASSWORD = "bench-password"
+BENCH_ADDRESS = {
+    "full_name": "Bench Shopper",
+    "email": BENCH_EMAIL,
+    "address_line_1": "1 Benchmark Road",
+    "city": "Pune",
+    "state": "MH",
+    "postal_code": "411001",
+    "phone": "9999999999",
+}
+
+
+def _scaled(size: int, small: int, large: int) -> int:
+    """Fewer iterations for the big catalogs so a full run stays minutes long."""
+    return small if size <= 10_000 else large
+
+
+def _new_session() -> rx.State:
+    return State(_reflex_internal_init=True)
+
+
+async def _signed_in_session() -> rx.State:
+    root = _new_session()
+    try:
+        user = await user_store.create("Bench Shopper", BENCH_EMAIL, BENCH_PASSWORD)
+    except EmailTaken:
+        user = await user_store.authenticate(BENCH_EMAIL, BENCH_PASSWORD)
+    auth = await root.get_state(AuthState)
+    auth._start_session(user)
+    payment = await root.get_state(PaymentState)
+    payment.shipping_address = dict(BENCH_ADDRESS)
+    return root
+
+
+async def bench_catalog(strapi: StrapiStub, size: int) -> list[BenchmarkResult]:
+    raw = synthetic_products(size)
+    strapi.products = raw
+    results = [
+        await measure(
+            "transform_strapi_product",
+            lambda: [_transform_strapi_product(p) for p in raw],
+            iterations=_scaled(size, 10, 3),
+            size=size,
+            items_per_iteration=size,
+        ),
+        # Full fetch from the stub plus index, search and ranking builds.
+        await measure(
+            "catalog_refresh",
+            catalog_cache.refresh,
+            iterations=_scaled(size, 5, 1),
+            size=size,
+            items_per_iteration=size,
+            warmup=1,
+        ),
+    ]
+    product_state = await _new_session().get_state(ProductState)
+    product_state.selected_category = [category_slug(CATEGORIES[0])]
+    results.append(
+        await measure(
+            "category_listing",
+            product_state._query_listing,
+            iterations=_scaled(size, 50, 20),
+            size=size,
+        )
+    )
+    featured = ProductState.computed_vars["featured_products"].fget
+    best_selling = ProductState.computed_vars["best_selling_products"].fget
+    results.append(
+        await measure(
+            "featured_products",
+            lambda: featured(product_state),
+            iterations=200,
+            size=size,
+        )
+    )
+    product_ids = [p["id"] for p in raw]
+
+    def sale_then_best_selling():
+        # A sale moves one product in the ranking, then the var recomputes.
+        catalog_cache.record_sale({random.choice(product_ids): 1})
+        return best_selling(product_state)
+
+    results.append(
+        await measure(
+            "best_selling_products",
+            sale_then_best_selling,
+            iterations=200,
+            size=size,
+        )
+    )
+    return results
+
+
+async def bench_cart(size: int) -> list[BenchmarkResult]:
+    root = await _signed_in_session()
+    cart = await root.get_state(CartState)
+    payment = await root.get_state(PaymentState)
+    rng = random.Random(size)
+
+    async def add_random_product():
+        await call_handler(cart, "add_to_cart", rng.randint(1, size))
+
+    results = [
+        await measure(
+            "add_to_cart", add_random_product, iterations=200, size=size, warmup=5
+        )
+    ]
+    quote = PaymentState.computed_vars["quote"].fget
+
+    async def requote():
+        # Alternate payment methods so both cache entries stay exercised.
+        payment.selected_payment_method = (
+            "cod" if payment.selected_payment_method == "stripe" else "stripe"
+        )
+        return await quote(payment)
+
+    results.append(
+        await measure(
+            "checkout_quote",
+            requote,
+            iterations=500,
+            size=size,
+            items_per_iteration=len(cart.items),
+        )
+    )
+    return results
+
+
+async def bench_checkout(size: int) -> list[BenchmarkResult]:
+    root = await _signed_in_session()
+    cart = await root.get_state(CartState)
+    payment = await root.get_state(PaymentState)
+    rng = random.Random(size)
+
+    async def place_order():
+        for _ in range(3):
+            await call_handler(cart, "add_to_cart", rng.randint(1, size))
+        payment.selected_payment_method = rng.choice(["stripe", "cod"])
+        events = await call_handler(payment, "process_payment")
+        if await follow_chain(root, events) != 1 or cart.items:
+            raise RuntimeError(f"Checkout did not complete: {payment.payment_error}")
+
+    return [
+        await measure(
+            "create_order_e2e", place_order, iterations=_scaled(size, 50, 20), size=size
+        )
+    ]
+
+
+async def run(strapi: StrapiStub, sizes: list[int]) -> list[BenchmarkResult]:
+    results = []
+    for size in sizes:
+        results.extend(await bench_catalog(strapi, size))
+        results.extend(await bench_cart(size))
+        results.extend(await bench_checkout(size))
+    return results
@@ -0,0 +1,43 @@
+import pytest
+from app.services import (
+    account_store,
+    cart_store,
+    order_outbox,
+    order_store,
+    sales_metrics,
+    user_store,
+)
+from app.services.db import Database
+from app.states import product_state
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """A fresh SQLite database in place of the app's shared one."""
+    database = Database(str(tmp_path / "test.db"))
+    for module in (
+        account_store,
+        cart_store,
+        order_outbox,
+        order_store,
+        sales_metrics,
+        user_store,
+    ):
+        monkeypatch.setattr(module, "db", database)
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def saved_catalog(monkeypatch):
+    """Keeps the catalog snapshot in memory instead of under data/."""
+    saved = {}
+
+    def write(products, categories):
+        saved["catalog"] = (products, categories)
+
+    monkeypatch.setattr(
+        product_state, "read_catalog_snapshot", lambda: saved.get("catalog")
+    )
+    monkeypatch.setattr(product_state, "write_catalog_snapshot", write)
+    return saved
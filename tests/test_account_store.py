@@ -0,0 +1,58 @@
+import asyncio
+from app.services.account_store import AccountStore
+
+
+def address(city: str) -> dict:
+    return {
+        "full_name": "Asha Rao",
+        "phone": "9800000000",
+        "address_line_1": "12 MG Road",
+        "city": city,
+        "state": "Karnataka",
+        "postal_code": "560001",
+    }
+
+
+def test_wishlist_adds_once_and_removes(db):
+    store = AccountStore()
+
+    async def scenario():
+        await store.add_to_wishlist(1, 10)
+        await store.add_to_wishlist(1, 10)
+        await store.add_to_wishlist(2, 11)
+        await store.remove_from_wishlist(1, 99)
+        return await store.wishlist(1), await store.wishlist(2)
+
+    assert asyncio.run(scenario()) == ([10], [11])
+
+
+def test_one_default_address_per_user(db):
+    store = AccountStore()
+
+    async def scenario():
+        first = await store.save_address(1, address("Pune"))
+        second = await store.save_address(1, address("Goa"))
+        await store.save_address(2, address("Delhi"))
+        assert (await store.default_address(1))["id"] == first
+        await store.set_default_address(1, second)
+        listed = await store.addresses(1)
+        assert [(a["city"], a["is_default"]) for a in listed] == [
+            ("Goa", True),
+            ("Pune", False),
+        ]
+        await store.delete_address(1, second)
+        return await store.addresses(1)
+
+    assert [(a["city"], a["is_default"]) for a in asyncio.run(scenario())] == [
+        ("Pune", True)
+    ]
+
+
+def test_checkout_address_is_remembered_only_once(db):
+    store = AccountStore()
+    store.ensure_schema()
+    for city in ("Pune", "Goa"):
+        db.call(lambda conn: store.remember_address(conn, 1, address(city)))
+    db.call(lambda conn: store.remember_address(conn, 2, {"city": "Delhi"}))
+    assert [a["city"] for a in asyncio.run(store.addresses(1))] == ["Pune"]
+    assert asyncio.run(store.addresses(2)) == []
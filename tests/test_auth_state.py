@@ -0,0 +1,56 @@
+import asyncio
+import pytest
+import reflex as rx
+from app.services import session_tokens
+from app.services.session_tokens import issue_token
+from app.services.user_store import user_store
+from app.states.account_state import AccountState
+from app.states.auth_state import AuthState
+
+
+@pytest.fixture(autouse=True)
+def secret(monkeypatch):
+    monkeypatch.setattr(session_tokens, "_secret", b"test-secret")
+    session_tokens._decode.cache_clear()
+
+
+def substate(root: rx.State, cls: type[rx.State]) -> rx.State:
+    return root.get_substate(cls.get_full_name().split(".")[1:])
+
+
+def run(state: rx.State, name: str):
+    handler = type(state).event_handlers[name]
+
+    async def process():
+        async for _ in state._process_event(handler, state, {}):
+            pass
+
+    asyncio.run(process())
+
+
+def test_session_keeps_only_id_and_role_and_loads_profile_on_demand(db):
+    user = asyncio.run(user_store.create("Asha", "asha@example.com", "s3cret"))
+    root = rx.State(_reflex_internal_init=True)
+    auth = substate(root, AuthState)
+    auth.session_token = issue_token(user["id"], "customer")
+    run(auth, "restore_session")
+    assert (auth.user_id, auth.user_role) == (user["id"], "customer")
+    assert auth.is_authenticated and not auth.is_admin
+    assert "asha@example.com" not in str(auth.dict())
+
+    account = substate(root, AccountState)
+    run(account, "load_profile")
+    assert account.profile["email"] == "asha@example.com"
+    run(auth, "logout")
+    run(account, "load_profile")
+    assert account.profile is None
+
+
+def test_session_for_a_deleted_account_is_ended(db):
+    root = rx.State(_reflex_internal_init=True)
+    auth = substate(root, AuthState)
+    auth.session_token = issue_token(999, "admin")
+    run(auth, "restore_session")
+    assert auth.user_id is None
+    assert not auth.is_admin
+    assert auth.session_token == ""
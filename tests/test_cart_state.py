@@ -0,0 +1,68 @@
+import asyncio
+import pytest
+import reflex as rx
+from app.services.cart_store import cart_store
+from app.states import cart_state
+# Registers AuthState, which CartState reads the session from.
+from app.states.auth_state import AuthState  # noqa: F401
+from app.states.cart_state import CartState
+
+
+class FakeCatalog:
+    index = {1: {"id": 1, "name": "Rose Lamp", "price": 500.0}}
+
+    async def get(self) -> dict:
+        return {"index": self.index}
+
+
+class FakeInventory:
+    def reserve(self, holder: str, quantities: dict[int, int]):
+        pass
+
+
+@pytest.fixture
+def saved(monkeypatch):
+    saved = []
+
+    async def load(key: str) -> dict:
+        return {}
+
+    monkeypatch.setattr(cart_state, "catalog_cache", FakeCatalog())
+    monkeypatch.setattr(cart_state, "inventory", FakeInventory())
+    monkeypatch.setattr(cart_store, "load", load)
+    monkeypatch.setattr(cart_store, "save", lambda key, items: saved.append(items))
+    return saved
+
+
+def add(state: CartState, product_id: int) -> list:
+    handler = CartState.event_handlers["add_to_cart"]
+
+    async def process():
+        return [
+            update.events
+            async for update in state._process_event(
+                handler, state, {"product_id": product_id}
+            )
+        ]
+
+    return asyncio.run(process())
+
+
+def cart() -> CartState:
+    root = rx.State(_reflex_internal_init=True)
+    return root.get_substate(CartState.get_full_name().split(".")[1:])
+
+
+def test_known_product_is_added_and_saved(saved):
+    state = cart()
+    add(state, 1)
+    assert state.items[1]["name"] == "Rose Lamp"
+    assert saved == [{1: state.items[1]}]
+
+
+def test_unknown_product_is_not_saved(saved):
+    state = cart()
+    updates = add(state, 99)
+    assert state.items == {}
+    assert saved == []
+    assert "no longer available" in str(updates)
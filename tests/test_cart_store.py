@@ -0,0 +1,125 @@
+import asyncio
+import sqlite3
+from app.services.cart_store import CartStore, merge_carts
+
+
+def line(product_id: int, quantity: int) -> dict:
+    return {
+        "product_id": product_id,
+        "quantity": quantity,
+        "price": 100.0,
+        "name": f"Product {product_id}",
+    }
+
+
+def saved(db, key: str) -> str | None:
+    row = db.call(
+        lambda conn: conn.execute(
+            "SELECT items FROM carts WHERE cart_key = ?", (key,)
+        ).fetchone()
+    )
+    return row["items"] if row else None
+
+
+def test_merge_keeps_larger_quantity():
+    merged = merge_carts({1: line(1, 2), 2: line(2, 1)}, {1: line(1, 3), 3: line(3, 1)})
+    assert {pid: l["quantity"] for pid, l in merged.items()} == {1: 3, 2: 1, 3: 1}
+
+
+def test_saves_are_coalesced_and_loaded_back(db):
+    async def scenario():
+        store = CartStore(delay=0.01)
+        for quantity in range(1, 5):
+            store.save("user:1", {1: line(1, quantity)})
+        assert (await store.load("user:1"))[1]["quantity"] == 4
+        await store._flush_task
+        return await CartStore().load("user:1")
+
+    assert asyncio.run(scenario())[1]["quantity"] == 4
+
+
+def test_emptied_cart_is_deleted(db):
+    async def scenario():
+        store = CartStore(delay=0)
+        store.save("user:1", {1: line(1, 1)})
+        await store.flush()
+        store.delete("user:1")
+        await store.flush()
+
+    asyncio.run(scenario())
+    assert saved(db, "user:1") is None
+
+
+def test_only_stale_guest_carts_are_purged(db):
+    async def scenario():
+        store = CartStore(delay=0)
+        for key in ("anon:old", "anon:new", "user:1"):
+            store.save(key, {1: line(1, 1)})
+        await store.flush()
+        db.call(
+            lambda conn: conn.execute(
+                "UPDATE carts SET updated_at = 0 WHERE cart_key != 'anon:new'"
+            )
+        )
+        return await store.purge_guest_carts(max_age=60)
+
+    assert asyncio.run(scenario()) == 1
+    assert saved(db, "anon:old") is None
+    assert saved(db, "anon:new") is not None
+    assert saved(db, "user:1") is not None
+
+
+def test_save_during_write_is_flushed(db, monkeypatch):
+    store = CartStore(delay=0.01)
+    real_run = db.run
+
+    async def slow_run(fn):
+        # A save that lands while the first batch is being written.
+        store.save("user:2", {2: line(2, 1)})
+        monkeypatch.setattr(db, "run", real_run)
+        return await real_run(fn)
+
+    async def scenario():
+        store.save("user:1", {1: line(1, 1)})
+        monkeypatch.setattr(db, "run", slow_run)
+        await store._flush_task
+
+    asyncio.run(scenario())
+    assert saved(db, "user:1") is not None
+    assert saved(db, "user:2") is not None
+
+
+def test_failed_write_is_retried(db, monkeypatch):
+    store = CartStore(delay=0.01)
+    real_run = db.run
+
+    async def failing_run(fn):
+        monkeypatch.setattr(db, "run", real_run)
+        raise sqlite3.OperationalError("database is locked")
+
+    async def scenario():
+        monkeypatch.setattr(db, "run", failing_run)
+        store.save("user:1", {1: line(1, 1)})
+        await store._flush_task
+
+    asyncio.run(scenario())
+    assert saved(db, "user:1") is not None
+
+
+def test_load_sees_cart_being_written(db, monkeypatch):
+    store = CartStore(delay=0.01)
+    real_run = db.run
+    seen = {}
+
+    async def observing_run(fn):
+        monkeypatch.setattr(db, "run", real_run)
+        seen.update(await store.load("user:1"))
+        return await real_run(fn)
+
+    async def scenario():
+        store.save("user:1", {1: line(1, 5)})
+        monkeypatch.setattr(db, "run", observing_run)
+        await store.flush()
+
+    asyncio.run(scenario())
+    assert seen[1]["quantity"] == 5
@@ -0,0 +1,140 @@
+import asyncio
+import pytest
+from app.services.inventory import Inventory
+from app.states import product_state
+from app.states.product_state import DUMMY_PRODUCTS, CatalogCache
+
+pytestmark = pytest.mark.usefixtures("db", "saved_catalog")
+
+
+@pytest.fixture(autouse=True)
+def inventory(monkeypatch):
+    inventory = Inventory(stripes=4)
+    monkeypatch.setattr(product_state, "inventory", inventory)
+    return inventory
+
+
+def snapshot(*names: str, health: str = "ok") -> dict:
+    return {
+        "health": health,
+        "products": [
+            {**DUMMY_PRODUCTS[0], "id": i, "name": name}
+            for i, name in enumerate(names, 1)
+        ],
+        "categories": [],
+        "error": None if health == "ok" else "Strapi is down",
+    }
+
+
+class Loader:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        result = self.results.pop(0) if len(self.results) > 1 else self.results[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def test_cold_start_fetches_once_for_concurrent_readers():
+    loader = Loader(snapshot("Rose"))
+    cache = CatalogCache(loader, ttl=60)
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get() for _ in range(8)))
+
+    results = asyncio.run(scenario())
+    assert loader.calls == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_stale_catalog_is_served_while_refreshing():
+    loader = Loader(snapshot("Rose"), snapshot("Tulip"))
+    cache = CatalogCache(loader, ttl=0)
+
+    async def scenario():
+        first = await cache.get()
+        assert await cache.get() is first
+        await cache._refresh_task
+        return await cache.get()
+
+    assert asyncio.run(scenario())["products"][0]["name"] == "Tulip"
+
+
+def test_failed_refresh_keeps_last_good_catalog():
+    loader = Loader(snapshot("Rose"), RuntimeError("down"))
+    cache = CatalogCache(loader, ttl=60)
+
+    async def scenario():
+        await cache.get()
+        return await cache.refresh()
+
+    refreshed = asyncio.run(scenario())
+    assert refreshed["health"] == "error"
+    assert refreshed["products"][0]["name"] == "Rose"
+
+
+def test_invalidate_refreshes_on_next_read():
+    loader = Loader(snapshot("Rose"), snapshot("Tulip"))
+    cache = CatalogCache(loader, ttl=60)
+
+    async def scenario():
+        await cache.get()
+        cache.invalidate()
+        await cache.get()
+        await cache._refresh_task
+        return await cache.get()
+
+    assert asyncio.run(scenario())["products"][0]["name"] == "Tulip"
+    assert loader.calls == 2
+    assert cache.version == 2
+    assert cache.index.get(1)["name"] == "Tulip"
+
+
+def test_fresh_install_falls_back_to_dummy_products():
+    cache = CatalogCache(Loader(snapshot(health="error")), ttl=60)
+    served = asyncio.run(cache.get())
+    assert served["products"] is DUMMY_PRODUCTS
+    assert cache.index.get(DUMMY_PRODUCTS[0]["id"]) is DUMMY_PRODUCTS[0]
+
+
+def test_good_catalog_is_saved_and_served_after_a_restart(saved_catalog):
+    asyncio.run(CatalogCache(Loader(snapshot("Rose")), ttl=60).get())
+    assert saved_catalog["catalog"][0][0]["name"] == "Rose"
+    restarted = CatalogCache(Loader(snapshot(health="error")), ttl=60)
+    served = asyncio.run(restarted.get())
+    assert served["products"][0]["name"] == "Rose"
+    assert "last saved catalog" in served["error"]
+
+
+def test_unreadable_saved_catalog_falls_back_to_dummy_data(monkeypatch):
+    def broken():
+        raise ValueError("corrupt")
+
+    monkeypatch.setattr(product_state, "read_catalog_snapshot", broken)
+    cache = CatalogCache(Loader(snapshot(health="error")), ttl=60)
+    assert asyncio.run(cache.get())["products"] is DUMMY_PRODUCTS
+
+
+def test_empty_catalog_from_healthy_strapi_is_served(saved_catalog):
+    asyncio.run(CatalogCache(Loader(snapshot("Rose")), ttl=60).get())
+    cache = CatalogCache(Loader(snapshot()), ttl=60)
+    assert asyncio.run(cache.get())["products"] == []
+    assert saved_catalog["catalog"] == ([], [])
+
+
+def test_saved_catalog_only_seeds_unknown_stock(saved_catalog, inventory):
+    saved_catalog["catalog"] = (
+        [{**DUMMY_PRODUCTS[0], "id": 1, "stock": 9}, {**DUMMY_PRODUCTS[0], "id": 2}],
+        ["Saved"],
+    )
+    inventory.on_hand[1] = 3
+    cache = CatalogCache(Loader(snapshot(health="error")), ttl=60)
+    served = asyncio.run(cache.get())
+    assert [p["id"] for p in served["products"]] == [1, 2]
+    assert served["categories"] == ["Saved"]
+    assert inventory.on_hand == {1: 3, 2: DUMMY_PRODUCTS[0]["stock"]}
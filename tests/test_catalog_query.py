@@ -0,0 +1,103 @@
+import random
+import pytest
+from app.services.catalog_query import query_products
+from app.services.product_index import ProductIndex, category_slug
+from app.states.product_state import DUMMY_PRODUCTS
+
+VERSION = 3
+
+
+def catalog(count: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            **DUMMY_PRODUCTS[0],
+            "id": product_id,
+            "price": round(rng.uniform(199, 4999), 2),
+            "category": rng.choice(["Hampers", "Home Decor", "Jewellery"]),
+            "occasion": rng.choice(["Anniversary", "Birthday", "Wedding"]),
+            "recipient": rng.choice(["For Her", "For Him", "For All"]),
+            "stock": rng.choice([0, 3, 12]),
+            "rating": round(rng.uniform(3, 5), 1),
+        }
+        for product_id in range(1, count + 1)
+    ]
+
+
+PRODUCTS = catalog(200)
+
+
+def query(**overrides) -> dict:
+    return {
+        "category": [],
+        "occasion": [],
+        "recipient": [],
+        "min_price": None,
+        "max_price": None,
+        "in_stock": False,
+        "sort": "featured",
+        "page": 1,
+        "page_size": 24,
+        "cursor": "",
+        **overrides,
+    }
+
+
+def all_ids(**filters) -> list[int]:
+    result = query_products(
+        ProductIndex(PRODUCTS), VERSION, query(page_size=len(PRODUCTS), **filters)
+    )
+    return [p["id"] for p in result["products"]]
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"sort": "price_asc"},
+        {"category": [category_slug("Hampers")], "sort": "rating"},
+        {"occasion": ["Birthday", "Wedding"], "min_price": 1000.0},
+    ],
+)
+def test_cursor_pages_match_offset_pages(filters):
+    index = ProductIndex(PRODUCTS)
+    first = query_products(index, VERSION, query(**filters))
+    cursor_ids, cursor = [], ""
+    for number in range(1, first["page_count"] + 1):
+        by_cursor = query_products(
+            index, VERSION, query(page=number, cursor=cursor, **filters)
+        )
+        by_offset = query_products(index, VERSION, query(page=number, **filters))
+        assert by_cursor["products"] == by_offset["products"]
+        cursor_ids += [p["id"] for p in by_cursor["products"]]
+        cursor = by_cursor["next_cursor"]
+    assert cursor == ""
+    assert len(cursor_ids) == len(set(cursor_ids)) == first["total"]
+    assert cursor_ids == all_ids(**filters)
+
+
+def test_stale_cursor_falls_back_to_offset():
+    index = ProductIndex(PRODUCTS)
+    second = query_products(index, VERSION, query(page=2))
+    stale = query_products(index, VERSION + 1, query(page=2, cursor=f"{VERSION}:0"))
+    assert stale["products"] == second["products"]
+
+
+def test_filters_and_facet_counts():
+    index = ProductIndex(PRODUCTS)
+    result = query_products(
+        index, VERSION, query(occasion=["Birthday"], in_stock=True, max_price=2000.0)
+    )
+    expected = [
+        p
+        for p in PRODUCTS
+        if p["occasion"] == "Birthday" and p["stock"] > 0 and p["price"] <= 2000
+    ]
+    assert result["total"] == len(expected)
+    # Occasion counts ignore the occasion filter itself but honour the rest.
+    counts = {f["value"]: f["count"] for f in result["facets"]["occasion"]}
+    assert counts["Wedding"] == sum(
+        1
+        for p in PRODUCTS
+        if p["occasion"] == "Wedding" and p["stock"] > 0 and p["price"] <= 2000
+    )
@@ -0,0 +1,86 @@
+import pytest
+from app.services.catalog_snapshot import (
+    CatalogSnapshotFile,
+    read_catalog_snapshot,
+    write_catalog_snapshot,
+)
+
+
+def product(product_id: int, **fields) -> dict:
+    return {
+        "id": product_id,
+        "name": f"Rose Lamp {product_id}",
+        "sku": f"DK-{product_id:06d}",
+        "price": 499.5,
+        "original_price": None,
+        "description": "Hand-made, with a ribbon ✨",
+        "images": ["/uploads/a.jpg", "/uploads/b.jpg"],
+        "category": "Home Decor",
+        "occasion": "Birthday",
+        "recipient": "For Her",
+        "stock": 7,
+        "rating": 4.5,
+        "num_reviews": 12,
+        **fields,
+    }
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "catalog.snapshot")
+
+
+def test_round_trip(path):
+    products = [
+        product(1),
+        product(2, original_price=599.0, images=["/placeholder.svg"]),
+        product(3, stock=0),
+    ]
+    write_catalog_snapshot(products, ["Home Decor", "Hampers"], path)
+    assert read_catalog_snapshot(path) == (products, ["Home Decor", "Hampers"])
+
+
+def test_empty_catalog_round_trip(path):
+    write_catalog_snapshot([], ["Hampers"], path)
+    assert read_catalog_snapshot(path) == ([], ["Hampers"])
+
+
+def test_missing_file(path):
+    assert read_catalog_snapshot(path) is None
+
+
+def test_truncated_file_is_ignored(path):
+    write_catalog_snapshot([product(1), product(2)], ["Hampers"], path)
+    with open(path, "rb") as f:
+        data = f.read()
+    for size in (4, 40, len(data) // 2, len(data) - 3):
+        with open(path, "wb") as f:
+            f.write(data[:size])
+        assert read_catalog_snapshot(path) is None
+
+
+def test_corrupt_strings_are_ignored(path):
+    write_catalog_snapshot([product(1)], ["Hampers"], path)
+    snapshot = CatalogSnapshotFile(path)
+    _, offset, _ = snapshot._columns["name"]
+    snapshot.close()
+    with open(path, "r+b") as f:
+        f.seek(offset)
+        f.write(b"\xff\xfe")
+    assert read_catalog_snapshot(path) is None
+
+
+def test_short_column_is_rejected(path):
+    write_catalog_snapshot([product(1), product(2)], [], path)
+    snapshot = CatalogSnapshotFile(path)
+    snapshot.row_count = 3
+    with pytest.raises(ValueError):
+        snapshot.products()
+    snapshot.close()
+
+
+def test_other_files_are_ignored(path):
+    for data in (b"DKC", b"not a catalog snapshot at all, just some text"):
+        with open(path, "wb") as f:
+            f.write(data)
+        assert read_catalog_snapshot(path) is None
@@ -0,0 +1,60 @@
+import asyncio
+import sqlite3
+from app.services.account_store import account_store
+from app.services.order_store import order_store
+from app.states import payment_state
+from app.states.payment_state import _save_order
+
+
+def order(order_id: str) -> dict:
+    return {
+        "id": order_id,
+        "user_email": "shopper@example.com",
+        "items": [{"product_id": 1, "quantity": 2, "price": 500.0, "name": "Lamp"}],
+        "subtotal": 1000.0,
+        "shipping_cost": 0.0,
+        "cod_advance": None,
+        "cod_remaining": None,
+        "total_amount": 1000.0,
+        "payment_method": {"type": "stripe", "card_last4": None, "brand": None},
+        "shipping_address": {},
+        "status": "confirmed",
+        "payment_status": "paid",
+        "created_at": "2026-01-01T10:00:00",
+        "stripe_payment_intent_id": None,
+    }
+
+
+def test_order_id_clash_draws_a_new_id(db):
+    asyncio.run(order_store.save(order("DK00000001")))
+    clashing = order("DK00000001")
+    assert asyncio.run(_save_order(clashing, 1))
+    assert clashing["id"] != "DK00000001"
+    assert asyncio.run(order_store.get(clashing["id"])) is not None
+
+
+def test_repeated_clashes_give_up(db, monkeypatch):
+    asyncio.run(order_store.save(order("DK00000001")))
+    monkeypatch.setattr(payment_state, "_new_order_id", lambda: "DK00000001")
+    assert not asyncio.run(_save_order(order("DK00000001"), 1))
+
+
+def test_shipping_address_is_remembered_with_the_order(db):
+    placed = order("DK00000001")
+    placed["shipping_address"] = {
+        "full_name": "Asha Rao",
+        "address_line_1": "12 MG Road",
+    }
+    assert asyncio.run(_save_order(placed, 1))
+    assert [a["address_line_1"] for a in asyncio.run(account_store.addresses(1))] == [
+        "12 MG Road"
+    ]
+
+
+def test_failed_address_write_rolls_back_the_order(db, monkeypatch):
+    def fail(conn, user_id, address):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    monkeypatch.setattr(account_store, "remember_address", fail)
+    assert not asyncio.run(_save_order(order("DK00000001"), 1))
+    assert asyncio.run(order_store.get("DK00000001")) is None
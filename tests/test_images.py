@@ -0,0 +1,153 @@
+import asyncio
+import io
+import os
+from urllib.parse import quote
+import httpx
+import pytest
+import reflex as rx
+from PIL import Image
+from starlette.applications import Starlette
+from app.components.responsive_image import responsive_image
+from app.services import images
+from app.services.images import DerivativeCache, image_routes
+
+SRC = "https://cms.example.com/uploads/a.png"
+
+
+def png(width: int, height: int) -> bytes:
+    out = io.BytesIO()
+    Image.new("RGB", (width, height), "red").save(out, "PNG")
+    return out.getvalue()
+
+
+class Body(httpx.AsyncByteStream):
+    """Counts how much of a response body the client pulled."""
+
+    def __init__(self, chunks: int, chunk_size: int):
+        self.chunks = chunks
+        self.chunk_size = chunk_size
+        self.sent = 0
+
+    async def __aiter__(self):
+        for _ in range(self.chunks):
+            self.sent += self.chunk_size
+            yield b"x" * self.chunk_size
+
+
+def cache_with(
+    tmp_path,
+    body: bytes | Body,
+    headers: dict | None = None,
+    fetched: list | None = None,
+) -> DerivativeCache:
+    def respond(request: httpx.Request) -> httpx.Response:
+        if fetched is not None:
+            fetched.append(str(request.url))
+        if isinstance(body, Body):
+            return httpx.Response(200, headers=headers, stream=body)
+        return httpx.Response(200, headers=headers, content=body)
+
+    cache = DerivativeCache(str(tmp_path), max_bytes=2**30)
+    cache._client = httpx.AsyncClient(transport=httpx.MockTransport(respond))
+    return cache
+
+
+def test_concurrent_requests_share_one_build(tmp_path):
+    fetched = []
+    cache = cache_with(tmp_path, png(800, 600), fetched=fetched)
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get(SRC, 320, "webp") for _ in range(4)))
+
+    results = asyncio.run(scenario())
+    assert fetched == [SRC]
+    assert all(result == results[0] for result in results)
+    with Image.open(io.BytesIO(results[0])) as image:
+        assert (image.format, image.size) == ("WEBP", (320, 320))
+
+
+def test_original_is_cached(tmp_path):
+    cache = cache_with(tmp_path, b"x" * 30)
+    assert asyncio.run(cache._original(SRC)) == b"x" * 30
+    cache._client = None
+    assert asyncio.run(cache._original(SRC)) == b"x" * 30
+
+
+def test_oversized_original_stops_downloading(tmp_path, monkeypatch):
+    monkeypatch.setattr(images, "IMAGE_MAX_SOURCE_BYTES", 1000)
+    body = Body(chunks=100, chunk_size=100)
+    cache = cache_with(tmp_path, body)
+    with pytest.raises(ValueError):
+        asyncio.run(cache._original("https://cms.example.com/uploads/a.jpg"))
+    assert body.sent <= 1100
+
+
+def test_declared_oversized_original_is_refused(tmp_path, monkeypatch):
+    monkeypatch.setattr(images, "IMAGE_MAX_SOURCE_BYTES", 1000)
+    body = Body(chunks=100, chunk_size=100)
+    cache = cache_with(tmp_path, body, {"content-length": "10000"})
+    with pytest.raises(ValueError):
+        asyncio.run(cache._original("https://cms.example.com/uploads/a.jpg"))
+    assert body.sent == 0
+
+
+def test_least_recently_used_files_are_evicted(tmp_path):
+    cache = DerivativeCache(str(tmp_path), max_bytes=1000)
+    for last_used, key in enumerate(["aaaa", "bbbb", "cccc"], 1):
+        path = cache._path(key)
+        cache._write(path, b"x" * 400)
+        os.utime(path, (last_used, last_used))
+    # 1200 bytes is over the limit; evict down to 90% of it.
+    asyncio.run(cache._account(0))
+    remaining = sorted(name for _, _, names in os.walk(tmp_path) for name in names)
+    assert remaining == ["bbbb", "cccc"]
+    assert cache._size == 800
+
+
+def test_endpoint_serves_rounded_widths_from_allowed_hosts(tmp_path, monkeypatch):
+    monkeypatch.setattr(images, "ALLOWED_SOURCE_HOSTS", {"cms.example.com"})
+    monkeypatch.setattr(images, "derivative_cache", cache_with(tmp_path, png(800, 600)))
+    transport = httpx.ASGITransport(app=Starlette(routes=image_routes))
+
+    async def scenario():
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://app"
+        ) as client:
+            headers = {"accept": "image/webp"}
+            return (
+                await client.get(f"/_img/300/{SRC}", headers=headers),
+                await client.get("/_img/300/https://evil.example.com/a.png"),
+            )
+
+    served, refused = asyncio.run(scenario())
+    assert served.headers["content-type"] == "image/webp"
+    with Image.open(io.BytesIO(served.content)) as image:
+        assert image.size == (320, 320)
+    assert refused.status_code == 403
+
+
+def test_encoded_source_keeps_its_query(tmp_path, monkeypatch):
+    fetched = []
+    monkeypatch.setattr(images, "ALLOWED_SOURCE_HOSTS", {"cms.example.com"})
+    monkeypatch.setattr(
+        images, "derivative_cache", cache_with(tmp_path, png(80, 80), fetched=fetched)
+    )
+    transport = httpx.ASGITransport(app=Starlette(routes=image_routes))
+
+    async def scenario():
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://app"
+        ) as client:
+            return await client.get(f"/_img/96/{quote(SRC + '?v=2', safe='')}")
+
+    assert asyncio.run(scenario()).status_code == 200
+    assert fetched == [SRC + "?v=2"]
+
+
+def test_component_encodes_the_source_and_reads_the_api_url(monkeypatch):
+    monkeypatch.setattr(rx.config.get_config(), "api_url", "https://api.example.com/")
+    src = rx.Var("product.image", _var_type=str).to(str)
+    rendered = str(responsive_image(src, sizes="100px", width=150).render())
+    assert (
+        '"https://api.example.com/_img/150/"+(encodeURIComponent(product.image))'
+    ) in rendered
@@ -0,0 +1,191 @@
+import asyncio
+import threading
+import httpx
+import pytest
+from app.services import inventory as inventory_module
+from app.services.inventory import InsufficientStock, Inventory
+
+
+def product(product_id: int, stock: int) -> dict:
+    return {"id": product_id, "stock": stock}
+
+
+class FakeStrapi:
+    """Holds product stock; ``on_put`` runs while a PUT is in flight."""
+
+    def __init__(self, stock: dict[int, int]):
+        self.stock = stock
+        self.on_put = None
+        self.down = False
+
+    async def get(self, path: str, params: dict | None = None) -> httpx.Response:
+        if self.down:
+            raise httpx.ConnectError("Strapi is down")
+        product_id = int(path.rsplit("/", 1)[1])
+        if product_id not in self.stock:
+            return httpx.Response(404, request=httpx.Request("GET", path))
+        return httpx.Response(
+            200,
+            json={"data": {"id": product_id, "stock": self.stock[product_id]}},
+            request=httpx.Request("GET", path),
+        )
+
+    async def request(self, method: str, path: str, json: dict) -> httpx.Response:
+        if self.on_put is not None:
+            self.on_put()
+        self.stock[int(path.rsplit("/", 1)[1])] = json["data"]["stock"]
+        return httpx.Response(200, request=httpx.Request(method, path))
+
+
+@pytest.fixture
+def strapi(monkeypatch):
+    fake = FakeStrapi({1: 10, 2: 5})
+    monkeypatch.setattr(inventory_module, "strapi", fake)
+    return fake
+
+
+def test_reserve_is_all_or_nothing():
+    inventory = Inventory(stripes=4)
+    inventory.sync([product(1, 3), product(2, 1)])
+    inventory.reserve("cart-a", {1: 2})
+    with pytest.raises(InsufficientStock) as error:
+        inventory.reserve("cart-a", {1: 3, 2: 2})
+    assert error.value.product_id == 2
+    assert inventory.available(1) == 1
+    assert inventory.available(2) == 1
+
+
+def test_expired_reservations_free_stock():
+    inventory = Inventory(stripes=4)
+    inventory.sync([product(1, 2)])
+    inventory.reserve("cart-a", {1: 2}, ttl=0)
+    assert inventory.sweep() == 1
+    inventory.reserve("cart-b", {1: 2})
+    assert inventory.available(1) == 0
+
+
+def test_commit_rechecks_lapsed_reservations():
+    inventory = Inventory(stripes=4)
+    inventory.sync([product(1, 2)])
+    inventory.reserve("cart-a", {1: 2}, ttl=0)
+    inventory.reserve("cart-b", {1: 2})
+    with pytest.raises(InsufficientStock):
+        inventory.commit("cart-a", {1: 2})
+    inventory.commit("cart-b", {1: 2})
+    assert inventory.on_hand[1] == 0
+
+
+def test_sync_subtracts_pending_decrements():
+    inventory = Inventory(stripes=4)
+    inventory.sync([product(1, 10)])
+    inventory.commit("cart-a", {1: 3})
+    inventory.sync([product(1, 10)])
+    assert inventory.available(1) == 7
+
+
+def test_concurrent_checkouts_never_oversell():
+    inventory = Inventory(stripes=4)
+    inventory.sync([product(1, 50), product(2, 50)])
+    sold = []
+
+    def shopper(n: int):
+        for attempt in range(20):
+            holder = f"cart-{n}-{attempt}"
+            try:
+                inventory.reserve(holder, {1: 1, 2: 1})
+                inventory.commit(holder, {1: 1, 2: 1})
+            except InsufficientStock:
+                return
+            sold.append(holder)
+
+    threads = [threading.Thread(target=shopper, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(sold) == 50
+    assert inventory.on_hand == {1: 0, 2: 0}
+    assert inventory._pending_decrements == {1: 50, 2: 50}
+
+
+def test_products_unknown_to_strapi_are_settled_locally(strapi):
+    inventory = Inventory(stripes=4)
+    inventory.sync([product(1, 10), product(3, 4)])
+    inventory.commit("cart-a", {1: 3, 3: 1})
+    assert asyncio.run(inventory.flush()) == 2
+    assert strapi.stock == {1: 7, 2: 5}
+    assert inventory.on_hand[3] == 3
+    assert inventory._pending_decrements == {}
+    assert asyncio.run(inventory.flush()) == 0
+
+
+def test_flush_applies_decrements_to_current_strapi_stock(strapi):
+    inventory = Inventory(stripes=4)
+    inventory.sync([product(1, 10)])
+    inventory.commit("cart-a", {1: 3})
+    # Another worker sold two units since our catalog was fetched.
+    strapi.stock[1] = 8
+    assert asyncio.run(inventory.flush()) == 1
+    assert strapi.stock[1] == 5
+    assert inventory.on_hand[1] == 5
+    assert inventory._pending_decrements == {}
+
+
+def test_commit_during_flush_stays_pending(strapi):
+    inventory = Inventory(stripes=4)
+    inventory.sync([product(1, 10)])
+    inventory.commit("cart-a", {1: 3})
+    strapi.on_put = lambda: inventory.commit("cart-b", {1: 2})
+    asyncio.run(inventory.flush())
+    assert strapi.stock[1] == 7
+    assert inventory._pending_decrements == {1: 2}
+    assert inventory.on_hand[1] == 5
+    strapi.on_put = None
+    asyncio.run(inventory.flush())
+    assert strapi.stock[1] == 5
+    assert inventory.on_hand[1] == 5
+
+
+def test_catalog_fetched_before_write_back_is_ignored(strapi):
+    inventory = Inventory(stripes=4)
+    inventory.sync([product(1, 10)])
+    inventory.commit("cart-a", {1: 3})
+    fetched_at = inventory_module.time.monotonic()
+    asyncio.run(inventory.flush())
+    # A refresh that started before the write-back still says 10.
+    inventory.sync([product(1, 10)], fetched_at=fetched_at)
+    assert inventory.available(1) == 7
+    inventory.sync([product(1, 7)], fetched_at=inventory_module.time.monotonic())
+    assert inventory.available(1) == 7
+
+
+def test_failed_flush_is_retried(strapi):
+    inventory = Inventory(stripes=4)
+    inventory.sync([product(1, 10)])
+    inventory.commit("cart-a", {1: 3})
+    strapi.down = True
+    asyncio.run(inventory.flush())
+    assert inventory._pending_decrements == {1: 3}
+    strapi.down = False
+    asyncio.run(inventory.flush())
+    assert strapi.stock[1] == 7
+
+
+def test_restock_undoes_commit_before_write_back():
+    inventory = Inventory(stripes=4)
+    inventory.sync([product(1, 10)])
+    inventory.commit("cart-a", {1: 3})
+    inventory.restock({1: 3})
+    assert inventory.available(1) == 10
+    assert inventory._pending_decrements == {}
+
+
+def test_restock_after_write_back_adds_units_in_strapi(strapi):
+    inventory = Inventory(stripes=4)
+    inventory.sync([product(1, 10)])
+    inventory.commit("cart-a", {1: 3})
+    asyncio.run(inventory.flush())
+    inventory.restock({1: 3})
+    asyncio.run(inventory.flush())
+    assert strapi.stock[1] == 10
+    assert inventory.on_hand[1] == 10
@@ -0,0 +1,93 @@
+import asyncio
+import reflex as rx
+from app.services import metrics as metrics_module
+from app.services.metrics import Registry, instrument_states, strapi_endpoint
+
+
+class MeteredState(rx.State):
+    count: int = 0
+
+    @rx.event
+    def increment(self, by: int):
+        self.count += by
+
+    @rx.event
+    async def add_in_steps(self):
+        for _ in range(2):
+            self.count += 5
+            yield
+
+    @rx.var
+    def doubled(self) -> int:
+        return self.count * 2
+
+
+def run(state: rx.State, name: str, payload: dict) -> list[dict]:
+    handler = MeteredState.event_handlers[name]
+
+    async def process():
+        return [
+            update.delta
+            async for update in state._process_event(handler, state, payload)
+        ]
+
+    name = MeteredState.get_full_name()
+    return [delta[name] for delta in asyncio.run(process()) if name in delta]
+
+
+def calls(family: str, **labels: str) -> int:
+    return metrics_module.metrics.counter(family, **labels).value
+
+
+def test_instrumented_handlers_run_and_computed_vars_recompute(monkeypatch):
+    monkeypatch.setattr(metrics_module, "METRICS_SAMPLE_RATE", 1.0)
+    # Two handlers plus both copies of the computed var.
+    assert instrument_states(MeteredState, module_prefix=__name__) == 4
+    assert instrument_states(MeteredState, module_prefix=__name__) == 0
+
+    root = rx.State(_reflex_internal_init=True)
+    state = root.get_substate(MeteredState.get_full_name().split(".")[1:])
+    assert run(state, "increment", {"by": 3}) == [
+        {"count_rx_state_": 3, "doubled_rx_state_": 6}
+    ]
+    steps = run(state, "add_in_steps", {})
+    assert [delta["doubled_rx_state_"] for delta in steps] == [16, 26]
+    assert state.doubled == 26
+
+    assert calls("dk_event_handler_calls_total", handler="MeteredState.increment") == 1
+    assert calls("dk_computed_var_calls_total", var="MeteredState.doubled") >= 3
+    timed = metrics_module.metrics.histogram(
+        "dk_event_handler_seconds", handler="MeteredState.add_in_steps"
+    )
+    assert timed.count == 1
+
+
+def test_render_prometheus_text():
+    registry = Registry()
+    registry.counter("dk_cache_requests_total", cache="quote", result="hit").value = 2
+    registry.histogram(
+        "dk_outbound_request_seconds",
+        service="strapi",
+        method="GET",
+        endpoint='/api/"x"',
+        status="200",
+    ).observe(0.003)
+    registry.collect(
+        "dk_cache_requests_total", lambda: [({"cache": "lru", "result": "miss"}, 5)]
+    )
+    text = registry.render()
+    assert 'dk_cache_requests_total{cache="quote",result="hit"} 2' in text
+    assert 'dk_cache_requests_total{cache="lru",result="miss"} 5' in text
+    assert (
+        'dk_outbound_request_seconds_bucket{endpoint="/api/\\"x\\"",method="GET",'
+        'service="strapi",status="200",le="0.0025"} 0'
+    ) in text
+    assert 'status="200",le="0.005"} 1' in text
+    assert 'status="200",le="+Inf"} 1' in text
+    assert "# TYPE dk_outbound_request_seconds histogram" in text
+
+
+def test_strapi_endpoint_labels_are_bounded():
+    assert strapi_endpoint("/api/products/42?populate=*") == "/api/products/{id}"
+    assert strapi_endpoint("/api/orders/7/items") == "/api/orders/{id}/items"
+    assert strapi_endpoint("/api/categories") == "/api/categories"
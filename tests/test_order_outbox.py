@@ -0,0 +1,175 @@
+import asyncio
+import json
+import sqlite3
+import httpx
+import pytest
+from app.services import order_outbox as outbox_module
+from app.services.db import Database
+from app.services.order_outbox import OrderOutbox, order_outbox
+from app.services.order_store import order_store
+
+
+class FakeStrapi:
+    available = True
+
+    def __init__(self):
+        self.orders: list[dict] = []
+        self.failures = 0
+        self.status = 200
+        self.lookup_status = 200
+
+    async def get(self, path: str, params: dict) -> httpx.Response:
+        order_id = params["filters[order_id_string][$eq]"]
+        data = [o for o in self.orders if o["order_id_string"] == order_id]
+        return httpx.Response(
+            self.lookup_status, json={"data": data}, request=httpx.Request("GET", path)
+        )
+
+    async def request(self, method: str, path: str, content: str, headers: dict):
+        # Yield so concurrent workers really overlap.
+        await asyncio.sleep(0.01)
+        if self.failures:
+            self.failures -= 1
+            return httpx.Response(503, request=httpx.Request(method, path))
+        if self.status < 300:
+            self.orders.append(json.loads(content)["data"])
+        return httpx.Response(self.status, request=httpx.Request(method, path))
+
+
+@pytest.fixture
+def strapi(monkeypatch):
+    fake = FakeStrapi()
+    monkeypatch.setattr(outbox_module, "strapi", fake)
+    return fake
+
+
+def queue(db: Database, outbox: OrderOutbox, order_id: str):
+    outbox.ensure_schema()
+    db.call(
+        lambda conn: outbox.insert(
+            conn, order_id, {"data": {"order_id_string": order_id}}
+        )
+    )
+
+
+def row(db: Database, order_id: str):
+    return db.call(
+        lambda conn: conn.execute(
+            "SELECT * FROM order_outbox WHERE order_id = ?", (order_id,)
+        ).fetchone()
+    )
+
+
+def test_concurrent_workers_send_each_order_once(db, strapi):
+    first, second = OrderOutbox(), OrderOutbox()
+    for number in range(5):
+        queue(db, first, f"DK{number}")
+
+    async def drain_both():
+        return await asyncio.gather(first.drain_once(), second.drain_once())
+
+    assert sum(asyncio.run(drain_both())) == 5
+    assert sorted(o["order_id_string"] for o in strapi.orders) == [
+        f"DK{number}" for number in range(5)
+    ]
+    assert row(db, "DK0")["status"] == "sent"
+
+
+def test_failed_send_is_retried_with_backoff(db, strapi):
+    outbox = OrderOutbox()
+    queue(db, outbox, "DK1")
+    strapi.failures = 1
+    assert asyncio.run(outbox.drain_once()) == 1
+    failed = row(db, "DK1")
+    assert (failed["status"], failed["attempts"]) == ("pending", 1)
+    assert asyncio.run(outbox.drain_once()) == 0
+    db.call(lambda conn: conn.execute("UPDATE order_outbox SET next_attempt_at = 0"))
+    assert asyncio.run(outbox.drain_once()) == 1
+    assert row(db, "DK1")["status"] == "sent"
+    assert len(strapi.orders) == 1
+
+
+def test_expired_lease_is_reclaimed_without_reposting(db, strapi):
+    outbox = OrderOutbox()
+    queue(db, outbox, "DK1")
+    # A worker claimed the row, posted it and died before marking it sent.
+    db.call(
+        lambda conn: conn.execute(
+            "UPDATE order_outbox SET status = 'sending', attempts = 1, "
+            "next_attempt_at = 0"
+        )
+    )
+    strapi.orders.append({"order_id_string": "DK1"})
+    assert asyncio.run(outbox.drain_once()) == 1
+    assert row(db, "DK1")["status"] == "sent"
+    assert len(strapi.orders) == 1
+
+
+def test_live_lease_is_not_taken(db, strapi):
+    outbox = OrderOutbox()
+    queue(db, outbox, "DK1")
+    db.call(
+        lambda conn: conn.execute(
+            "UPDATE order_outbox SET status = 'sending', attempts = 1, "
+            "next_attempt_at = 9e12"
+        )
+    )
+    assert asyncio.run(outbox.drain_once()) == 0
+    assert strapi.orders == []
+
+
+def test_rejected_order_is_not_retried(db, strapi):
+    outbox = OrderOutbox()
+    queue(db, outbox, "DK1")
+    strapi.status = 400
+    assert asyncio.run(outbox.drain_once()) == 1
+    rejected = row(db, "DK1")
+    assert rejected["status"] == "failed"
+    assert "400" in rejected["last_error"]
+    db.call(lambda conn: conn.execute("UPDATE order_outbox SET next_attempt_at = 0"))
+    assert asyncio.run(outbox.drain_once()) == 0
+
+
+@pytest.mark.parametrize(
+    "lookup_status, status", [(403, "failed"), (429, "pending"), (502, "pending")]
+)
+def test_failed_lookup_before_retry(db, strapi, lookup_status, status):
+    outbox = OrderOutbox()
+    queue(db, outbox, "DK1")
+    db.call(lambda conn: conn.execute("UPDATE order_outbox SET attempts = 1"))
+    strapi.lookup_status = lookup_status
+    assert asyncio.run(outbox.drain_once()) == 1
+    looked_up = row(db, "DK1")
+    assert looked_up["status"] == status
+    assert str(lookup_status) in looked_up["last_error"]
+    assert strapi.orders == []
+
+
+def order(order_id: str) -> dict:
+    return {
+        "id": order_id,
+        "user_email": "shopper@example.com",
+        "items": [
+            {"product_id": 1, "name": "Rose Lamp", "price": 500.0, "quantity": 2}
+        ],
+        "subtotal": 1000.0,
+        "shipping_cost": 0.0,
+        "cod_advance": None,
+        "cod_remaining": None,
+        "total_amount": 1000.0,
+        "payment_method": {"type": "stripe", "card_last4": None, "brand": None},
+        "shipping_address": {},
+        "status": "confirmed",
+        "payment_status": "paid",
+        "created_at": "2026-01-01T10:00:00",
+        "stripe_payment_intent_id": None,
+    }
+
+
+def test_order_is_saved_with_its_sync(db):
+    asyncio.run(order_store.save(order("DK1"), sync_payload={"data": {}}))
+    assert row(db, "DK1")["status"] == "pending"
+    with pytest.raises(sqlite3.IntegrityError):
+        asyncio.run(order_store.save(order("DK1"), sync_payload={"data": {"x": 1}}))
+    assert json.loads(row(db, "DK1")["payload"]) == {"data": {}}
+    assert order_outbox._wakeup.is_set()
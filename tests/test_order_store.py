@@ -0,0 +1,94 @@
+import asyncio
+from app.services.order_store import order_store
+
+
+def order(order_id: str, created_at: str, **fields) -> dict:
+    return {
+        "id": order_id,
+        "user_email": "shopper@example.com",
+        "items": [
+            {"product_id": 1, "name": "Rose Lamp", "price": 500.0, "quantity": 2}
+        ],
+        "subtotal": 1000.0,
+        "shipping_cost": 0.0,
+        "cod_advance": None,
+        "cod_remaining": None,
+        "total_amount": 1000.0,
+        "payment_method": {"type": "stripe", "card_last4": None, "brand": None},
+        "shipping_address": {"city": "Pune"},
+        "status": "confirmed",
+        "payment_status": "paid",
+        "created_at": created_at,
+        "stripe_payment_intent_id": None,
+        **fields,
+    }
+
+
+def save_all(orders: list[dict]):
+    async def save():
+        for o in orders:
+            await order_store.save(o)
+
+    asyncio.run(save())
+
+
+def pages(filters: dict, limit: int) -> list[list[str]]:
+    async def walk():
+        result, cursor = [], ""
+        while True:
+            page = await order_store.query(filters, cursor, limit)
+            result.append([o["id"] for o in page["orders"]])
+            cursor = page["next_cursor"]
+            if not cursor:
+                return result
+
+    return asyncio.run(walk())
+
+
+def test_saved_order_round_trips(db):
+    saved = order("DK1", "2026-01-01T10:00:00")
+    save_all([saved])
+    assert asyncio.run(order_store.get("DK1")) == saved
+    assert asyncio.run(order_store.get("DK2")) is None
+
+
+def test_pages_are_stable_when_created_at_ties(db):
+    # Five orders in the same second, saved out of id order.
+    save_all(
+        [order(f"DK{n}", "2026-01-01T10:00:00") for n in (3, 1, 5, 2, 4)]
+        + [order("DK0", "2026-01-01T09:00:00"), order("DK9", "2026-01-02T09:00:00")]
+    )
+    assert pages({}, limit=2) == [
+        ["DK9", "DK5"],
+        ["DK4", "DK3"],
+        ["DK2", "DK1"],
+        ["DK0"],
+    ]
+
+
+def test_new_orders_do_not_shift_later_pages(db):
+    save_all([order(f"DK{n}", f"2026-01-0{n}T10:00:00") for n in range(1, 6)])
+
+    async def first_then_rest():
+        first = await order_store.query({}, limit=2)
+        await order_store.save(order("DK6", "2026-01-06T10:00:00"))
+        rest = await order_store.query({}, first["next_cursor"], limit=10)
+        return [o["id"] for o in first["orders"] + rest["orders"]]
+
+    assert asyncio.run(first_then_rest()) == ["DK5", "DK4", "DK3", "DK2", "DK1"]
+
+
+def test_filters(db):
+    save_all(
+        [
+            order("DK1", "2026-01-01T10:00:00"),
+            order("DK2", "2026-01-02T10:00:00", user_email="other@example.com"),
+            order("DK3", "2026-01-03T10:00:00", status="shipped"),
+            order("DK4", "2026-02-01T10:00:00"),
+        ]
+    )
+    assert pages({"user_email": "shopper@example.com"}, 10) == [["DK4", "DK3", "DK1"]]
+    assert pages({"status": "shipped"}, 10) == [["DK3"]]
+    assert pages({"created_from": "2026-01-02", "created_to": "2026-02-01"}, 10) == [
+        ["DK3", "DK2"]
+    ]
@@ -0,0 +1,87 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+import stripe
+from app.services.payment_gateway import (
+    PaymentGatewayError,
+    StripeGateway,
+    idempotency_key,
+)
+
+
+class FakePaymentIntents:
+    """Replays the first response for a repeated idempotency key, like Stripe."""
+
+    def __init__(self):
+        self.created: dict[str, dict] = {}
+        self.error: stripe.StripeError | None = None
+
+    async def create_async(self, params: dict, options: dict):
+        if self.error is not None:
+            raise self.error
+        key = options["idempotency_key"]
+        if key not in self.created:
+            self.created[key] = {
+                **params,
+                "id": f"pi_{len(self.created) + 1}",
+                "client_secret": f"secret_{len(self.created) + 1}",
+            }
+        return SimpleNamespace(**self.created[key])
+
+
+@pytest.fixture
+def intents(monkeypatch):
+    fake = FakePaymentIntents()
+    client = SimpleNamespace(v1=SimpleNamespace(payment_intents=fake))
+
+    def get_client(gateway):
+        gateway._semaphore = gateway._semaphore or asyncio.Semaphore(1)
+        return client
+
+    monkeypatch.setattr(StripeGateway, "_get_client", get_client)
+    return fake
+
+
+def test_idempotency_key_is_stable_per_attempt():
+    lines = ((1, 2), (7, 1))
+    key = idempotency_key("checkout-1", {"email": "a@example.com"}, lines, 999.0)
+    assert key == idempotency_key(
+        "checkout-1", {"email": "a@example.com"}, lines, 999.0
+    )
+    assert key.startswith("dk-")
+    assert key != idempotency_key("checkout-1", {"email": "a@example.com"}, lines, 1.0)
+    assert key != idempotency_key(
+        "checkout-2", {"email": "a@example.com"}, lines, 999.0
+    )
+
+
+def test_double_submit_reuses_one_intent(intents):
+    gateway = StripeGateway("sk_test")
+
+    async def submit_twice():
+        return await asyncio.gather(
+            *(
+                gateway.create_payment_intent(
+                    1234.567, "Order", {}, idempotency_key="dk-same"
+                )
+                for _ in range(2)
+            )
+        )
+
+    first, second = asyncio.run(submit_twice())
+    assert first == second == {"id": "pi_1", "client_secret": "secret_1"}
+    assert len(intents.created) == 1
+    # Amounts are rounded to paise, not truncated.
+    assert intents.created["dk-same"]["amount"] == 123457
+
+
+def test_stripe_errors_carry_the_customer_message(intents):
+    intents.error = stripe.CardError("Your card was declined.", None, "card_declined")
+    gateway = StripeGateway("sk_test")
+    with pytest.raises(PaymentGatewayError, match="Your card was declined."):
+        asyncio.run(gateway.create_payment_intent(100.0, "Order", {}, "dk-1"))
+
+
+def test_unconfigured_gateway_refuses():
+    with pytest.raises(PaymentGatewayError):
+        asyncio.run(StripeGateway("").create_payment_intent(100.0, "Order", {}, "k"))
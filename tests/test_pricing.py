@@ -0,0 +1,34 @@
+from app.services.pricing import quote_checkout
+
+
+def test_quote_totals():
+    quote = quote_checkout(((499.5, 2), (100.0, 1)), "stripe", shipping=50.0)
+    assert quote["subtotal"] == 1099.0
+    assert quote["total"] == 1149.0
+    assert quote["amount_due_now"] == 1149.0
+
+
+def test_cod_splits_the_total():
+    quote = quote_checkout(
+        ((333.33, 1),), "cod", shipping=50.0, cod_advance_percentage=50.0
+    )
+    assert quote["amount_due_now"] == quote["cod_advance"] == 191.67
+    assert quote["cod_advance"] + quote["cod_remaining"] == quote["total"]
+
+
+def test_discount_is_capped_and_taxed_after():
+    quote = quote_checkout(
+        ((100.0, 1),), "stripe", shipping=0.0, tax_rate=0.18, discount=150.0
+    )
+    assert quote["discount"] == 100.0
+    assert quote["tax"] == 0.0
+    assert quote["total"] == 0.0
+
+
+def test_same_cart_is_served_from_cache():
+    lines = ((1234.5, 3),)
+    first = quote_checkout(lines, "stripe")
+    hits = quote_checkout.cache_info().hits
+    assert quote_checkout(lines, "stripe") is first
+    assert quote_checkout.cache_info().hits == hits + 1
+    assert quote_checkout(lines, "cod") is not first
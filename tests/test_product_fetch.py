@@ -0,0 +1,56 @@
+import asyncio
+import httpx
+import pytest
+from app.states import product_state
+from app.states.product_state import _fetch_products_from_strapi
+
+
+class FakeStrapi:
+    """Serves ``count`` products in pages of ``page_size``."""
+
+    def __init__(self, count: int, page_size: int, status: int = 200):
+        self.count = count
+        self.page_size = page_size
+        self.status = status
+        self.pages: list[int] = []
+
+    async def get(self, path: str, params: dict | None = None) -> httpx.Response:
+        page = params["pagination[page]"]
+        self.pages.append(page)
+        start = (page - 1) * self.page_size
+        ids = range(start + 1, min(start + self.page_size, self.count) + 1)
+        page_count = max(1, -(-self.count // self.page_size))
+        return httpx.Response(
+            self.status,
+            json={
+                "data": [{"id": i, "name": f"Gift {i}"} for i in ids],
+                "meta": {"pagination": {"page": page, "pageCount": page_count}},
+            },
+            request=httpx.Request("GET", path),
+        )
+
+
+@pytest.fixture
+def strapi(monkeypatch):
+    def install(fake: FakeStrapi) -> FakeStrapi:
+        monkeypatch.setattr(product_state, "strapi", fake)
+        monkeypatch.setattr(product_state, "STRAPI_PAGE_SIZE", fake.page_size)
+        return fake
+
+    return install
+
+
+@pytest.mark.parametrize("count", [0, 1, 3, 7, 9])
+def test_every_page_is_fetched_once_and_stops_at_the_last(strapi, count):
+    fake = strapi(FakeStrapi(count, page_size=3))
+    products, error = asyncio.run(_fetch_products_from_strapi())
+    assert error is None
+    assert [p["id"] for p in products] == list(range(1, count + 1))
+    assert sorted(fake.pages) == list(range(1, max(1, -(-count // 3)) + 1))
+
+
+def test_missing_collection_is_reported(strapi):
+    strapi(FakeStrapi(5, page_size=3, status=404))
+    products, error = asyncio.run(_fetch_products_from_strapi())
+    assert products == []
+    assert "Products endpoint not found" in error
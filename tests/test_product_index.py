@@ -0,0 +1,45 @@
+from app.services.product_index import ProductIndex, category_slug
+
+
+def product(product_id: int, category: str, occasion: str = "Birthday") -> dict:
+    return {
+        "id": product_id,
+        "category": category,
+        "occasion": occasion,
+        "recipient": "For All",
+    }
+
+
+def test_lookups_by_id_and_bucket():
+    index = ProductIndex(
+        [
+            product(1, "Home Decor"),
+            product(2, "Jewellery", "Wedding"),
+            product(3, "Home Decor"),
+        ]
+    )
+    assert index.get(2)["category"] == "Jewellery"
+    assert index.get(99) is None
+    assert [p["id"] for p in index.in_category("home-decor")] == [1, 3]
+    assert [p["id"] for p in index.in_category("Home Decor")] == [1, 3]
+    assert [p["id"] for p in index.for_occasion("Wedding")] == [2]
+    assert index.for_recipient("For Him") == []
+    assert index.categories == ["Home Decor", "Jewellery"]
+
+
+def test_re_adding_a_product_moves_it_between_buckets():
+    index = ProductIndex([product(1, "Home Decor"), product(2, "Jewellery")])
+    index.add(product(1, "Jewellery"))
+    assert [p["id"] for p in index.in_category("jewellery")] == [2, 1]
+    assert index.in_category("home-decor") == []
+    assert index.categories == ["Jewellery"]
+    assert len(index.products) == 2
+
+
+def test_remove_drops_empty_categories():
+    index = ProductIndex([product(1, "Home Decor")])
+    index.remove(1)
+    index.remove(1)
+    assert index.get(1) is None
+    assert index.categories == []
+    assert category_slug(" Home Decor ") == "home-decor"
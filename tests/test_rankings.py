@@ -0,0 +1,80 @@
+import asyncio
+import pytest
+from app.services import sales_metrics
+from app.services.rankings import ProductRankings, Ranking
+from app.states.product_state import DUMMY_PRODUCTS, CatalogCache
+
+pytestmark = pytest.mark.usefixtures("db", "saved_catalog")
+
+
+def product(product_id: int, **fields) -> dict:
+    return {
+        **DUMMY_PRODUCTS[0],
+        "id": product_id,
+        "stock": 5,
+        "rating": 4.0,
+        "num_reviews": 0,
+        **fields,
+    }
+
+
+def test_ranking_follows_updates_and_removals():
+    ranking = Ranking(lambda p: (p["stock"],), [product(1), product(2, stock=9)])
+    assert ranking.top(5) == [2, 1]
+    ranking.update(product(1, stock=20))
+    assert ranking.top(1) == [1]
+    ranking.remove(1)
+    ranking.remove(1)
+    assert ranking.top(5) == [2]
+
+
+def test_featured_needs_reviews_and_stock():
+    rankings = ProductRankings(
+        [
+            product(1, rating=5.0, num_reviews=1),
+            product(2, rating=4.7, num_reviews=300),
+            product(3, rating=5.0, num_reviews=500, stock=0),
+        ],
+        {},
+    )
+    assert [p["id"] for p in rankings.top_featured(3)] == [2, 1, 3]
+
+
+def test_sales_move_products_up_the_best_sellers():
+    rankings = ProductRankings(
+        [product(1, num_reviews=50), product(2, num_reviews=10)], {}
+    )
+    assert [p["id"] for p in rankings.top_selling(2)] == [1, 2]
+    rankings.record_sale(2, 3)
+    rankings.record_sale(99, 1)
+    assert [p["id"] for p in rankings.top_selling(2)] == [2, 1]
+
+
+def test_top_zero_is_empty():
+    ranking = Ranking(lambda p: (p["stock"],), [product(1), product(2)])
+    assert ranking.top(0) == []
+
+
+def test_best_sellers_are_seeded_from_sales_rollup(db):
+    order = {
+        "created_at": "2026-01-01T10:00:00",
+        "payment_method": {"type": "cod"},
+        "total_amount": 900.0,
+        "items": [{"product_id": 2, "name": "Lamp", "price": 300.0, "quantity": 3}],
+    }
+    sales_metrics.ensure_schema()
+    db.call(lambda conn: sales_metrics.record_order(conn, order))
+
+    async def loader():
+        return {
+            "health": "ok",
+            "products": [product(1, num_reviews=50), product(2), product(3)],
+            "categories": [],
+            "error": None,
+        }
+
+    cache = CatalogCache(loader, ttl=60)
+    rankings = asyncio.run(cache.refresh())["rankings"]
+    assert [p["id"] for p in rankings.top_selling(3)] == [2, 1, 3]
+    cache.record_sale({3: 5})
+    assert [p["id"] for p in cache.rankings.top_selling(2)] == [3, 2]
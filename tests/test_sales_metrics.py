@@ -0,0 +1,104 @@
+import asyncio
+import datetime
+import random
+from app.services import sales_metrics
+from app.services.order_store import order_store
+
+NAMES = {1: "Rose Lamp", 2: "Silver Locket", 3: "Photo Frame"}
+
+
+def random_orders(count: int) -> list[dict]:
+    rng = random.Random(3)
+    today = datetime.date.today()
+    orders = []
+    for n in range(count):
+        items = [
+            {
+                "product_id": product_id,
+                "name": NAMES[product_id],
+                "price": rng.choice([199.99, 450.0, 1299.5]),
+                "quantity": rng.randint(1, 3),
+            }
+            for product_id in rng.sample(sorted(NAMES), rng.randint(1, 3))
+        ]
+        subtotal = sum(line["price"] * line["quantity"] for line in items)
+        day = today - datetime.timedelta(days=rng.randint(0, 20))
+        orders.append(
+            {
+                "id": f"DK{n}",
+                "user_email": "shopper@example.com",
+                "items": items,
+                "subtotal": subtotal,
+                "shipping_cost": 50.0,
+                "cod_advance": None,
+                "cod_remaining": None,
+                "total_amount": subtotal + 50.0,
+                "payment_method": {
+                    "type": rng.choice(["stripe", "cod"]),
+                    "card_last4": None,
+                    "brand": None,
+                },
+                "shipping_address": {},
+                "status": "confirmed",
+                "payment_status": "paid",
+                "created_at": f"{day.isoformat()}T10:00:00",
+                "stripe_payment_intent_id": None,
+            }
+        )
+    return orders
+
+
+def test_rollups_match_the_raw_orders(db):
+    orders = random_orders(60)
+
+    async def save_and_read():
+        for order in orders:
+            await order_store.save(order)
+        return (
+            await sales_metrics.summary(),
+            await sales_metrics.top_products(),
+            await sales_metrics.daily_sales(14),
+        )
+
+    (summary, mix), top, daily = asyncio.run(save_and_read())
+    revenue = sum(o["total_amount"] for o in orders)
+    assert summary["orders"] == len(orders)
+    assert summary["revenue"] == round(revenue, 2)
+    assert summary["average_order_value"] == round(revenue / len(orders), 2)
+
+    by_method = {m["method"]: m for m in mix}
+    for method in ("stripe", "cod"):
+        placed = [o for o in orders if o["payment_method"]["type"] == method]
+        assert by_method[method]["orders"] == len(placed)
+        assert by_method[method]["revenue"] == round(
+            sum(o["total_amount"] for o in placed), 2
+        )
+    assert round(sum(m["share"] for m in mix)) == 100
+
+    for product in top:
+        lines = [
+            line
+            for o in orders
+            for line in o["items"]
+            if line["product_id"] == product["product_id"]
+        ]
+        assert product["units"] == sum(line["quantity"] for line in lines)
+        assert product["revenue"] == round(
+            sum(line["price"] * line["quantity"] for line in lines), 2
+        )
+    assert [p["units"] for p in top] == sorted((p["units"] for p in top), reverse=True)
+
+    assert len(daily) == 14
+    for day in daily:
+        placed = [o for o in orders if o["created_at"].startswith(day["day"])]
+        assert day["orders"] == len(placed)
+        assert day["revenue"] == round(sum(o["total_amount"] for o in placed), 2)
+
+
+def test_empty_store_reports_zeros(db):
+    summary, mix = asyncio.run(sales_metrics.summary())
+    assert summary == {"orders": 0, "revenue": 0.0, "average_order_value": 0.0}
+    assert mix == []
+    daily = asyncio.run(sales_metrics.daily_sales(3))
+    assert [d["orders"] for d in daily] == [0, 0, 0]
+    assert daily[-1]["day"] == datetime.date.today().isoformat()
@@ -0,0 +1,78 @@
+import random
+import pytest
+from app.services.search_index import SearchIndex
+from app.states.product_state import DUMMY_PRODUCTS
+
+WORDS = (
+    "gold silver rose heart knot charm lamp frame candle mug locket vase "
+    "bouquet hamper keepsake pendant bracelet photo engraved crystal"
+).split()
+
+
+def catalog(count: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            **DUMMY_PRODUCTS[0],
+            "id": product_id,
+            "name": " ".join(rng.sample(WORDS, 3)).title(),
+            "description": " ".join(rng.choices(WORDS, k=20)),
+        }
+        for product_id in range(1, count + 1)
+    ]
+
+
+PRODUCTS = catalog(300)
+
+
+def product(product_id: int, name: str, description: str = "") -> dict:
+    return {**PRODUCTS[0], "id": product_id, "name": name, "description": description}
+
+
+@pytest.fixture(scope="module")
+def index() -> SearchIndex:
+    return SearchIndex(PRODUCTS)
+
+
+def test_every_result_matches_every_token(index):
+    results = index.search("gold locket", k=20)
+    assert results
+    for p in results:
+        text = f"{p['name']} {p['description']}".lower()
+        assert "gold" in text and "locket" in text
+
+
+def test_name_matches_outrank_description_matches():
+    index = SearchIndex(
+        [
+            product(1, "Ceramic Vase", "a lamp for the hall"),
+            product(2, "Brass Lamp", "for the hall"),
+        ]
+    )
+    assert [p["id"] for p in index.search("lamp")] == [2, 1]
+
+
+def test_last_token_matches_as_prefix(index):
+    results = index.search("bouq")
+    assert results
+    for p in results:
+        words = f"{p['name']} {p['description']}".lower().split()
+        assert any(word.startswith("bouq") for word in words)
+
+
+def test_typo_falls_back_to_one_edit():
+    index = SearchIndex([product(1, "Silver Locket"), product(2, "Rose Candle")])
+    assert [p["id"] for p in index.search("lockt")] == [1]
+    assert [p["id"] for p in index.search("silvr locket")] == [1]
+
+
+@pytest.mark.parametrize("query", ["gold", "rose heart", "photo fra", "pendent"])
+def test_early_termination_keeps_the_true_top_k(index, query):
+    everything = index.search(query, k=len(PRODUCTS))
+    assert index.search(query, k=5) == everything[:5]
+
+
+def test_removed_products_are_not_found():
+    index = SearchIndex([product(1, "Silver Locket"), product(2, "Gold Locket")])
+    index.remove(1)
+    assert [p["id"] for p in index.search("locket")] == [2]
@@ -0,0 +1,73 @@
+import pytest
+from app.services import session_tokens
+from app.services.session_tokens import _b64encode, issue_token, verify_token
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_800_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def secret(monkeypatch):
+    monkeypatch.setattr(session_tokens, "_secret", b"test-secret")
+    session_tokens._decode.cache_clear()
+    yield
+    session_tokens._decode.cache_clear()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(session_tokens, "time", clock)
+    return clock
+
+
+def test_round_trip(clock):
+    token = issue_token(7, "admin", ttl=60)
+    assert verify_token(token) == {"uid": 7, "role": "admin", "exp": clock.now + 60}
+
+
+def test_tampered_payload_is_rejected():
+    token = issue_token(7, "customer")
+    payload, signature = token.split(".")
+    claims = session_tokens._b64decode(payload).replace(b"customer", b"admin")
+    assert verify_token(f"{_b64encode(claims)}.{signature}") is None
+
+
+def test_tampered_signature_is_rejected():
+    token = issue_token(7, "customer")
+    flipped = "A" if token[-1] != "A" else "B"
+    assert verify_token(token[:-1] + flipped) is None
+
+
+@pytest.mark.parametrize(
+    "token",
+    ["", ".", "abc", "abc.", ".abc", "a.b.c", "!!!.???", "e30", "é.é", "e30.ü"],
+)
+def test_malformed_tokens_are_rejected(token):
+    assert verify_token(token) is None
+
+
+def test_token_from_another_secret_is_rejected(monkeypatch):
+    token = issue_token(7, "admin")
+    monkeypatch.setattr(session_tokens, "_secret", b"another-secret")
+    assert verify_token(token) is None
+
+
+def test_expired_token_is_rejected(clock):
+    token = issue_token(7, "customer", ttl=60)
+    clock.now += 60
+    assert verify_token(token) is None
+
+
+def test_cached_verification_still_expires(clock):
+    token = issue_token(7, "customer", ttl=60)
+    assert verify_token(token) is not None
+    assert verify_token(token) is not None
+    assert session_tokens._decode.cache_info().hits == 1
+    clock.now += 61
+    assert verify_token(token) is None
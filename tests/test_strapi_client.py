@@ -0,0 +1,89 @@
+import asyncio
+import httpx
+import pytest
+from app.services import strapi_client
+from app.services.strapi_client import CircuitBreaker, StrapiClient, StrapiUnavailable
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(strapi_client.time, "monotonic", clock)
+    return clock
+
+
+def breaker() -> CircuitBreaker:
+    return CircuitBreaker(failure_threshold=2, reset_timeout=5, max_reset_timeout=12)
+
+
+def test_breaker_opens_then_probes_then_closes(clock):
+    circuit = breaker()
+    circuit.record_failure()
+    assert circuit.state == "closed"
+    circuit.record_failure()
+    assert circuit.state == "open"
+    assert not circuit.allow_request()
+    clock.now += 5
+    assert circuit.state == "half_open"
+    assert circuit.allow_request()
+    # Only one probe is let through while half-open.
+    assert not circuit.allow_request()
+    circuit.record_success()
+    assert circuit.state == "closed"
+    assert circuit.allow_request()
+
+
+def test_failed_probe_reopens_with_longer_timeout(clock):
+    circuit = breaker()
+    circuit.record_failure()
+    circuit.record_failure()
+    for timeout in (10, 12):
+        clock.now += circuit.reset_timeout
+        assert circuit.allow_request()
+        circuit.record_failure()
+        assert circuit.state == "open"
+        assert circuit.reset_timeout == timeout
+    clock.now += 12
+    circuit.allow_request()
+    circuit.record_success()
+    assert circuit.reset_timeout == 5
+
+
+def test_client_fails_fast_while_open(monkeypatch, clock):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(503 if len(calls) <= 3 else 200)
+
+    client = StrapiClient("http://strapi.test", "token")
+    monkeypatch.setattr(
+        client,
+        "_get_client",
+        lambda: httpx.AsyncClient(
+            base_url=client.base_url, transport=httpx.MockTransport(handler)
+        ),
+    )
+
+    async def scenario():
+        assert client.health == "unknown"
+        for _ in range(3):
+            await client.get("/api/products")
+        assert client.health == "error"
+        with pytest.raises(StrapiUnavailable):
+            await client.get("/api/products")
+        clock.now += client.breaker.reset_timeout
+        assert client.health == "degraded"
+        await client.get("/api/products")
+        assert client.health == "ok"
+
+    asyncio.run(scenario())
+    assert len(calls) == 4
@@ -0,0 +1,108 @@
+import asyncio
+import json
+import pytest
+import reflex as rx
+from app.services import tracing
+from app.services.metrics import instrument_states, metrics
+from app.services.tracing import SpanExporter, detached_context, span
+
+
+class TracedState(rx.State):
+    loaded: int = 0
+
+    @rx.event
+    async def load(self):
+        with span("strapi GET /api/products", "client"):
+            self.loaded += 1
+
+    @rx.event
+    def fail(self):
+        raise RuntimeError("boom")
+
+
+@pytest.fixture
+def exported(tmp_path, monkeypatch):
+    """Turns tracing on and returns a reader for the spans it wrote."""
+    path = tmp_path / "spans.jsonl"
+    exporter = SpanExporter(str(path), "")
+    monkeypatch.setattr(tracing, "TRACING_ENABLED", True)
+    monkeypatch.setattr(tracing, "exporter", exporter)
+
+    def read() -> list[dict]:
+        asyncio.run(exporter.flush())
+        return [json.loads(line) for line in path.read_text().splitlines()]
+
+    return read
+
+
+def test_spans_nest_through_the_context():
+    with span("handler") as parent:
+        with span("strapi GET /api/products", "client") as child:
+            pass
+    assert child.trace_id == parent.trace_id
+    assert child.parent_id == parent.span_id
+    assert parent.parent_id == ""
+
+
+def test_detached_task_starts_its_own_trace():
+    async def scenario():
+        async def background():
+            with span("catalog refresh") as refresh:
+                return refresh
+
+        with span("ProductState.on_load") as handler:
+            task = asyncio.create_task(background(), context=detached_context())
+        return handler, await task
+
+    handler, refresh = asyncio.run(scenario())
+    assert refresh.parent_id == ""
+    assert refresh.trace_id != handler.trace_id
+
+
+def test_errors_are_recorded_and_exported(exported):
+    with pytest.raises(ValueError):
+        with span("checkout", order="DK1"):
+            raise ValueError("no stock")
+    (exported_span,) = exported()
+    assert exported_span["status"] == "error"
+    assert exported_span["error"] == "ValueError: no stock"
+    assert exported_span["attributes"] == {"order": "DK1"}
+    assert exported_span["service"] == "dream-knot"
+
+
+def test_events_from_one_tab_share_a_trace(exported):
+    assert instrument_states(TracedState, module_prefix=__name__) == 3
+    assert instrument_states(TracedState, module_prefix=__name__) == 0
+    root = rx.State(_reflex_internal_init=True)
+    state = root.get_substate(TracedState.get_full_name().split(".")[1:])
+
+    async def process(name: str):
+        handler = TracedState.event_handlers[name]
+        async for _ in state._process_event(handler, state, {}):
+            pass
+
+    asyncio.run(process("load"))
+    asyncio.run(process("load"))
+    asyncio.run(process("fail"))
+    assert state.loaded == 2
+    # Metrics and tracing share one wrapper around the handler.
+    load = TracedState.event_handlers["load"].fn
+    assert not hasattr(load.__wrapped__, "_dk_instrumented")
+    assert (
+        metrics.counter(
+            "dk_event_handler_calls_total", handler="TracedState.load"
+        ).value
+        == 2
+    )
+    spans = exported()
+    first, second = [s for s in spans if s["name"] == "TracedState.load"]
+    fetches = [s for s in spans if s["kind"] == "client"]
+    (failed,) = [s for s in spans if s["name"] == "TracedState.fail"]
+    assert first["parent_span_id"] == ""
+    assert second["parent_span_id"] == failed["parent_span_id"] == first["span_id"]
+    assert [s["parent_span_id"] for s in fetches] == [
+        first["span_id"],
+        second["span_id"],
+    ]
+    assert {s["trace_id"] for s in spans} == {first["trace_id"]}
+    assert failed["error"] == "RuntimeError: boom"
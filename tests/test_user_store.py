@@ -0,0 +1,86 @@
+import asyncio
+import pytest
+from app.services import user_store as user_store_module
+from app.services.user_store import (
+    PASSWORD_HASH_LOG_N,
+    EmailTaken,
+    UserStore,
+    hash_password,
+    verify_password,
+)
+
+
+def password_hash(db, email: str) -> str:
+    return db.call(
+        lambda conn: conn.execute(
+            "SELECT password_hash FROM users WHERE email = ?", (email,)
+        ).fetchone()[0]
+    )
+
+
+def test_hash_is_salted_and_verifies():
+    first, second = hash_password("s3cret", log_n=10), hash_password("s3cret", 10)
+    assert first != second
+    assert first.startswith("scrypt$10$8$1$")
+    assert verify_password("s3cret", first)
+    assert not verify_password("S3cret", first)
+
+
+def test_authenticate_with_right_and_wrong_password(db):
+    store = UserStore()
+
+    async def scenario():
+        created = await store.create("Asha", " Asha@Example.com ", "s3cret")
+        return (
+            created,
+            await store.authenticate("asha@example.com", "s3cret"),
+            await store.authenticate("ASHA@example.com", "wrong"),
+        )
+
+    created, signed_in, rejected = asyncio.run(scenario())
+    assert created["email"] == "asha@example.com"
+    assert signed_in == created
+    assert rejected is None
+    assert "s3cret" not in password_hash(db, "asha@example.com")
+
+
+def test_duplicate_email_is_refused(db):
+    store = UserStore()
+    asyncio.run(store.create("Asha", "asha@example.com", "s3cret"))
+    with pytest.raises(EmailTaken):
+        asyncio.run(store.create("Other", "ASHA@example.com", "different"))
+
+
+def test_demo_accounts_are_seeded(db):
+    user = asyncio.run(UserStore().authenticate("admin@example.com", "admin123"))
+    assert user["role"] == "admin"
+
+
+def test_old_hash_parameters_are_upgraded_on_login(db):
+    store = UserStore()
+    asyncio.run(store.create("Asha", "asha@example.com", "s3cret"))
+    old = hash_password("s3cret", log_n=PASSWORD_HASH_LOG_N - 4)
+    db.call(lambda conn: conn.execute("UPDATE users SET password_hash = ?", (old,)))
+    assert asyncio.run(store.authenticate("asha@example.com", "s3cret"))
+    upgraded = password_hash(db, "asha@example.com")
+    assert upgraded.split("$")[1] == str(PASSWORD_HASH_LOG_N)
+    assert verify_password("s3cret", upgraded)
+    # A wrong password never rewrites the hash.
+    db.call(lambda conn: conn.execute("UPDATE users SET password_hash = ?", (old,)))
+    assert asyncio.run(store.authenticate("asha@example.com", "nope")) is None
+    assert password_hash(db, "asha@example.com") == old
+
+
+def test_unknown_email_still_pays_for_a_hash(db, monkeypatch):
+    store = UserStore()
+    asyncio.run(store._ready())
+    checked = []
+
+    def verify(password, encoded):
+        checked.append(encoded)
+        return verify_password(password, encoded)
+
+    monkeypatch.setattr(user_store_module, "verify_password", verify)
+    assert asyncio.run(store.authenticate("nobody@example.com", "guess")) is None
+    assert asyncio.run(store.authenticate("nobody2@example.com", "guess")) is None
+    assert checked == [store._dummy_hash, store._dummy_hash]